@@ -0,0 +1,21 @@
+"""
+    benchmarks/_common
+    ~~~~~~~~~~~
+
+    Timing helpers shared by the Ulid-Flake benchmarks.
+"""
+import timeit
+
+
+def measure(func, number, repeat=5):
+    """Return the best per-call time in nanoseconds for `func` over `repeat` runs of `number` calls."""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    return best / number * 1e9
+
+
+def report(title, results, unit="ns/id"):
+    """Print benchmark results as an aligned table, by default in nanoseconds per ID."""
+    print(title)
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"  {name:<{width}}  {value:10.1f} {unit}")
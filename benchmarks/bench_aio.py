@@ -0,0 +1,59 @@
+"""
+    benchmarks/bench_aio
+    ~~~~~~~~~~~
+
+    asyncio generation throughput with many concurrent tasks.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_aio.py`.
+"""
+import asyncio
+import time
+
+from _common import report
+
+from ulid_flake.aio import AsyncUlidFlakeGenerator
+from ulid_flake.api import UlidFlakeGenerator
+from ulid_flake.scalable import UlidFlakeScalableGenerator
+
+TASKS = (1, 100, 1000)
+TOTAL = 50_000
+
+TITLE = "asyncio generation"
+UNIT = "ids/s"
+
+
+def throughput(generator, tasks):
+    """Return IDs per second with `tasks` concurrent tasks awaiting `generator.new_int()`."""
+    async def worker():
+        for _ in range(TOTAL // tasks):
+            await generator.new_int()
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(tasks)))
+        return time.perf_counter() - start
+
+    return TOTAL // tasks * tasks / asyncio.run(main())
+
+
+def stream_throughput(generator):
+    async def main():
+        start = time.perf_counter()
+        async for _ in generator.stream(TOTAL, as_int=True):
+            pass
+        return time.perf_counter() - start
+
+    return TOTAL / asyncio.run(main())
+
+
+def run():
+    results = {}
+    for name, factory in (("UlidFlake", UlidFlakeGenerator), ("UlidFlakeScalable", UlidFlakeScalableGenerator)):
+        for tasks in TASKS:
+            results[f"{name} new_int, {tasks} tasks"] = throughput(AsyncUlidFlakeGenerator(factory()), tasks)
+        results[f"{name} stream"] = stream_throughput(AsyncUlidFlakeGenerator(factory()))
+    return results
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
@@ -0,0 +1,62 @@
+"""
+    benchmarks/bench_backfill
+    ~~~~~~~~~~~
+
+    Throughput of generating IDs for given timestamps into a preallocated int64
+    buffer, against one `from_unix_epoch_time` call per row. The NumPy rows are
+    skipped when numpy is not installed.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_backfill.py`.
+"""
+import time
+from array import array
+
+from _common import report
+
+from ulid_flake.api import UlidFlake
+from ulid_flake.scalable import UlidFlakeScalable
+
+try:
+    import numpy as np
+    from ulid_flake import numpy as ulid_flake_numpy
+except ImportError:
+    np = None
+
+ROWS = 1_000_000
+START_MS = 1_800_000_000_000
+# 20 rows per millisecond, well within the randomness of both layouts.
+UNIX_MS = [START_MS + i // 20 for i in range(ROWS)]
+UNIX_SECONDS = [ms / 1000 for ms in UNIX_MS]
+
+TITLE = f"Backfill of {ROWS} rows"
+UNIT = "ids/s"
+
+
+def throughput(func, rows=ROWS):
+    start = time.perf_counter()
+    func()
+    return rows / (time.perf_counter() - start)
+
+
+def run():
+    out = array("q", bytes(8 * ROWS))
+    results = {
+        "from_unix_epoch_time per row": throughput(
+            lambda: [UlidFlake.from_unix_epoch_time(unix_time) for unix_time in UNIX_SECONDS[:100_000]], 100_000),
+        "UlidFlake fill, seconds": throughput(lambda: UlidFlake.fill_from_unix_epoch_times(UNIX_SECONDS, out)),
+        "UlidFlake fill, ms": throughput(lambda: UlidFlake.fill_from_unix_epoch_times(UNIX_MS, out, unit="ms")),
+        "UlidFlakeScalable fill, ms": throughput(
+            lambda: UlidFlakeScalable.fill_from_unix_epoch_times(UNIX_MS, out, unit="ms", sid=1)),
+    }
+    if np is not None:
+        unix_ms = np.array(UNIX_MS, dtype=np.int64)
+        target = np.zeros(ROWS, dtype=np.int64)
+        results["numpy UlidFlake fill, ms"] = throughput(lambda: ulid_flake_numpy.fill_from_unix_epoch_times(
+            UlidFlake.default_generator, unix_ms, target, unit="ms"))
+        results["numpy UlidFlakeScalable fill, ms"] = throughput(lambda: ulid_flake_numpy.fill_from_unix_epoch_times(
+            UlidFlakeScalable.default_generator, unix_ms, target, unit="ms", sid=1))
+    return results
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
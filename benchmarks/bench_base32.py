@@ -0,0 +1,46 @@
+"""
+    benchmarks/bench_base32
+    ~~~~~~~~~~~
+
+    Base32 codec microbenchmark against the previous per-character implementation.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_base32.py`.
+"""
+from _common import measure, report
+
+from ulid_flake import base32
+
+N = 100_000
+VALUE = 16873543941148172
+ENCODED = base32.encode(VALUE, 13)
+VALUES = [VALUE + i for i in range(1000)]
+ENCODED_VALUES = base32.encode_many(VALUES)
+
+TITLE = "Base32 codec"
+UNIT = "ns/id"
+
+
+def legacy_encode(value, length):
+    return ''.join([base32.ENCODING[(value >> (5 * i)) & 31] for i in range(length-1, -1, -1)])
+
+
+def legacy_decode(encoded):
+    value = 0
+    for char in encoded:
+        value = value * 32 + base32.ENCODING.index(char)
+    return value
+
+
+def run():
+    return {
+        "legacy encode": measure(lambda: [legacy_encode(VALUE, 13) for _ in range(N)], N),
+        "encode": measure(lambda: [base32.encode(VALUE, 13) for _ in range(N)], N),
+        "encode_many": measure(lambda: base32.encode_many(VALUES), len(VALUES)),
+        "legacy decode": measure(lambda: [legacy_decode(ENCODED) for _ in range(N)], N),
+        "decode": measure(lambda: [base32.decode(ENCODED) for _ in range(N)], N),
+        "decode_many": measure(lambda: base32.decode_many(ENCODED_VALUES), len(ENCODED_VALUES)),
+    }
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
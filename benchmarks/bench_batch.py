@@ -0,0 +1,38 @@
+"""
+    benchmarks/bench_batch
+    ~~~~~~~~~~~
+
+    Bulk generation (`new_batch`, and `reserve` with and without listing the block)
+    against a loop of `new()` calls.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_batch.py`.
+"""
+from _common import measure, report
+
+from ulid_flake.api import UlidFlakeGenerator
+from ulid_flake.scalable import UlidFlakeScalableGenerator
+
+N = 10_000
+
+TITLE = f"Bulk generation, {N} IDs per run"
+UNIT = "ns/id"
+
+
+def run():
+    results = {}
+    # Private generators: repeated reserve() runs ahead of the clock, which must not leak into the shared defaults.
+    for name, generator_class in (("UlidFlake", UlidFlakeGenerator), ("UlidFlakeScalable", UlidFlakeScalableGenerator)):
+        generator = generator_class(overflow_policy="spin")
+        results[f"{name}.new() loop"] = measure(lambda generator=generator: [generator.new().int for _ in range(N)], N)
+        generator = generator_class()
+        results[f"{name}.new_batch(as_int=True)"] = measure(
+            lambda generator=generator: generator.new_batch(N, as_int=True), N)
+        results[f"{name}.new_batch()"] = measure(lambda generator=generator: generator.new_batch(N), N)
+        generator = generator_class()
+        results[f"{name}.reserve()"] = measure(lambda generator=generator: generator.reserve(N), N)
+        results[f"{name}.reserve() listed"] = measure(lambda generator=generator: list(generator.reserve(N)), N)
+    return results
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
@@ -0,0 +1,50 @@
+"""
+    benchmarks/bench_binary
+    ~~~~~~~~~~~
+
+    Packed binary serialization against Base32 strings and per-ID `to_bytes`.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_binary.py`.
+"""
+import os
+import tempfile
+
+from _common import measure, report
+
+from ulid_flake import base32, binary
+from ulid_flake.api import UlidFlake
+
+N = 100_000
+VALUES = UlidFlake.new_batch(N, as_int=True)
+PACKED = binary.pack_many(VALUES)
+ENCODED = base32.encode_many(VALUES)
+
+TITLE = f"Binary serialization, {N} per run"
+UNIT = "ns/id"
+
+
+def scan(path):
+    with binary.PackedReader(path) as reader:
+        for _ in reader:
+            pass
+
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ids.bin")
+        with open(path, "wb") as file:
+            file.write(PACKED)
+        return {
+            "base32 encode_many": measure(lambda: base32.encode_many(VALUES), N),
+            "to_bytes per id": measure(lambda: b"".join([value.to_bytes(8, "big") for value in VALUES]), N),
+            "pack_many": measure(lambda: binary.pack_many(VALUES), N),
+            "base32 decode_many": measure(lambda: base32.decode_many(ENCODED), N),
+            "from_bytes per id": measure(
+                lambda: [int.from_bytes(PACKED[i:i + 8], "big") for i in range(0, len(PACKED), 8)], N),
+            "unpack_many": measure(lambda: binary.unpack_many(PACKED), N),
+            "PackedReader scan": measure(lambda: scan(path), N),
+        }
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
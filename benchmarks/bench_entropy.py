@@ -0,0 +1,46 @@
+"""
+    benchmarks/bench_entropy
+    ~~~~~~~~~~~
+
+    Buffered entropy pools against one `os.urandom` syscall per read, and
+    generation with each randomness source ("urandom", "random", "counter").
+
+    Run with `PYTHONPATH=src python benchmarks/bench_entropy.py`.
+"""
+import os
+
+from _common import measure, report
+
+from ulid_flake.api import UlidFlakeGenerator
+from ulid_flake.consts import RANDOMNESS_SOURCES
+from ulid_flake.entropy import DEFAULT_POOL, EntropyPool, RandomPool
+
+N = 100_000
+
+TITLE = "Entropy reads"
+UNIT = "ns/id"
+
+
+def run():
+    pool = EntropyPool()
+    random_pool = RandomPool()
+    results = {
+        "os.urandom(3)": measure(lambda: [int.from_bytes(os.urandom(3), "big") for _ in range(N)], N),
+        "EntropyPool.read_int(3)": measure(lambda: [pool.read_int(3) for _ in range(N)], N),
+        "DEFAULT_POOL.read_int(3) (thread-local)": measure(lambda: [DEFAULT_POOL.read_int(3) for _ in range(N)], N),
+        "RandomPool.read_int(3)": measure(lambda: [random_pool.read_int(3) for _ in range(N)], N),
+    }
+    # A one-byte pool passes every multi-byte read straight to os.urandom.
+    for name, entropy_pool in (("unbuffered", EntropyPool(size=1)), ("locked pool", pool), ("default pool", None)):
+        generator = UlidFlakeGenerator(overflow_policy="spin", entropy_pool=entropy_pool)
+        results[f"new_int() {name}"] = measure(lambda: [generator.new_int() for _ in range(N)], N)
+    for randomness_source in RANDOMNESS_SOURCES:
+        # "spin" keeps tight loops from raising when a millisecond's randomness runs out.
+        generator = UlidFlakeGenerator(overflow_policy="spin", randomness_source=randomness_source)
+        results[f"new_int() {randomness_source}"] = measure(lambda: [generator.new_int() for _ in range(N)], N)
+        results[f"new_batch() {randomness_source}"] = measure(lambda: generator.new_batch(N, as_int=True), N)
+    return results
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
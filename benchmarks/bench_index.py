@@ -0,0 +1,68 @@
+"""
+    benchmarks/bench_index
+    ~~~~~~~~~~~
+
+    Time-range queries over a memory-mapped file of packed sorted Ulid-Flakes,
+    against a linear scan of the same file.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_index.py [ids]` (default 100M
+    IDs, an 800 MB temporary file).
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+from _common import measure, report
+
+from ulid_flake import binary
+from ulid_flake.index import SortedIdIndex
+
+IDS = 100_000_000
+IDS_PER_MS = 100
+CHUNK = 1_000_000
+QUERIES = 1000
+
+TITLE = "Time-range index over packed sorted IDs"
+UNIT = "ns/query"
+
+
+def write_ids(path):
+    """Write `IDS` sorted IDs, `IDS_PER_MS` per millisecond, in chunks."""
+    step = (1 << 20) // IDS_PER_MS
+    with open(path, "wb") as file:
+        for start in range(0, IDS, CHUNK):
+            stop = min(start + CHUNK, IDS)
+            chunk = array("q", range(start * step, stop * step, step))
+            file.write(binary.pack_many(chunk))
+
+
+def run():
+    rng = random.Random(0)
+    milliseconds = IDS // IDS_PER_MS
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ids.bin")
+        write_ids(path)
+        with SortedIdIndex(path) as index:
+            starts = [rng.randrange(milliseconds) for _ in range(QUERIES)]
+            results = {
+                "count_by_time, 10 ms": measure(
+                    lambda: [index.count_by_time(start, start + 10) for start in starts], QUERIES),
+                "range_by_time, 10 ms": measure(
+                    lambda: [index.range_by_time(start, start + 10) for start in starts], QUERIES),
+                "range_by_time, 1 s": measure(
+                    lambda: [index.range_by_time(start, start + 1000) for start in starts[:100]], 100),
+            }
+            start = starts[0]
+            began = time.perf_counter()
+            sum(1 for value in index.reader if start <= value >> 20 < start + 10)
+            results["linear scan, 10 ms"] = (time.perf_counter() - began) * 1e9
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        IDS = int(sys.argv[1])
+    report(f"{TITLE}, {IDS} IDs", run(), unit=UNIT)
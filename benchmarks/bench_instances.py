@@ -0,0 +1,53 @@
+"""
+    benchmarks/bench_instances
+    ~~~~~~~~~~~
+
+    Memory and construction cost of Ulid-Flake instances against the previous
+    `__dict__`-based class.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_instances.py`.
+"""
+import tracemalloc
+
+from _common import measure, report
+
+from ulid_flake.api import UlidFlake
+from ulid_flake.consts import MIN_INT, MAX_INT
+
+N = 100_000
+VALUES = [16873543941148172 + i for i in range(N)]
+
+TITLE = f"Instances, {N} per run"
+UNIT = "per id"
+
+
+class LegacyUlidFlake:
+    """The instance layout before `__slots__`: one `value` stored in `__dict__`."""
+
+    def __init__(self, value):
+        if value < MIN_INT or value > MAX_INT:
+            raise OverflowError("Value exceeds the allowable Ulid-Flake range.")
+        self.value = value
+
+
+def bytes_per_instance(cls):
+    """Return the memory allocated per instance, excluding the shared int values."""
+    tracemalloc.start()
+    instances = [cls(value) for value in VALUES]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size / N
+
+
+def run():
+    return {
+        "legacy construct (ns)": measure(lambda: [LegacyUlidFlake(value) for value in VALUES], N),
+        "slots construct (ns)": measure(lambda: [UlidFlake(value) for value in VALUES], N),
+        "legacy memory (bytes)": bytes_per_instance(LegacyUlidFlake),
+        "slots memory (bytes)": bytes_per_instance(UlidFlake),
+    }
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
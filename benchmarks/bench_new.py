@@ -0,0 +1,59 @@
+"""
+    benchmarks/bench_new
+    ~~~~~~~~~~~
+
+    Single-thread generation: `new()` and `new_int()` of both layouts (and with
+    metrics enabled), `new_str()` against `new().base32`, the module-level
+    `new_int()` / `new_str()` shortcuts, scalable `new()` per sid and
+    `from_unix_epoch_time()`.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_new.py`.
+"""
+from _common import measure, report
+
+import ulid_flake
+from ulid_flake.api import UlidFlake, UlidFlakeGenerator
+from ulid_flake.scalable import UlidFlakeScalable, UlidFlakeScalableGenerator
+
+N = 100_000
+UNIX_TIME = 1_800_000_000.123
+
+TITLE = f"Single-thread generation, {N} IDs per run"
+UNIT = "ns/id"
+
+
+def run():
+    # "spin" keeps tight loops from raising when a millisecond's randomness runs out.
+    generator = UlidFlakeGenerator(overflow_policy="spin")
+    scalable = UlidFlakeScalableGenerator(overflow_policy="spin")
+    metered = UlidFlakeGenerator(overflow_policy="spin")
+    metered.enable_metrics()
+    sids = [i % 32 for i in range(N)]
+    UlidFlake.set_config(overflow_policy="spin")
+    UlidFlakeScalable.set_config(overflow_policy="spin")
+    results = {
+        "UlidFlake new()": measure(lambda: [generator.new() for _ in range(N)], N),
+        "UlidFlake new_int()": measure(lambda: [generator.new_int() for _ in range(N)], N),
+        "UlidFlake new_int(), metrics enabled": measure(lambda: [metered.new_int() for _ in range(N)], N),
+        "UlidFlake.new().int": measure(lambda: [UlidFlake.new().int for _ in range(N)], N),
+        "ulid_flake.new_int()": measure(lambda: [ulid_flake.new_int() for _ in range(N)], N),
+        "ulid_flake.new_str()": measure(lambda: [ulid_flake.new_str() for _ in range(N)], N),
+        "UlidFlake new().base32": measure(lambda: [generator.new().base32 for _ in range(N)], N),
+        "UlidFlake new_str()": measure(lambda: [generator.new_str() for _ in range(N)], N),
+        "UlidFlakeScalable new()": measure(lambda: [scalable.new() for _ in range(N)], N),
+        "UlidFlakeScalable new_int()": measure(lambda: [scalable.new_int() for _ in range(N)], N),
+        "UlidFlakeScalable new(sid), 32 sids": measure(lambda: [scalable.new(sid) for sid in sids], N),
+        "UlidFlakeScalable.new().int": measure(lambda: [UlidFlakeScalable.new().int for _ in range(N)], N),
+        "ulid_flake.new_scalable_int()": measure(lambda: [ulid_flake.new_scalable_int() for _ in range(N)], N),
+        "UlidFlake from_unix_epoch_time()": measure(
+            lambda: [UlidFlake.from_unix_epoch_time(UNIX_TIME) for _ in range(N)], N),
+        "UlidFlakeScalable from_unix_epoch_time()": measure(
+            lambda: [UlidFlakeScalable.from_unix_epoch_time(UNIX_TIME) for _ in range(N)], N),
+    }
+    UlidFlake.reset_config()
+    UlidFlakeScalable.reset_config()
+    return results
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
@@ -0,0 +1,46 @@
+"""
+    benchmarks/bench_numpy
+    ~~~~~~~~~~~
+
+    Vectorized field extraction and Base32 coding of an int64 column against the
+    per-object `UlidFlake` path. Requires numpy.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_numpy.py [rows]` (default 10M rows).
+"""
+import sys
+
+import numpy as np
+from _common import measure, report
+
+from ulid_flake import numpy as ulid_flake_numpy
+from ulid_flake.api import UlidFlake
+
+ROWS = 10_000_000
+
+TITLE = "numpy column against the per-object path"
+UNIT = "ns/row"
+
+
+def run():
+    array = np.array(UlidFlake.new_batch(ROWS, as_int=True), dtype=np.int64)
+    values = array.tolist()
+    encoded = ulid_flake_numpy.encode_base32(array)
+    strings = [value.decode() for value in encoded]
+    # The per-object path takes seconds per pass at 10M rows, so it runs once.
+    return {
+        "per-object timestamp": measure(lambda: [UlidFlake.from_int(value).timestamp for value in values], ROWS, 1),
+        "numpy timestamps": measure(lambda: ulid_flake_numpy.timestamps(array), ROWS),
+        "per-object randomness": measure(lambda: [UlidFlake.from_int(value).randomness for value in values], ROWS, 1),
+        "numpy randomness": measure(lambda: ulid_flake_numpy.randomness(array), ROWS),
+        "numpy to_datetime64": measure(lambda: ulid_flake_numpy.to_datetime64(array), ROWS),
+        "per-object base32": measure(lambda: [UlidFlake.from_int(value).base32 for value in values], ROWS, 1),
+        "numpy encode_base32": measure(lambda: ulid_flake_numpy.encode_base32(array), ROWS),
+        "per-object parse": measure(lambda: [UlidFlake.parse(string).int for string in strings], ROWS, 1),
+        "numpy decode_base32": measure(lambda: ulid_flake_numpy.decode_base32(encoded), ROWS),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        ROWS = int(sys.argv[1])
+    report(f"{TITLE}, {ROWS} rows", run(), unit=UNIT)
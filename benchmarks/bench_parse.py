@@ -0,0 +1,48 @@
+"""
+    benchmarks/bench_parse
+    ~~~~~~~~~~~
+
+    Parsing Base32 strings into instances: the validating `parse()` against a bare
+    decode and construction, and the bulk `validate_many()` / `parse_many()` over
+    valid and invalid input.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_parse.py`.
+"""
+from _common import measure, report
+
+from ulid_flake import base32
+from ulid_flake.api import UlidFlake
+from ulid_flake.scalable import UlidFlakeScalable
+
+N = 100_000
+ENCODED = base32.encode_many(UlidFlake.new_batch(N, as_int=True))
+# Every other string has an invalid last character.
+MIXED = [encoded if i % 2 else encoded[:-1] + "U" for i, encoded in enumerate(ENCODED)]
+
+TITLE = f"Parsing, {N} strings per run"
+UNIT = "ns/id"
+
+
+def _parse_or_none(encoded):
+    try:
+        return base32.parse(encoded)
+    except ValueError:
+        return None
+
+
+def run():
+    return {
+        "UlidFlake parse()": measure(lambda: [UlidFlake.parse(encoded) for encoded in ENCODED], N),
+        "UlidFlakeScalable parse()": measure(lambda: [UlidFlakeScalable.parse(encoded) for encoded in ENCODED], N),
+        "decode without validation": measure(lambda: [UlidFlake(base32.decode(encoded)) for encoded in ENCODED], N),
+        "decode_many without instances": measure(lambda: base32.decode_many(ENCODED), N),
+        "base32.parse()": measure(lambda: [base32.parse(encoded) for encoded in ENCODED], N),
+        "validate_many()": measure(lambda: base32.validate_many(ENCODED), N),
+        "parse_many()": measure(lambda: base32.parse_many(ENCODED), N),
+        "parse_many(), half invalid": measure(lambda: base32.parse_many(MIXED), N),
+        "parse() with except, half invalid": measure(lambda: [_parse_or_none(encoded) for encoded in MIXED], N),
+    }
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
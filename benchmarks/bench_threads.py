@@ -0,0 +1,62 @@
+"""
+    benchmarks/bench_threads
+    ~~~~~~~~~~~
+
+    Multi-threaded generation throughput: `new()` on the shared default generators,
+    and `new_int()` on one shared, locked scalable generator against the lock-free
+    thread-local scalable generator.
+
+    Run with `PYTHONPATH=src python benchmarks/bench_threads.py`.
+"""
+import threading
+import time
+
+from _common import report
+
+from ulid_flake.api import UlidFlake
+from ulid_flake.scalable import ThreadLocalUlidFlakeScalableGenerator, UlidFlakeScalable, UlidFlakeScalableGenerator
+
+THREADS = (1, 4, 16)
+PER_THREAD = 20_000
+
+TITLE = "Multi-threaded generation"
+UNIT = "ids/s"
+
+
+def throughput(new, threads):
+    """Return generated IDs per second with `threads` threads calling `new()`."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(PER_THREAD):
+            new()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * PER_THREAD / (time.perf_counter() - start)
+
+
+def run():
+    results = {}
+    UlidFlake.set_config(overflow_policy="spin")
+    UlidFlakeScalable.set_config(overflow_policy="spin")
+    for threads in THREADS:
+        shared = UlidFlakeScalableGenerator(overflow_policy="spin")
+        local = ThreadLocalUlidFlakeScalableGenerator(overflow_policy="spin")
+        results[f"UlidFlake.new(), {threads} threads"] = throughput(UlidFlake.new, threads)
+        results[f"UlidFlakeScalable.new(), {threads} threads"] = throughput(UlidFlakeScalable.new, threads)
+        results[f"shared lock new_int(), {threads} threads"] = throughput(shared.new_int, threads)
+        results[f"thread-local new_int(), {threads} threads"] = throughput(local.new_int, threads)
+    UlidFlake.reset_config()
+    UlidFlakeScalable.reset_config()
+    return results
+
+
+if __name__ == "__main__":
+    report(TITLE, run(), unit=UNIT)
@@ -0,0 +1,114 @@
+"""
+    benchmarks/run
+    ~~~~~~~~~~~
+
+    Run the Ulid-Flake benchmark suite and store the results as JSON.
+
+    Every `bench_<name>.py` module provides `run()`, returning a dict of results,
+    and its `TITLE` and `UNIT`. The default suite covers the generation, codec and
+    parsing hot paths; the longer benchmarks (asyncio, backfill, time-range index,
+    numpy) run when named. Runs are saved to `benchmarks/results/` and can be
+    compared with an earlier run through `--compare`.
+
+    Run with `make bench`, or `PYTHONPATH=src python benchmarks/run.py [names]`.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from _common import report
+
+DEFAULT_SUITE = ("new", "threads", "batch", "base32", "parse", "binary", "entropy", "instances")
+EXTRA_SUITE = ("aio", "backfill", "index", "numpy")
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _commit():
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run_suite(names):
+    """Run the named benchmarks and return the JSON-serializable record of the run."""
+    record = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+    for name in names:
+        try:
+            module = importlib.import_module(f"bench_{name}")
+        except ImportError as error:
+            print(f"skipping {name}: {error}", file=sys.stderr)
+            continue
+        start = time.perf_counter()
+        results = module.run()
+        unit = getattr(module, "UNIT", "ns/id")
+        report(module.TITLE, results, unit=unit)
+        record["benchmarks"][name] = {
+            "title": module.TITLE,
+            "unit": unit,
+            "seconds": round(time.perf_counter() - start, 3),
+            "results": results,
+        }
+    return record
+
+
+def compare(baseline, record):
+    """Print every result present in both runs with its change relative to `baseline`."""
+    print(f"\nChange against {baseline.get('commit') or 'baseline'} ({baseline['created']}):")
+    for name, benchmark in record["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        print(f"{benchmark['title']} ({benchmark['unit']})")
+        width = max(len(key) for key in benchmark["results"])
+        for key, value in benchmark["results"].items():
+            old = previous["results"].get(key)
+            if old:
+                print(f"  {key:<{width}}  {old:12.1f} -> {value:12.1f}  {(value / old - 1) * 100:+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Ulid-Flake benchmark suite.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default {' '.join(DEFAULT_SUITE)}; "
+                                                 f"also {' '.join(EXTRA_SUITE)})")
+    parser.add_argument("--all", action="store_true", help="run every benchmark")
+    parser.add_argument("-o", "--output", help="JSON file for the results (default benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    args = parser.parse_args(argv)
+
+    names = args.names or (DEFAULT_SUITE + EXTRA_SUITE if args.all else DEFAULT_SUITE)
+    unknown = set(names) - set(DEFAULT_SUITE + EXTRA_SUITE)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    record = run_suite(names)
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+        output = os.path.join(RESULTS_DIRECTORY, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w") as file:
+        json.dump(record, file, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), record)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,33 @@
 __author__ = """abailinrun"""
 __email__ = 'abailinrun@gmail.com'
 __version__ = '0.1.0'
+
+import importlib
+
+__all__ = [
+    "UlidFlake",
+    "UlidFlakeScalable",
+    "new_int",
+    "new_str",
+    "new_scalable_int",
+    "new_scalable_str",
+]
+
+# Module of every name above; imported on first access, so `ulid_flake.cli` starts without the generators.
+_LAZY = {
+    "UlidFlake": "api",
+    "new_int": "api",
+    "new_str": "api",
+    "UlidFlakeScalable": "scalable",
+    "new_scalable_int": "scalable",
+    "new_scalable_str": "scalable",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = getattr(importlib.import_module(f".{module}", __name__), name)
+    return value
@@ -0,0 +1,11 @@
+"""
+    ulid_flake/__main__
+    ~~~~~~~~~~~
+
+    Run the command-line interface with `python -m ulid_flake`.
+"""
+import sys
+
+from ulid_flake.cli import main
+
+sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+    ulid_flake/aio
+    ~~~~~~~~~~~
+
+    asyncio front end for Ulid-Flake generators.
+
+    Generation never blocks the event loop: a busy generator lock is retried after
+    yielding to other tasks, and exhausted randomness (or a clock behind the previous
+    ID under the "wait" clock regression policy) is waited out with `asyncio.sleep`
+    until the generator's clock reaches the next timestamp.
+"""
+import asyncio
+
+from .api import UlidFlakeGenerator
+
+
+class AsyncUlidFlakeGenerator:
+    """Await Ulid-Flakes from a generator without blocking the event loop.
+
+    Wraps `generator` (default a new `UlidFlakeGenerator` built from `config`). On
+    overflow the generator's `overflow_policy` is not applied; tasks always sleep
+    until the next timestamp, and every exhausted timestamp is counted once as
+    "sleep" in `overflow_stats()`.
+    """
+
+    def __init__(self, generator=None, **config):
+        self.generator = UlidFlakeGenerator(**config) if generator is None else generator
+        # Last exhausted timestamp counted as an overflow, per sid.
+        self.exhausted = {}
+
+    def overflow_stats(self):
+        return self.generator.overflow_stats()
+
+    def _check_sid(self, sid):
+        if sid is not None and not 0 <= sid < self.generator.slots:
+            raise ValueError(f"sid must be between 0 and {self.generator.slots - 1}")
+
+    async def _acquire(self):
+        lock = self.generator.lock
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(0)
+            lock = self.generator.lock
+        return lock
+
+    async def _wait_until(self, target):
+        """Sleep until the generator clock reaches `target`."""
+        generator = self.generator
+        timestamp = generator.generate_timestamp()
+        while timestamp < target:
+            await asyncio.sleep((target - timestamp) * generator.resolution_ms / 1000)
+            timestamp = generator.generate_timestamp()
+
+    def _overflowed(self, slot):
+        """Count the exhausted timestamp of `slot` once and return the next one; the caller must hold the lock."""
+        generator = self.generator
+        timestamp = generator.previous_timestamps[slot]
+        if self.exhausted.get(slot) != timestamp:
+            self.exhausted[slot] = timestamp
+            generator.overflow_counts["sleep"] += 1
+            generator._record("overflows")
+        return timestamp + 1
+
+    async def new_int(self, sid=None):
+        """Generate the next monotonic Ulid-Flake as an integer."""
+        self._check_sid(sid)
+        generator = self.generator
+        while True:
+            lock = await self._acquire()
+            try:
+                slot = generator.sid if sid is None else sid
+                timestamp = generator._current_timestamp(slot, wait=False)
+                if timestamp is None:
+                    combined, target = None, generator.previous_timestamps[slot]
+                else:
+                    combined = generator._advance(slot, timestamp)
+                    if combined is None:
+                        target = self._overflowed(slot)
+            finally:
+                lock.release()
+            if combined is not None:
+                return combined
+            await self._wait_until(target)
+
+    async def new(self, sid=None):
+        """Generate the next monotonic Ulid-Flake instance."""
+        return self.generator.id_class(await self.new_int(sid))
+
+    async def stream(self, n, as_int=False, sid=None):
+        """Asynchronously yield `n` monotonic Ulid-Flakes, filling each millisecond under one lock acquisition."""
+        if n < 0:
+            raise ValueError("Batch size must not be negative.")
+        self._check_sid(sid)
+        generator = self.generator
+        id_class = generator.id_class
+        while n > 0:
+            lock = await self._acquire()
+            try:
+                slot = generator.sid if sid is None else sid
+                timestamp = generator._current_timestamp(slot, wait=False)
+                if timestamp is None:
+                    values, target = None, generator.previous_timestamps[slot]
+                else:
+                    values = generator._fill_millisecond(n, slot, timestamp)
+                    if not values:
+                        target = self._overflowed(slot)
+            finally:
+                lock.release()
+            if not values:
+                await self._wait_until(target)
+                continue
+            n -= len(values)
+            for value in values:
+                yield value if as_int else id_class(value)
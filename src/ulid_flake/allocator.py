@@ -0,0 +1,72 @@
+"""
+    ulid_flake/allocator
+    ~~~~~~~~~~~
+
+    sid allocation for Ulid-Flake Scalable worker processes.
+
+    A `FileSidAllocator` leases one sid per process through lock files in a shared
+    directory, so a pool of up to 32 workers can generate in parallel without any
+    coordination on the hot path (more with a layout of more sid bits).
+"""
+import os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from .consts import MIN_SCALABILITY
+from .layout import SCALABLE
+
+
+class FileSidAllocator:
+    """Lease sids to processes through `fcntl.flock` lock files in `directory`.
+
+    A sid stays leased while its lock file is locked, so the operating system
+    releases the leases of processes that exit or crash. A lease inherited through
+    `os.fork()` belongs to the parent; `acquire()` in the child leases a new sid.
+    `sids` defaults to all sids of `layout`.
+    """
+
+    def __init__(self, directory, sids=None, layout=SCALABLE):
+        if fcntl is None:
+            raise RuntimeError("FileSidAllocator requires fcntl (POSIX).")
+        sids = sorted(set(range(MIN_SCALABILITY, layout.max_sid + 1) if sids is None else sids))
+        if not sids or sids[0] < MIN_SCALABILITY or sids[-1] > layout.max_sid:
+            raise ValueError(f"sids must be between {MIN_SCALABILITY} and {layout.max_sid}")
+
+        self.directory = directory
+        self.sids = sids
+        self.sid = None
+        self.fd = None
+        self.pid = None
+
+    def acquire(self):
+        """Return the sid leased by this process, leasing a free one if needed."""
+        if self.sid is not None and self.pid == os.getpid():
+            return self.sid
+        self._forget()
+
+        os.makedirs(self.directory, exist_ok=True)
+        for sid in self.sids:
+            fd = os.open(os.path.join(self.directory, f"sid-{sid}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            self.sid, self.fd, self.pid = sid, fd, os.getpid()
+            return sid
+        raise RuntimeError("All sids are leased by other processes.")
+
+    def release(self):
+        """Give up the sid leased by this process."""
+        if self.fd is not None and self.pid == os.getpid():
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self._forget()
+
+    def _forget(self):
+        # Only close the descriptor: unlocking an inherited one would drop the parent's lease.
+        if self.fd is not None:
+            os.close(self.fd)
+        self.sid, self.fd, self.pid = None, None, None
@@ -4,26 +4,33 @@
 
     Ulid-Flake implementation.
 """
-import os
-import threading
-from datetime import datetime, timezone
+from functools import total_ordering
 from .consts import (
-    DEFAULT_EPOCH,
     MIN_INT, MAX_INT,
-    MAX_TIMESTAMP,
-    MAX_RANDOMNESS,
-    MIN_ENTROPY_SIZE, MAX_ENTROPY_SIZE,
+    MIN_ENTROPY_SIZE,
     ULID_FLAKE_LEN,
 )
-from . import base32
+from . import base32, binary
+from .generator import Generator
+from .layout import STANDALONE, layout_class
 
 
+class UlidFlakeGenerator(Generator):
+    """Stand-alone Ulid-Flake generator, by default with 43-bit timestamp and 20-bit randomness."""
+    default_layout = STANDALONE
+
+    @property
+    def id_class(self):
+        return layout_class(UlidFlake, self.layout)
+
+
+@total_ordering
 class UlidFlake:
-    epoch_time = DEFAULT_EPOCH
-    entropy_size = MIN_ENTROPY_SIZE
-    previous_timestamp = None
-    previous_randomness = None
-    lock = threading.Lock()
+    __slots__ = ("value",)
+
+    # Layout used to decode the fields; generators with other layouts use subclasses (see `layout_class`).
+    layout = STANDALONE
+    default_generator = UlidFlakeGenerator()
 
     def __init__(self, value):
         if value < MIN_INT or value > MAX_INT:
@@ -33,6 +40,35 @@ class UlidFlake:
     def __str__(self):
         return self.base32
 
+    def __repr__(self):
+        return f"{type(self).__name__}('{self.base32}')"
+
+    def __eq__(self, other):
+        if not isinstance(other, UlidFlake):
+            return NotImplemented
+        return self.value == other.value
+
+    def __lt__(self, other):
+        if not isinstance(other, UlidFlake):
+            return NotImplemented
+        return self.value < other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __int__(self):
+        return self.value
+
+    def __index__(self):
+        return self.value
+
+    def __bytes__(self):
+        return self.value.to_bytes(8, byteorder="big")
+
+    def to_bytes(self):
+        """Return the 8-byte big-endian form, which sorts like the Ulid-Flake itself."""
+        return self.value.to_bytes(8, byteorder="big")
+
     @property
     def int(self):
         return self.value
@@ -51,117 +87,141 @@ class UlidFlake:
 
     @property
     def timestamp(self):
-        return (self.value >> 20) & MAX_TIMESTAMP
+        layout = self.layout
+        return (self.value >> layout.timestamp_shift) & layout.max_timestamp
 
     @property
     def randomness(self):
-        return self.value & MAX_RANDOMNESS
+        layout = self.layout
+        return (self.value >> layout.randomness_shift) & layout.max_randomness
 
     @classmethod
-    def set_config(cls, epoch_time=DEFAULT_EPOCH, entropy_size=MIN_ENTROPY_SIZE):
-        if entropy_size <= 0 or entropy_size > MAX_ENTROPY_SIZE:
-            raise ValueError(f"Entropy size must be between 1 and {MAX_ENTROPY_SIZE}.")
+    def set_config(cls, *args, **kwargs):
+        """Configure the default generator; see `UlidFlakeGenerator.set_config`.
 
-        cls.epoch_time = epoch_time
-        cls.entropy_size = entropy_size
+        With another `layout` the generator, `parse` and the `from_*` constructors return
+        instances of a subclass bound to it, so the class layout and existing instances
+        keep decoding their fields as before.
+        """
+        cls.default_generator.set_config(*args, **kwargs)
 
     @classmethod
-    def reset_config(self):
-        self.epoch_time = DEFAULT_EPOCH
-        self.entropy_size = MIN_ENTROPY_SIZE
+    def reset_config(cls):
+        cls.default_generator.reset_config()
 
     @classmethod
     def generate_timestamp(cls):
-        """Generate a 43-bit timestamp (milliseconds since Ulid-Flake epoch)."""
-        timestamp = int((datetime.now(timezone.utc) - cls.epoch_time).total_seconds() * 1000)
-        if timestamp > MAX_TIMESTAMP:
-            raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
-        return timestamp
+        """Generate a timestamp (milliseconds, or ticks of the layout resolution, since Ulid-Flake epoch)."""
+        return cls.default_generator.generate_timestamp()
+
+    @classmethod
+    def overflow_stats(cls):
+        """Return how often each overflow policy path was taken by the default generator."""
+        return cls.default_generator.overflow_stats()
+
+    @classmethod
+    def stats(cls):
+        """Return a snapshot of the default generator's metrics."""
+        return cls.default_generator.stats()
+
+    @classmethod
+    def enable_metrics(cls, callback=None):
+        """Start counting generated IDs, increments and lock waits on the default generator."""
+        cls.default_generator.enable_metrics(callback)
+
+    @classmethod
+    def disable_metrics(cls):
+        cls.default_generator.disable_metrics()
 
     @classmethod
     def generate_randomness(cls):
-        """Generate a 20-bit randomness value."""
-        return int.from_bytes(os.urandom(3), byteorder="big") & MAX_RANDOMNESS
+        """Generate a randomness value (20-bit in the default layout)."""
+        return cls.default_generator.generate_randomness()
 
     @classmethod
     def generate_entropy(cls, size=MIN_ENTROPY_SIZE):
         """Generate an entropy value to increment randomness."""
-        if size <= 0 or size > MAX_ENTROPY_SIZE:  # Ensure entropy size is within a reasonable range
-            raise ValueError(f"Entropy size must be between 1 and {MAX_ENTROPY_SIZE}.")
-        return int.from_bytes(os.urandom(size), byteorder="big")
+        return cls.default_generator.generate_entropy(size)
 
     @classmethod
     def new(cls):
-        """Generate a 64-bit signed Ulid-Flake with 43-bit timestamp and 20-bit randomness."""
-        with cls.lock:
-            timestamp = cls.generate_timestamp()
-
-            if timestamp == cls.previous_timestamp:
-                entropy = cls.generate_entropy(cls.entropy_size)
-                while entropy <= 0:
-                    entropy = cls.generate_entropy(cls.entropy_size)
-                new_randomness = (cls.previous_randomness + entropy)
-                if new_randomness > MAX_RANDOMNESS:
-                    raise OverflowError("Randomness exceeds maximum ULID value.")
-                randomness = new_randomness
-            else:
-                randomness = cls.generate_randomness()
-
-            cls.previous_timestamp = timestamp
-            cls.previous_randomness = randomness
+        """Generate a 64-bit signed Ulid-Flake, by default with 43-bit timestamp and 20-bit randomness."""
+        return cls.default_generator.new()
 
-            # Set the sign bit to 0 (positive)
-            sign_bit = 0
+    @classmethod
+    def new_str(cls):
+        """Generate the next Ulid-Flake as a Base32 string without building an instance."""
+        return cls.default_generator.new_str()
 
-            # Combine the sign bit, timestamp, and randomness
-            combined = (sign_bit << 63) | (timestamp << 20) | randomness
+    @classmethod
+    def reserve(cls, n):
+        """Claim `n` consecutive monotonic values from the default generator as an `IdBlock`."""
+        return cls.default_generator.reserve(n)
 
-            if combined > MAX_INT:
-                raise OverflowError("Value exceeds the allowable Ulid-Flake range.")
+    @classmethod
+    def new_batch(cls, n, as_int=False):
+        """Generate a list of `n` monotonic Ulid-Flakes, as instances or (with `as_int`) plain integers."""
+        return cls.default_generator.new_batch(n, as_int=as_int)
 
-            return cls(combined)
+    @classmethod
+    def iter_new(cls, n, as_int=False):
+        """Yield `n` monotonic Ulid-Flakes, rolling over to the next millisecond instead of overflowing."""
+        return cls.default_generator.iter_new(n, as_int=as_int)
 
     @classmethod
-    def parse(cls, ulid_flake_string):
-        """Parse a Ulid-Flake string to create a Ulid-Flake instance."""
-        if len(ulid_flake_string) != ULID_FLAKE_LEN:
-            raise ValueError(f"Ulid-Flake string must be {ULID_FLAKE_LEN} characters long.")
-        try:
-            value = base32.decode(ulid_flake_string.upper())
-        except ValueError:
-            raise ValueError("Ulid-Flake string contains invalid Base32 characters.")
+    def _decoding_class(cls):
+        # Instances made from values decode their fields with the layout of the default generator.
+        return cls.default_generator.id_class
 
-        if value < MIN_INT or value > MAX_INT:
-            raise OverflowError("Parsed value exceeds the allowable Ulid-Flake range.")
+    @classmethod
+    def parse(cls, ulid_flake_string, strict=True):
+        """Parse a Ulid-Flake string to create a Ulid-Flake instance.
 
-        return cls(value)
+        With `strict=False` the Crockford aliases I, L (for 1) and O (for 0) are accepted.
+        """
+        return cls._decoding_class()(base32.parse(ulid_flake_string, strict))
 
     @classmethod
     def from_int(cls, value):
         """Create a Ulid-Flake instance from an integer."""
         if value < MIN_INT or value > MAX_INT:
             raise OverflowError("Integer value exceeds the allowable Ulid-Flake range.")
-        return cls(value)
+        return cls._decoding_class()(value)
 
     @classmethod
     def from_str(cls, ulid_flake_string):
         """Create a Ulid-Flake instance from a Base32 string."""
         return cls.parse(ulid_flake_string)
 
+    @classmethod
+    def from_bytes(cls, data):
+        """Create a Ulid-Flake instance from its 8-byte big-endian form."""
+        return cls._decoding_class()(binary.unpack(data))
+
     @classmethod
     def from_unix_epoch_time(cls, unix_time):
         """Create a Ulid-Flake instance from a Unix epoch time."""
-        if not isinstance(unix_time, (int, float)):
-            raise ValueError("unix_time must be an integer or float representing seconds since Unix epoch.")
+        return cls.default_generator.from_unix_epoch_time(unix_time)
+
+    @classmethod
+    def fill_from_unix_epoch_times(cls, unix_times, out, unit="s"):
+        """Write a Ulid-Flake for each of `unix_times` into the int64 buffer `out`; return the number written."""
+        return cls.default_generator.fill_from_unix_epoch_times(unix_times, out, unit=unit)
+
+
+# Pre-bound default generator entry points for the module-level shortcuts.
+_new_int = UlidFlake.default_generator._new_int
+_new_str = UlidFlake.default_generator._new_str
+
+
+def new_int():
+    """Generate the next Ulid-Flake of the default generator as a plain 63-bit integer.
 
-        if unix_time < cls.epoch_time.timestamp():
-            raise ValueError("Unix timestamp is before the custom epoch time.")
+    Skips building an instance and its range check, for callers that only need the value.
+    """
+    return _new_int(None)
 
-        timestamp = int((datetime.fromtimestamp(unix_time, tz=timezone.utc) - cls.epoch_time).total_seconds() * 1000)
-        if timestamp > MAX_TIMESTAMP:
-            raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
 
-        randomness = cls.generate_randomness()
-        sign_bit = 0
-        combined = (sign_bit << 63) | (timestamp << 20) | randomness
-        return cls(combined)
+def new_str():
+    """Generate the next Ulid-Flake of the default generator as a 13-character Base32 string."""
+    return _new_str(None)
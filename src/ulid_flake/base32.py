@@ -3,19 +3,130 @@
     ~~~~~~~~~~~
 
     Base32 encoding and decoding for Ulid-Flake.
+
+    Encoding goes through a table of all 1024 two-character pairs, so a 13-character
+    Ulid-Flake is built from 7 lookups. Decoding translates the Crockford alphabet
+    (either case) to the digits understood by `int(..., 32)` with a 256-entry table.
+    The same table validates Ulid-Flake strings: `parse` rejects bad input before
+    decoding it, and `validate_many` / `parse_many` check large inputs without
+    raising per item.
 """
+from .consts import ULID_FLAKE_LEN
 
 ENCODING = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
 
+# Every 10-bit value encoded as two characters.
+ENCODING_PAIRS = tuple(high + low for high in ENCODING for low in ENCODING)
+
+# Maps each byte of a Crockford Base32 string to the matching `int(..., 32)` digit.
+# Bytes outside the alphabet map to "!", which `int` rejects.
+_INT_DIGITS = b"0123456789abcdefghijklmnopqrstuv"
+DECODING = bytearray(b"!" * 256)
+for _index, _char in enumerate(ENCODING):
+    DECODING[ord(_char)] = _INT_DIGITS[_index]
+    DECODING[ord(_char.lower())] = _INT_DIGITS[_index]
+DECODING = bytes(DECODING)
+del _index, _char
+
+# As `DECODING`, also accepting the Crockford aliases I and L for 1 and O for 0.
+LENIENT_DECODING = bytearray(DECODING)
+for _alias, _char in (("I", "1"), ("L", "1"), ("O", "0")):
+    for _case in (str.upper, str.lower):
+        LENIENT_DECODING[ord(_case(_alias))] = DECODING[ord(_char)]
+LENIENT_DECODING = bytes(LENIENT_DECODING)
+del _alias, _char, _case
+
+# The largest leading digit of a 13-character string within the 63-bit range ("7").
+_MAX_FIRST_DIGIT = ord("7")
+
 
 def encode(value, length):
     """Encode a value to a Base32 string with a specified length."""
+    if length == ULID_FLAKE_LEN:
+        return _encode_ulid_flake(value)
     return ''.join([ENCODING[(value >> (5 * i)) & 31] for i in range(length-1, -1, -1)])
 
 
+def _encode_ulid_flake(value, encoding=ENCODING, pairs=ENCODING_PAIRS):
+    """Encode a value to a 13-character Base32 string."""
+    return (
+        encoding[(value >> 60) & 31]
+        + pairs[(value >> 50) & 1023]
+        + pairs[(value >> 40) & 1023]
+        + pairs[(value >> 30) & 1023]
+        + pairs[(value >> 20) & 1023]
+        + pairs[(value >> 10) & 1023]
+        + pairs[value & 1023]
+    )
+
+
 def decode(encoded):
-    """Decode a Base32 string to a numeric value."""
-    value = 0
-    for char in encoded:
-        value = value * 32 + ENCODING.index(char)
-    return value
+    """Decode a Base32 string (upper or lower case) to a numeric value."""
+    if not encoded:
+        return 0
+    try:
+        return int(encoded.encode("ascii").translate(DECODING), 32)
+    except ValueError:
+        raise ValueError("String contains invalid Base32 characters.") from None
+
+
+def encode_many(values, length=ULID_FLAKE_LEN):
+    """Encode a sequence of values to a list of Base32 strings."""
+    if length == ULID_FLAKE_LEN:
+        return [_encode_ulid_flake(value) for value in values]
+    return [encode(value, length) for value in values]
+
+
+def decode_many(encoded_values):
+    """Decode a sequence of Base32 strings to a list of numeric values."""
+    table = DECODING
+    try:
+        return [int(encoded.encode("ascii").translate(table), 32) if encoded else 0 for encoded in encoded_values]
+    except ValueError:
+        raise ValueError("String contains invalid Base32 characters.") from None
+
+
+def _digits(encoded, table):
+    # Non-ASCII characters become "?", which the tables map to "!" like every other invalid byte.
+    return encoded.encode("ascii", "replace").translate(table)
+
+
+def parse(encoded, strict=True):
+    """Decode a 13-character Ulid-Flake string, validating its length, alphabet and 63-bit range.
+
+    With `strict=False` the Crockford aliases I and L (for 1) and O (for 0) are accepted.
+    """
+    if len(encoded) != ULID_FLAKE_LEN:
+        raise ValueError(f"Ulid-Flake string must be {ULID_FLAKE_LEN} characters long.")
+    digits = _digits(encoded, DECODING if strict else LENIENT_DECODING)
+    if b"!" in digits:
+        raise ValueError("Ulid-Flake string contains invalid Base32 characters.")
+    if digits[0] > _MAX_FIRST_DIGIT:
+        raise OverflowError("Parsed value exceeds the allowable Ulid-Flake range.")
+    return int(digits, 32)
+
+
+def validate_many(encoded_values, strict=True):
+    """Return a list of booleans telling which of the strings are valid Ulid-Flakes."""
+    table = DECODING if strict else LENIENT_DECODING
+    mask = []
+    for encoded in encoded_values:
+        if len(encoded) != ULID_FLAKE_LEN:
+            mask.append(False)
+            continue
+        digits = _digits(encoded, table)
+        mask.append(b"!" not in digits and digits[0] <= _MAX_FIRST_DIGIT)
+    return mask
+
+
+def parse_many(encoded_values, strict=True):
+    """Parse a sequence of Ulid-Flake strings to a list of values, with `None` for every invalid string."""
+    table = DECODING if strict else LENIENT_DECODING
+    values = []
+    for encoded in encoded_values:
+        if len(encoded) != ULID_FLAKE_LEN:
+            values.append(None)
+            continue
+        digits = _digits(encoded, table)
+        values.append(int(digits, 32) if b"!" not in digits and digits[0] <= _MAX_FIRST_DIGIT else None)
+    return values
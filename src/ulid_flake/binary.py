@@ -0,0 +1,145 @@
+"""
+    ulid_flake/binary
+    ~~~~~~~~~~~
+
+    Packed binary form of Ulid-Flake.
+
+    Every Ulid-Flake packs into 8 big-endian bytes, which sort the same way as the
+    IDs themselves. Buffers of packed IDs are read and written in one `struct` or
+    `array` call instead of one conversion per ID, and `PackedReader` exposes a
+    memory-mapped file of packed IDs as a sequence.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from .consts import MIN_INT, MAX_INT, ULID_FLAKE_BYTES
+
+_ITEM = struct.Struct(">q")
+_CHUNK_BYTES = 8192 * ULID_FLAKE_BYTES  # Unpacked at once by `PackedReader` iterators
+_NON_NEGATIVE_HIGH_BYTES = bytes(range(0x80))
+
+
+def pack(value):
+    """Pack a Ulid-Flake value into 8 big-endian bytes."""
+    if value < MIN_INT or value > MAX_INT:
+        raise OverflowError("Value exceeds the allowable Ulid-Flake range.")
+    return value.to_bytes(ULID_FLAKE_BYTES, byteorder="big")
+
+
+def unpack(data):
+    """Unpack a Ulid-Flake value from 8 big-endian bytes."""
+    if len(data) != ULID_FLAKE_BYTES:
+        raise ValueError(f"Packed Ulid-Flake must be {ULID_FLAKE_BYTES} bytes long.")
+    value = int.from_bytes(data, byteorder="big")
+    if value > MAX_INT:
+        raise OverflowError("Unpacked value exceeds the allowable Ulid-Flake range.")
+    return value
+
+
+def pack_many(values, out=None, offset=0):
+    """Pack a sequence of Ulid-Flake values into one contiguous big-endian buffer.
+
+    Returns new `bytes`, or writes into the writable buffer `out` at byte `offset` and returns `out`.
+    """
+    try:
+        packed = array("q", values)
+    except OverflowError:
+        raise OverflowError("Value exceeds the allowable Ulid-Flake range.") from None
+    if sys.byteorder == "little":
+        packed.byteswap()
+    packed = packed.tobytes()
+    _check_sign(packed)
+    if out is None:
+        return packed
+    memoryview(out).cast("B")[offset:offset + len(packed)] = packed
+    return out
+
+
+def unpack_many(data):
+    """Unpack a buffer of packed Ulid-Flakes into an `array("q")` of values."""
+    _check_size(data)
+    values = array("q")
+    values.frombytes(data)
+    _check_sign(data)
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+def iter_unpack(data):
+    """Return an iterator lazily unpacking the values of a buffer of packed Ulid-Flakes."""
+    _check_size(data)
+    return _iter_unpack(data)
+
+
+def _iter_unpack(data):
+    for (value,) in _ITEM.iter_unpack(data):
+        if value < 0:
+            raise OverflowError("Unpacked value exceeds the allowable Ulid-Flake range.")
+        yield value
+
+
+def _check_sign(data):
+    # Negative values have the top bit of their first byte set; find them without unpacking.
+    if bytes(memoryview(data).cast("B")[::ULID_FLAKE_BYTES]).translate(None, _NON_NEGATIVE_HIGH_BYTES):
+        raise OverflowError("Value exceeds the allowable Ulid-Flake range.")
+
+
+def _check_size(data):
+    if memoryview(data).nbytes % ULID_FLAKE_BYTES:
+        raise ValueError(f"Packed Ulid-Flakes must be a multiple of {ULID_FLAKE_BYTES} bytes long.")
+
+
+class PackedReader:
+    """Read-only sequence of the Ulid-Flake values in a memory-mapped file of packed IDs.
+
+    Indexing unpacks a single ID straight from the mapping and slicing unpacks only
+    the selected range, so large ID logs are scanned without loading them.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            if size % ULID_FLAKE_BYTES:
+                raise ValueError(f"Packed Ulid-Flake file size must be a multiple of {ULID_FLAKE_BYTES} bytes.")
+            # An empty file cannot be mapped.
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.view = memoryview(self.mmap) if size else memoryview(b"")
+        self.length = size // ULID_FLAKE_BYTES
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step != 1:
+                return array("q", [self[i] for i in range(start, stop, step)])
+            return unpack_many(self.view[start * ULID_FLAKE_BYTES:max(start, stop) * ULID_FLAKE_BYTES])
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("PackedReader index out of range")
+        value = _ITEM.unpack_from(self.view, index * ULID_FLAKE_BYTES)[0]
+        if value < 0:
+            raise OverflowError("Unpacked value exceeds the allowable Ulid-Flake range.")
+        return value
+
+    def __iter__(self):
+        # Unpack a chunk at a time without keeping the view exported, so `close` works mid-iteration.
+        for offset in range(0, self.length * ULID_FLAKE_BYTES, _CHUNK_BYTES):
+            yield from unpack_many(self.view[offset:offset + _CHUNK_BYTES])
+
+    def close(self):
+        """Release the view and unmap the file."""
+        self.view.release()
+        if self.mmap is not None:
+            self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,88 @@
+"""
+    ulid_flake/block
+    ~~~~~~~~~~~
+
+    Reserved blocks of Ulid-Flakes.
+
+    `Generator.reserve(n)` claims `n` consecutive values under one lock acquisition
+    and returns an `IdBlock`. A block stores only where it starts, so it is cheap to
+    slice, split and hand to worker threads, which assign IDs from their part
+    without touching the generator again.
+"""
+from .layout import STANDALONE
+
+
+class IdBlock:
+    """Immutable sequence of `length` consecutive Ulid-Flake values of one sid.
+
+    Values are counted by `start` (timestamp times randomness range plus
+    randomness): each value increments the randomness by 1 and a block rolls over
+    to randomness 0 of the next timestamp, so values are strictly increasing.
+    """
+    __slots__ = ("start", "length", "sid", "layout")
+
+    def __init__(self, start, length, sid=0, layout=STANDALONE):
+        self.start = start
+        self.length = length
+        self.sid = sid
+        self.layout = layout
+
+    def _value(self, position):
+        layout = self.layout
+        timestamp, randomness = divmod(position, layout.max_randomness + 1)
+        return (timestamp << layout.timestamp_shift) | (randomness << layout.randomness_shift) | self.sid
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step != 1:
+                return [self._value(self.start + i) for i in range(start, stop, step)]
+            return IdBlock(self.start + start, max(stop - start, 0), self.sid, self.layout)
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("IdBlock index out of range")
+        return self._value(self.start + index)
+
+    def __iter__(self):
+        layout = self.layout
+        timestamp_shift = layout.timestamp_shift
+        shift = layout.randomness_shift
+        randomness_range = layout.max_randomness + 1
+        position, end = self.start, self.start + self.length
+        # One list per timestamp: only the randomness changes within it.
+        while position < end:
+            timestamp, randomness = divmod(position, randomness_range)
+            stop = min(randomness_range, randomness + end - position)
+            prefix = (timestamp << timestamp_shift) | self.sid
+            yield from [prefix | (r << shift) for r in range(randomness, stop)]
+            position += stop - randomness
+
+    def __contains__(self, value):
+        layout = self.layout
+        if value & layout.max_sid != self.sid:
+            return False
+        position = ((value >> layout.timestamp_shift) * (layout.max_randomness + 1)
+                    + ((value >> layout.randomness_shift) & layout.max_randomness))
+        return self.start <= position < self.start + self.length
+
+    def __repr__(self):
+        if not self.length:
+            return "IdBlock([])"
+        return f"IdBlock({self[0]}..{self[-1]}, length={self.length})"
+
+    def split(self, parts):
+        """Split the block into `parts` consecutive blocks of (almost) equal length, e.g. one per worker."""
+        if parts <= 0:
+            raise ValueError("Number of parts must be positive.")
+        size, extra = divmod(self.length, parts)
+        blocks = []
+        start = 0
+        for part in range(parts):
+            length = size + (part < extra)
+            blocks.append(self[start:start + length])
+            start += length
+        return blocks
@@ -3,77 +3,196 @@
     ~~~~~~~~~~~
 
     Command-line interface for Ulid-Flake.
+
+    `gen` streams IDs, `decode` splits IDs into their fields as CSV or NDJSON and
+    `bench` reports generation throughput. Output is written in blocks to the binary
+    stdout, and only the codecs and the standard library are imported at startup
+    (the generators on first use), so the command stays cheap inside shell loops and pipelines.
 """
-from ulid_flake.api import UlidFlake
-from ulid_flake.scalable import UlidFlakeScalable
-
-import typer
-from rich.console import Console
-
-app = typer.Typer()
-console = Console()
-
-
-@app.command()
-def main(n: int = 5, entropy: int = 1, sid: int = 0):
-    ulid_flake_ascii = """
-    ██╗░░░██╗██╗░░░░░██╗██████╗░░░░░░░███████╗██╗░░░░░░█████╗░██╗░░██╗███████╗
-    ██║░░░██║██║░░░░░██║██╔══██╗░░░░░░██╔════╝██║░░░░░██╔══██╗██║░██╔╝██╔════╝
-    ██║░░░██║██║░░░░░██║██║░░██║█████╗█████╗░░██║░░░░░███████║█████═╝░█████╗░░
-    ██║░░░██║██║░░░░░██║██║░░██║╚════╝██╔══╝░░██║░░░░░██╔══██║██╔═██╗░██╔══╝░░
-    ╚██████╔╝███████╗██║██████╔╝░░░░░░██║░░░░░███████╗██║░░██║██║░╚██╗███████╗
-    ░╚═════╝░╚══════╝╚═╝╚═════╝░░░░░░░╚═╝░░░░░╚══════╝╚═╝░░╚═╝╚═╝░░╚═╝╚══════╝
-    """
-    print(ulid_flake_ascii)
-    ulid_flake = UlidFlake.new()
-    print(f"New Ulid-Flake: \n{ulid_flake}\n")
-    print(f"Timestamp: {ulid_flake.timestamp}")
-    print(f"Randomness: {ulid_flake.randomness}\n")
-    print(f"Base32: {ulid_flake.base32}")
-    print(f"Int: {ulid_flake.int}")
-    print(f"Hex: {ulid_flake.hex}")
-    print(f"Binary: {ulid_flake.bin}")
-
-    print("\nMonotonically increasing testing:\n")
-    UlidFlake.set_config(entropy_size=entropy)
-    for _ in range(n):
-        ulid_instance = UlidFlake.new()
-        print(f"Generated ULID (Base32): {ulid_instance.base32}")
-        print(f"Generated ULID (BigInt): {ulid_instance.int}")
-        print(f"Generated ULID (Hex): {ulid_instance.hex}")
-        print(f"Generated ULID (Bin): {ulid_instance.bin}")
-        print()
-    UlidFlake.reset_config()
-
-    ulid_flake_ascii = """
-    ██╗░░░██╗██╗░░░░░██╗██████╗░░░░░░░███████╗██╗░░░░░░█████╗░██╗░░██╗███████╗░░░░░░░██████╗
-    ██║░░░██║██║░░░░░██║██╔══██╗░░░░░░██╔════╝██║░░░░░██╔══██╗██║░██╔╝██╔════╝░░░░░░██╔════╝
-    ██║░░░██║██║░░░░░██║██║░░██║█████╗█████╗░░██║░░░░░███████║█████═╝░█████╗░░█████╗╚█████╗░
-    ██║░░░██║██║░░░░░██║██║░░██║╚════╝██╔══╝░░██║░░░░░██╔══██║██╔═██╗░██╔══╝░░╚════╝░╚═══██╗
-    ╚██████╔╝███████╗██║██████╔╝░░░░░░██║░░░░░███████╗██║░░██║██║░╚██╗███████╗░░░░░░██████╔╝
-    ░╚═════╝░╚══════╝╚═╝╚═════╝░░░░░░░╚═╝░░░░░╚══════╝╚═╝░░╚═╝╚═╝░░╚═╝╚══════╝░░░░░░╚═════╝░
-    """
-    print(ulid_flake_ascii)
-    ulid_flake = UlidFlakeScalable.new()
-    print(f"New Ulid-Flake: \n{ulid_flake}\n")
-    print(f"Timestamp: {ulid_flake.timestamp}")
-    print(f"Randomness: {ulid_flake.randomness}\n")
-    print(f"Base32: {ulid_flake.base32}")
-    print(f"Int: {ulid_flake.int}")
-    print(f"Hex: {ulid_flake.hex}")
-    print(f"Binary: {ulid_flake.bin}")
-
-    print("\nMonotonically increasing testing:\n")
-    UlidFlakeScalable.set_config(entropy_size=entropy, sid=sid)
+import argparse
+import json
+import os
+import sys
+import time
+
+from ulid_flake import base32, binary
+from ulid_flake.consts import MAX_SCALABILITY, ULID_FLAKE_BYTES
+
+CHUNK = 8192  # IDs generated, formatted and written per block
+
+FORMATS = ("base32", "int", "hex", "binary")
+
+_FORMATTERS = {
+    "base32": base32.encode_many,
+    "int": lambda values: map(str, values),
+    "hex": lambda values: map(hex, values),
+}
+
+
+_PARSERS = {
+    "base32": base32.parse,
+    "int": lambda line: int(line, 10),
+    "hex": lambda line: int(line, 16),
+}
+
+
+def _id_class(args):
+    if args.scalable:
+        from ulid_flake.scalable import UlidFlakeScalable
+        return UlidFlakeScalable
+    from ulid_flake.api import UlidFlake
+    return UlidFlake
+
+
+def _configure(args, **config):
+    id_class = _id_class(args)
+    if args.scalable:
+        config["sid"] = args.sid
+    id_class.set_config(entropy_size=args.entropy, **config)
+    return id_class
+
+
+def gen(args, stdout):
+    """Stream `n` monotonic IDs in the chosen format, one per line (`binary`: packed 8-byte big-endian)."""
+    id_class = _configure(args)
+    remaining = args.n
+    while remaining > 0:
+        values = id_class.new_batch(min(remaining, CHUNK), as_int=True)
+        remaining -= len(values)
+        if args.format == "binary":
+            stdout.write(binary.pack_many(values))
+        else:
+            stdout.write("\n".join(_FORMATTERS[args.format](values)).encode("ascii"))
+            stdout.write(b"\n")
+
+
+def _read_values(args, stdin):
+    """Yield `(line number, value)` for every ID of the input."""
+    if args.input_format == "binary":
+        number = 0
+        while True:
+            block = stdin.read(CHUNK * ULID_FLAKE_BYTES)
+            if not block:
+                return
+            for value in binary.unpack_many(block):
+                number += 1
+                yield number, value
+    parse = _PARSERS[args.input_format]
+    for number, line in enumerate(stdin, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, parse(line.decode("ascii"))
+        except (UnicodeDecodeError, ValueError, OverflowError) as error:
+            raise ValueError(f"line {number}: invalid Ulid-Flake {line.decode('ascii', 'replace')!r}") from error
+
+
+def decode(args, stdin, stdout):
+    """Emit the fields of every ID read from stdin or a file as CSV or NDJSON."""
+    id_class = _id_class(args)
+    fields = ["id", "int", "timestamp", "randomness"] + (["sid"] if args.scalable else [])
+    block = []
+    if args.output == "csv":
+        block.append(",".join(fields))
+    for number, value in _read_values(args, stdin):
+        try:
+            ulid_flake = id_class.from_int(value)
+        except OverflowError as error:
+            raise ValueError(f"line {number}: {error}") from error
+        row = [ulid_flake.base32, value, ulid_flake.timestamp, ulid_flake.randomness]
+        if args.scalable:
+            row.append(ulid_flake.sid)
+        if args.output == "csv":
+            block.append(",".join(map(str, row)))
+        else:
+            block.append(json.dumps(dict(zip(fields, row)), separators=(",", ":")))
+        if len(block) >= CHUNK:
+            stdout.write(("\n".join(block) + "\n").encode("ascii"))
+            block = []
+    if block:
+        stdout.write(("\n".join(block) + "\n").encode("ascii"))
+
+
+def bench(args, stdout):
+    """Report generation and formatting throughput in IDs per second."""
+    id_class = _configure(args, overflow_policy="spin")
+    n = args.n
+    results = {}
+
+    start = time.perf_counter()
     for _ in range(n):
-        ulid_instance = UlidFlakeScalable.new()
-        print(f"Generated ULID (Base32): {ulid_instance.base32}")
-        print(f"Generated ULID (BigInt): {ulid_instance.int}")
-        print(f"Generated ULID (Hex): {ulid_instance.hex}")
-        print(f"Generated ULID (Bin): {ulid_instance.bin}")
-        print()
-    UlidFlakeScalable.reset_config()
+        id_class.new()
+    results["new"] = n / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    values = id_class.new_batch(n, as_int=True)
+    results["new_batch"] = n / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    base32.encode_many(values)
+    results["base32 encode"] = n / (time.perf_counter() - start)
+
+    width = max(len(name) for name in results)
+    stdout.write("".join(f"{name:<{width}}  {rate:12.0f} ids/s\n" for name, rate in results.items()).encode("ascii"))
+
+
+def _count(text):
+    n = int(text)
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {text}")
+    return n
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ulid-flake", description="Generate and decode Ulid-Flake IDs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    layout = argparse.ArgumentParser(add_help=False)
+    layout.add_argument("--scalable", action="store_true", help="use the Ulid-Flake Scalable layout (with sid)")
+
+    config = argparse.ArgumentParser(add_help=False, parents=[layout])
+    config.add_argument("--entropy", type=int, default=1, help="entropy size in bytes (default 1)")
+    config.add_argument("--sid", type=int, default=0, help=f"sid 0-{MAX_SCALABILITY} for --scalable (default 0)")
+
+    gen_parser = subparsers.add_parser("gen", parents=[config], help="stream new IDs to stdout")
+    gen_parser.add_argument("n", type=_count, nargs="?", default=1, help="number of IDs (default 1)")
+    gen_parser.add_argument("-f", "--format", choices=FORMATS, default="base32",
+                            help="output format; binary is packed 8-byte big-endian (default base32)")
+
+    decode_parser = subparsers.add_parser("decode", parents=[layout], help="decode IDs into their fields")
+    decode_parser.add_argument("file", nargs="?", type=argparse.FileType("rb"), default="-",
+                               help="file of IDs, one per line (default stdin)")
+    decode_parser.add_argument("-i", "--input-format", choices=FORMATS, default="base32",
+                               help="input format (default base32)")
+    decode_parser.add_argument("-o", "--output", choices=("csv", "ndjson"), default="csv",
+                               help="output format (default csv)")
+
+    bench_parser = subparsers.add_parser("bench", parents=[config], help="report generation throughput")
+    bench_parser.add_argument("n", type=_count, nargs="?", default=100_000, help="IDs per measurement (default 100000)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    stdout = sys.stdout.buffer
+    try:
+        if args.command == "gen":
+            gen(args, stdout)
+        elif args.command == "decode":
+            decode(args, args.file, stdout)
+        else:
+            bench(args, stdout)
+        stdout.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); keep the flush at interpreter exit from failing too.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (ValueError, OverflowError) as error:
+        parser.exit(1, f"{parser.prog}: error: {error}\n")
+    return 0
 
 
 if __name__ == "__main__":
-    app()
+    sys.exit(main())
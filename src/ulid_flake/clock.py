@@ -0,0 +1,62 @@
+"""
+    ulid_flake/clock
+    ~~~~~~~~~~~
+
+    Timestamp sources for Ulid-Flake.
+
+    A clock is any object with a `now_ms()` method returning integer milliseconds
+    since the Unix epoch. Generators subtract their precomputed epoch offset from it.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_unix_ms(moment):
+    """Convert a timezone-aware datetime to integer milliseconds since the Unix epoch."""
+    return (moment - UNIX_EPOCH) // timedelta(milliseconds=1)
+
+
+class SystemClock:
+    """Wall clock read through `time.time_ns()`."""
+
+    def now_ms(self):
+        return time.time_ns() // 1_000_000
+
+
+class MonotonicClock:
+    """Wall clock anchored once and advanced by `time.monotonic_ns()`.
+
+    Wall-clock steps (e.g. NTP corrections) after the anchor is taken are ignored,
+    so the reading never goes backwards within a process.
+    """
+
+    def __init__(self):
+        self.offset_ns = time.time_ns() - time.monotonic_ns()
+
+    def now_ms(self):
+        return (time.monotonic_ns() + self.offset_ns) // 1_000_000
+
+
+class FakeClock:
+    """Manually driven clock for tests.
+
+    Every reading advances the clock by `tick` milliseconds after it is returned.
+    """
+
+    def __init__(self, now_ms=None, tick=0):
+        self.current_ms = to_unix_ms(datetime.now(timezone.utc)) if now_ms is None else now_ms
+        self.tick = tick
+
+    def now_ms(self):
+        now_ms = self.current_ms
+        self.current_ms += self.tick
+        return now_ms
+
+    def advance(self, ms=1):
+        """Move the clock by `ms` milliseconds (negative values step it backwards)."""
+        self.current_ms += ms
+
+
+DEFAULT_CLOCK = SystemClock()
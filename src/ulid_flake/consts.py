@@ -22,9 +22,15 @@ MIN_ENTROPY_SIZE = int(1)  # Minimum entropy size (1 byte)
 MAX_ENTROPY_SIZE = int(3)  # Maximum entropy size (3 byte)
 MAX_ENTROPY_SIZE_SCALABLE = int(2)  # Maximum entropy size for scalable version (2 byte)
 
+OVERFLOW_POLICIES = ("raise", "spin", "sleep", "borrow")  # Ways to handle exhausted randomness within a millisecond
+DEFAULT_MAX_DRIFT_MS = int(10)  # Maximum milliseconds the "borrow" policy may run ahead of the clock
+CLOCK_REGRESSION_POLICIES = ("clamp", "wait", "raise")  # Ways to handle a clock reading earlier than the previous ID
+RANDOMNESS_SOURCES = ("urandom", "random", "counter")  # Where fresh randomness and increments come from
+
 MIN_SCALABILITY = int(0)  # 5-bit minimum value for scalable version (0)
 MAX_SCALABILITY = (1 << 5) - 1  # 5-bit maximum value for scalable version (31)
 
 ULID_FLAKE_LEN = int(13)  # Length of Ulid-Flake string
+ULID_FLAKE_BYTES = int(8)  # Length of packed (big-endian) Ulid-Flake
 MIN_ULID_FLAKE = "0000000000000"  # Minimum possible Ulid-Flake value (0)
 MAX_ULID_FLAKE = "7ZZZZZZZZZZZZ"  # Maximum possible Ulid-Flake value (9223372036854775807)
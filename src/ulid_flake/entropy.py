@@ -0,0 +1,163 @@
+"""
+    ulid_flake/entropy
+    ~~~~~~~~~~~
+
+    Buffered entropy for Ulid-Flake.
+
+    Instead of one `os.urandom` syscall per ID, a pool reads a large block once and
+    hands out slices of it through a `memoryview`. The shared `DEFAULT_POOL` keeps
+    one buffer per thread, so generators never contend on its lock. Pools are
+    reseeded in child processes after `os.fork()` so that parent and child never
+    share random bytes.
+    `RandomPool` trades unpredictability for speed with per-thread `random.Random`
+    generators seeded from `os.urandom`.
+"""
+import os
+import random
+import threading
+import weakref
+
+DEFAULT_POOL_SIZE = 64 * 1024  # 64 KiB
+
+_pools = weakref.WeakSet()
+
+
+class EntropyPool:
+    """Random bytes served from a buffer refilled by `source` (default `os.urandom`)."""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, source=os.urandom):
+        if size <= 0:
+            raise ValueError("Entropy pool size must be positive.")
+        self.size = size
+        self.source = source
+        self.reseed()
+        _pools.add(self)
+
+    def reseed(self):
+        """Discard the buffered bytes and read a fresh block from the source."""
+        self.lock = threading.Lock()
+        self._refill()
+
+    def _refill(self):
+        self.buffer = self.source(self.size)
+        self.view = memoryview(self.buffer)
+        self.position = 0
+
+    def read(self, n):
+        """Return `n` random bytes as a zero-copy `memoryview` slice of the buffer."""
+        with self.lock:
+            return self._read(n)
+
+    def read_int(self, n):
+        """Return a random non-negative integer made of `n` bytes."""
+        with self.lock:
+            return self._read_int(n)
+
+    def _read(self, n):
+        if n > self.size:
+            return memoryview(self.source(n))
+        position = self.position
+        end = position + n
+        if end > self.size:
+            self._refill()
+            position = 0
+            end = n
+        self.position = end
+        return self.view[position:end]
+
+    def _read_int(self, n):
+        # Slicing a few bytes is cheaper than creating a memoryview for them.
+        position = self.position
+        end = position + n
+        if end > self.size:
+            if n > self.size:
+                return int.from_bytes(self.source(n), byteorder="big")
+            self._refill()
+            position = 0
+            end = n
+        self.position = end
+        return int.from_bytes(self.buffer[position:end], byteorder="big")
+
+
+class ThreadLocalEntropyPool:
+    """Entropy pool giving every thread its own buffer, so reads never contend on a lock."""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, source=os.urandom):
+        if size <= 0:
+            raise ValueError("Entropy pool size must be positive.")
+        self.size = size
+        self.source = source
+        self.reseed()
+        _pools.add(self)
+
+    def reseed(self):
+        """Drop the buffers of all threads; each thread refills on its next read."""
+        self.local = threading.local()
+
+    def _pool(self):
+        try:
+            return self.local.pool
+        except AttributeError:
+            pool = self.local.pool = EntropyPool(self.size, self.source)
+            return pool
+
+    def read(self, n):
+        """Return `n` random bytes as a zero-copy `memoryview` slice of this thread's buffer."""
+        try:
+            pool = self.local.pool
+        except AttributeError:
+            pool = self._pool()
+        return pool._read(n)
+
+    def read_int(self, n):
+        """Return a random non-negative integer made of `n` bytes."""
+        try:
+            pool = self.local.pool
+        except AttributeError:
+            pool = self._pool()
+        return pool._read_int(n)
+
+
+class RandomPool:
+    """Non-cryptographic random bytes from a per-thread `random.Random` seeded from `os.urandom`.
+
+    IDs stay as unique as with `os.urandom`, but later values can be predicted from
+    observed ones, so use it only where IDs need not be unguessable.
+    """
+
+    def __init__(self):
+        self.reseed()
+        _pools.add(self)
+
+    def reseed(self):
+        """Drop the generators of all threads; each thread seeds a new one on its next read."""
+        self.local = threading.local()
+
+    def _random(self):
+        try:
+            return self.local.random
+        except AttributeError:
+            generator = self.local.random = random.Random(os.urandom(32))
+            return generator
+
+    def read(self, n):
+        """Return `n` random bytes."""
+        return self._random().getrandbits(8 * n).to_bytes(n, byteorder="big")
+
+    def read_int(self, n):
+        """Return a random non-negative integer made of `n` bytes."""
+        return self._random().getrandbits(8 * n)
+
+
+def _reseed_after_fork():
+    for pool in list(_pools):
+        pool.reseed()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+
+# Shared by generators without a pool of their own; both allocate per-thread state on first use.
+DEFAULT_POOL = ThreadLocalEntropyPool()
+DEFAULT_RANDOM_POOL = RandomPool()  # For randomness_source="random"
@@ -0,0 +1,642 @@
+"""
+    ulid_flake/generator
+    ~~~~~~~~~~~
+
+    Ulid-Flake generator base shared by the stand-alone and scalable layouts.
+
+    A generator owns its configuration, monotonic state and lock, and draws from the
+    lock-free thread-local `DEFAULT_POOL` unless given a pool, so independent generators
+    (e.g. one per table or tenant) never contend with each other.
+    Generators reset their monotonic state in child processes after `os.fork()`.
+    Optional metrics (`enable_metrics`) count generated IDs, same-millisecond
+    increments and lock contention without slowing down generators that do not use them.
+    `new_str` reuses the Base32 timestamp prefix of the current millisecond.
+"""
+import os
+import threading
+import time
+import weakref
+from array import array
+from datetime import datetime, timezone
+from itertools import islice
+from .consts import (
+    DEFAULT_EPOCH,
+    MIN_ENTROPY_SIZE,
+    OVERFLOW_POLICIES, DEFAULT_MAX_DRIFT_MS,
+    CLOCK_REGRESSION_POLICIES,
+    RANDOMNESS_SOURCES,
+)
+from .base32 import ENCODING_PAIRS, encode
+from .block import IdBlock
+from .clock import DEFAULT_CLOCK, to_unix_ms
+from .entropy import DEFAULT_POOL, DEFAULT_RANDOM_POOL
+from .layout import STANDALONE
+
+_generators = weakref.WeakSet()
+
+BULK_CHUNK = 4096  # Rows per entropy pool read when filling buffers from timestamps
+
+# Counters reported by `Generator.stats()`.
+METRICS = (
+    "ids_generated",  # IDs issued (metrics enabled only)
+    "same_ms_increments",  # IDs made by incrementing the randomness of the previous ID (metrics enabled only)
+    "entropy_retries",  # Zero entropy draws that had to be redrawn
+    "overflows",  # Milliseconds whose randomness ran out
+    "clock_backwards",  # Clock readings earlier than the previous timestamp of the sid (see `clock_regression`)
+    "lock_waits",  # Contended lock acquisitions (metrics enabled only)
+    "lock_wait_seconds",  # Total time spent waiting for the lock (metrics enabled only)
+)
+
+
+class Generator:
+    """Base Ulid-Flake generator.
+
+    The bit layout comes from a `Layout` (`default_layout` unless configured),
+    whose shifts, masks, `randomness_size` (bytes drawn for a fresh randomness
+    value), `max_entropy_size` and `slots` (number of sids with their own monotonic
+    state) are copied onto the generator. Subclasses set `scalable` when their
+    layouts carry a sid, and the type of the IDs they produce with `id_class`.
+    Constructor arguments are the same as for `set_config`.
+    """
+    default_layout = STANDALONE
+    scalable = False
+    sid = 0
+    id_class = None
+    metrics_enabled = False
+    metrics_callback = None
+    # Top 43 bits last encoded by `new_str` and their 9-character Base32 prefix.
+    _prefix_cache = (None, "")
+
+    def __init__(self, *args, **kwargs):
+        self.lock = threading.Lock()
+        self.previous_timestamps = None  # Monotonic state, set up by the first `set_config`
+        self.set_config(*args, **kwargs)
+        _generators.add(self)
+
+    def set_config(self, epoch_time=DEFAULT_EPOCH, entropy_size=MIN_ENTROPY_SIZE,
+                   clock=None, entropy_pool=None, overflow_policy="raise", max_drift_ms=DEFAULT_MAX_DRIFT_MS,
+                   clock_regression="clamp", randomness_source="urandom", layout=None):
+        """Configure the generator.
+
+        `clock_regression` decides what happens when the clock reads earlier than the
+        previous ID (e.g. after an NTP step): "clamp" keeps incrementing at the previous
+        timestamp (moving on to the next one when its randomness runs out), "wait" blocks
+        until the clock catches up and "raise" raises `RuntimeError`.
+
+        `randomness_source` selects where randomness comes from: "urandom" reads
+        `entropy_pool`, "random" a per-thread `random.Random` seeded from `os.urandom`
+        (`RandomPool`), and "counter" starts every millisecond from a counter with a
+        random initial offset and increments by 1 within it.
+
+        `layout` (a `Layout`, default `default_layout`) sets the widths of the
+        timestamp, randomness and sid fields and the timestamp resolution.
+        """
+        if layout is None or layout == self.default_layout:
+            layout = self.default_layout
+        if bool(layout.sid_bits) != self.scalable:
+            raise ValueError("Scalable layouts need sid bits and stand-alone layouts must have none.")
+        if entropy_size <= 0 or entropy_size > layout.max_entropy_size:
+            raise ValueError(f"Entropy size must be between 1 and {layout.max_entropy_size}.")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Overflow policy must be one of {', '.join(OVERFLOW_POLICIES)}.")
+        if max_drift_ms < 0:
+            raise ValueError("Maximum drift must not be negative.")
+        if clock_regression not in CLOCK_REGRESSION_POLICIES:
+            raise ValueError(f"Clock regression policy must be one of {', '.join(CLOCK_REGRESSION_POLICIES)}.")
+        if randomness_source not in RANDOMNESS_SOURCES:
+            raise ValueError(f"Randomness source must be one of {', '.join(RANDOMNESS_SOURCES)}.")
+        if randomness_source == "random" and entropy_pool is not None:
+            raise ValueError('entropy_pool cannot be combined with randomness_source="random".')
+
+        clock = DEFAULT_CLOCK if clock is None else clock
+        # Only a new epoch, clock or layout makes earlier timestamps incomparable and starts a new sequence.
+        reset = (self.previous_timestamps is None or epoch_time != self.epoch_time
+                 or clock is not self.clock or layout != self.layout)
+
+        self.layout = layout
+        self.timestamp_shift = layout.timestamp_shift
+        self.randomness_shift = layout.randomness_shift
+        self.max_timestamp = layout.max_timestamp
+        self.max_randomness = layout.max_randomness
+        self.randomness_size = layout.randomness_size
+        self.max_entropy_size = layout.max_entropy_size
+        self.slots = layout.slots
+        self.resolution_ms = layout.resolution_ms
+        self.epoch_time = epoch_time
+        self.epoch_ms = to_unix_ms(epoch_time)
+        self.entropy_size = entropy_size
+        self.clock = clock
+        if randomness_source == "random":
+            entropy_pool = DEFAULT_RANDOM_POOL
+        self.entropy_pool = DEFAULT_POOL if entropy_pool is None else entropy_pool
+        self.overflow_policy = overflow_policy
+        self.max_drift_ms = max_drift_ms
+        self.max_drift = max_drift_ms // layout.resolution_ms  # in timestamp ticks
+        self.clock_regression = clock_regression
+        self.randomness_source = randomness_source
+        if randomness_source == "counter":
+            # Instance attributes shadow the entropy draws, as `enable_metrics` does for generation.
+            self.generate_randomness = self._counter_randomness
+            self.generate_entropy = self._counter_entropy
+        else:
+            vars(self).pop("generate_randomness", None)
+            vars(self).pop("generate_entropy", None)
+        self.overflow_counts = dict.fromkeys(OVERFLOW_POLICIES + ("drift_wait",), 0)
+        self.metrics = dict.fromkeys(METRICS, 0)
+        if reset:
+            self._reset_state()
+
+    def reset_config(self):
+        """Restore the default configuration and start a new sequence."""
+        self.set_config()
+        self._reset_state()
+
+    def _after_fork(self):
+        """Reset the lock and monotonic state inherited by a child process."""
+        self.lock = self._new_lock()
+        self._reset_state()
+
+    def _new_lock(self):
+        return _TimedLock(self, threading.Lock()) if self.metrics_enabled else threading.Lock()
+
+    def _reset_state(self):
+        # Last timestamp and randomness issued, per sid.
+        self.previous_timestamps = [None] * self.slots
+        self.previous_randomnesses = [None] * self.slots
+        # Last clock reading, per sid, while a block claimed by `reserve` runs ahead of the clock.
+        self.clock_readings = [None] * self.slots
+        # Counter of the "counter" randomness source, starting at a random offset.
+        self.counter = int.from_bytes(os.urandom(4), byteorder="big")
+
+    @property
+    def previous_timestamp(self):
+        """Last timestamp issued for the configured sid."""
+        return self.previous_timestamps[self.sid or 0]
+
+    @property
+    def previous_randomness(self):
+        """Last randomness issued for the configured sid."""
+        return self.previous_randomnesses[self.sid or 0]
+
+    def generate_timestamp(self):
+        """Generate a timestamp (ticks of `resolution_ms`, by default milliseconds, since the Ulid-Flake epoch)."""
+        timestamp = (self.clock.now_ms() - self.epoch_ms) // self.resolution_ms
+        if timestamp > self.max_timestamp:
+            raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
+        return timestamp
+
+    def overflow_stats(self):
+        """Return how often each overflow policy path was taken since the last configuration.
+
+        `drift_wait` counts the times "borrow" had to wait because it ran `max_drift_ms` ahead of the clock.
+        """
+        return dict(self.overflow_counts)
+
+    def stats(self):
+        """Return a snapshot of the generator's metrics (see `METRICS`) since the last configuration.
+
+        Entropy retries, overflows and clock regressions are always counted; generated
+        IDs, increments and lock waits only while metrics are enabled.
+        """
+        return dict(self.metrics)
+
+    def enable_metrics(self, callback=None):
+        """Start counting generated IDs, increments and lock waits.
+
+        `callback(name, amount)` is called with every counter update, e.g. to feed
+        Prometheus counters. Generators without metrics keep their uninstrumented code.
+        """
+        self.metrics_callback = callback
+        if self.metrics_enabled:
+            return
+        self.metrics_enabled = True
+        # Instance attributes shadow the plain methods, so only this generator pays for counting.
+        self._advance = self._counted_advance
+        self._fill_millisecond = self._counted_fill_millisecond
+        if isinstance(self.lock, type(threading.Lock())):
+            self.lock = _TimedLock(self, self.lock)
+
+    def disable_metrics(self):
+        """Stop counting and restore the uninstrumented generation path."""
+        if not self.metrics_enabled:
+            return
+        self.metrics_enabled = False
+        self.metrics_callback = None
+        del self._advance, self._fill_millisecond
+        if isinstance(self.lock, _TimedLock):
+            self.lock = self.lock.lock
+
+    def _record(self, name, amount=1):
+        """Add `amount` to a metric; the caller must hold the lock."""
+        self.metrics[name] += amount
+        if self.metrics_callback is not None:
+            self.metrics_callback(name, amount)
+
+    def _counted_advance(self, sid, timestamp):
+        same_ms = timestamp == self.previous_timestamps[sid]
+        combined = type(self)._advance(self, sid, timestamp)
+        if combined is not None:
+            self._record("ids_generated")
+            if same_ms:
+                self._record("same_ms_increments")
+        return combined
+
+    def _counted_fill_millisecond(self, n, sid, timestamp):
+        previous_timestamp = self.previous_timestamps[sid]
+        values = type(self)._fill_millisecond(self, n, sid, timestamp)
+        if values:
+            self._record("ids_generated", len(values))
+            fresh = 0 if self.previous_timestamps[sid] == previous_timestamp else 1
+            if len(values) > fresh:
+                self._record("same_ms_increments", len(values) - fresh)
+        return values
+
+    def generate_randomness(self):
+        """Generate a fresh randomness value."""
+        return self.entropy_pool.read_int(self.randomness_size) & self.max_randomness
+
+    def generate_entropy(self, size=MIN_ENTROPY_SIZE):
+        """Generate an entropy value to increment randomness."""
+        if size <= 0 or size > self.max_entropy_size:  # Ensure entropy size is within a reasonable range
+            raise ValueError(f"Entropy size must be between 1 and {self.max_entropy_size}.")
+        return self.entropy_pool.read_int(size)
+
+    def _counter_randomness(self):
+        # Fresh values stay in the lower half of the range, leaving the upper half for the millisecond's increments.
+        self.counter += 1
+        return self.counter & (self.max_randomness >> 1)
+
+    def _counter_entropy(self, size=MIN_ENTROPY_SIZE):
+        if size <= 0 or size > self.max_entropy_size:
+            raise ValueError(f"Entropy size must be between 1 and {self.max_entropy_size}.")
+        return 1
+
+    def new_int(self):
+        """Generate the next monotonic Ulid-Flake as an integer."""
+        return self._new_int(None)
+
+    def _new_int(self, sid):
+        """Generate the next value for `sid` (`None` for the configured sid)."""
+        with self.lock:
+            if sid is None:
+                sid = self.sid
+            timestamp = self._current_timestamp(sid)
+            combined = self._advance(sid, timestamp)
+            if combined is None:
+                combined = self._advance(sid, self._overflow_timestamp(timestamp))
+            return combined
+
+    def _advance(self, sid, timestamp):
+        """Issue the next value for `sid` at `timestamp`, or return `None` if its randomness is exhausted.
+
+        The caller must hold the lock.
+        """
+        if timestamp == self.previous_timestamps[sid]:
+            entropy = self.generate_entropy(self.entropy_size)
+            while entropy <= 0:
+                self._record("entropy_retries")
+                entropy = self.generate_entropy(self.entropy_size)
+            randomness = (self.previous_randomnesses[sid] + entropy)
+            if randomness > self.max_randomness:
+                return None
+        else:
+            randomness = self.generate_randomness()
+
+        self.previous_timestamps[sid] = timestamp
+        self.previous_randomnesses[sid] = randomness
+
+        # Combine the timestamp, randomness and sid. Timestamps never exceed 43 bits
+        # (`generate_timestamp` and the overflow policies check), so the sign bit stays 0.
+        return (timestamp << self.timestamp_shift) | (randomness << self.randomness_shift) | sid
+
+    def new_str(self):
+        """Generate the next monotonic Ulid-Flake as a 13-character Base32 string."""
+        return self._new_str(None)
+
+    def _new_str(self, sid, pairs=ENCODING_PAIRS):
+        """Generate the next value for `sid` as a string, reusing the prefix of the millisecond.
+
+        The upper 9 characters encode the top 43 bits and the lower 4 the low 20 bits. In
+        the default layouts those are the timestamp and the randomness (and sid), so IDs
+        of the same millisecond only encode their suffix.
+        """
+        value = self._new_int(sid)
+        high = value >> 20
+        cached_high, prefix = self._prefix_cache
+        if high != cached_high:
+            prefix = encode(high, 9)
+            # A single tuple assignment keeps the bits and prefix consistent across threads.
+            self._prefix_cache = (high, prefix)
+        return prefix + pairs[(value >> 10) & 1023] + pairs[value & 1023]
+
+    def new(self):
+        """Generate the next monotonic Ulid-Flake instance."""
+        return self.id_class(self.new_int())
+
+    def new_batch(self, n, as_int=False):
+        """Generate a list of `n` monotonic Ulid-Flakes, as instances or (with `as_int`) plain integers."""
+        return list(self.iter_new(n, as_int=as_int))
+
+    def iter_new(self, n, as_int=False):
+        """Yield `n` monotonic Ulid-Flakes, taking the lock once per millisecond.
+
+        When the randomness of the current millisecond is exhausted the batch rolls over
+        to the next millisecond instead of raising `OverflowError`.
+        """
+        return self._iter_new(n, as_int, None)
+
+    def _iter_new(self, n, as_int, sid):
+        if n < 0:
+            raise ValueError("Batch size must not be negative.")
+        id_class = self.id_class
+        while n > 0:
+            with self.lock:
+                if sid is None:
+                    sid = self.sid
+                values = self._fill_millisecond(n, sid, self._current_timestamp(sid))
+                if not values:
+                    self._record("overflows")
+            if not values:
+                self._wait_until(self.previous_timestamps[sid] + 1, sleep=self.overflow_policy == "sleep")
+                continue
+            n -= len(values)
+            if as_int:
+                yield from values
+            else:
+                for value in values:
+                    yield id_class(value)
+
+    def _fill_millisecond(self, n, sid, timestamp):
+        """Generate up to `n` values for `sid` at the current `timestamp`; the caller must hold the lock."""
+        size = self.entropy_size
+        max_randomness = self.max_randomness
+        shift = self.randomness_shift
+        prefix = (timestamp << self.timestamp_shift) | sid
+        if timestamp == self.previous_timestamps[sid]:
+            randomness = self.previous_randomnesses[sid]
+            values = []
+        else:
+            randomness = self.generate_randomness()
+            values = [prefix | (randomness << shift)]
+        if self.randomness_source == "counter":
+            count = min(n - len(values), max_randomness - randomness)
+            values += [prefix | (value << shift) for value in range(randomness + 1, randomness + count + 1)]
+            randomness += count
+            count = 0
+        else:
+            # Expected increment is half the entropy range; over-read twice that in one pool read.
+            room = max_randomness - randomness
+            count = min(n - len(values), room // (1 << (8 * size - 2)) + 1)
+        while len(values) < n and count > 0:
+            buffer = self.entropy_pool.read(count * size)
+            for i in range(0, len(buffer), size):
+                entropy = int.from_bytes(buffer[i:i + size], byteorder="big")
+                if entropy <= 0:
+                    self._record("entropy_retries")
+                    continue
+                if randomness + entropy > max_randomness:
+                    count = 0
+                    break
+                randomness += entropy
+                values.append(prefix | (randomness << shift))
+                if len(values) == n:
+                    break
+            else:
+                count = min(n - len(values), count)
+
+        if values:
+            self.previous_timestamps[sid] = timestamp
+            self.previous_randomnesses[sid] = randomness
+        return values
+
+    def reserve(self, n):
+        """Claim `n` consecutive monotonic values under one lock acquisition and return them as an `IdBlock`.
+
+        The block continues the current millisecond and rolls over into the following
+        ones (ahead of the clock) when it needs more values than the randomness has
+        room for. The generator continues after the block, so later IDs never collide
+        with it; in a millisecond filled by a block they overflow as usual.
+        """
+        return self._reserve(n, None)
+
+    def _reserve(self, n, sid):
+        if n < 0:
+            raise ValueError("Block size must not be negative.")
+        randomness_range = self.max_randomness + 1
+        with self.lock:
+            if sid is None:
+                sid = self.sid
+            timestamp = self._current_timestamp(sid)
+            # Blocks count values as timestamp * randomness range + randomness, see `IdBlock`.
+            if timestamp == self.previous_timestamps[sid]:
+                start = timestamp * randomness_range + self.previous_randomnesses[sid] + 1
+            else:
+                start = timestamp * randomness_range + (self.generate_randomness() & (self.max_randomness >> 1))
+            if n:
+                last_timestamp, last_randomness = divmod(start + n - 1, randomness_range)
+                if last_timestamp > self.max_timestamp:
+                    raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
+                self.previous_timestamps[sid] = last_timestamp
+                self.previous_randomnesses[sid] = last_randomness
+                if self.clock_readings[sid] is None:
+                    reading = self.generate_timestamp()
+                    self.clock_readings[sid] = reading if last_timestamp > reading else None
+                if self.metrics_enabled:
+                    self._record("ids_generated", n)
+        return IdBlock(start, n, sid, self.layout)
+
+    def _current_timestamp(self, sid, wait=True):
+        """Read the clock, never returning a timestamp earlier than the last one of `sid`.
+
+        Without `wait` the "wait" clock regression policy returns `None` instead of
+        blocking, and the caller waits for the previous timestamp itself.
+        """
+        timestamp = self.generate_timestamp()
+        previous_timestamp = self.previous_timestamps[sid]
+        reading = self.clock_readings[sid]
+        if reading is not None:
+            if timestamp >= previous_timestamp:
+                self.clock_readings[sid] = None  # the clock caught up with a reserved block
+            elif timestamp >= reading:
+                self.clock_readings[sid] = timestamp
+                return previous_timestamp  # a reserved block runs ahead of the clock
+            else:
+                # The clock itself went back: police it against its last reading, not the block.
+                if self._clock_regressed(timestamp, reading, wait) is None:
+                    return None
+                return previous_timestamp
+        if previous_timestamp is None or timestamp > previous_timestamp:
+            return timestamp
+        if timestamp == previous_timestamp:
+            return timestamp
+        if self.overflow_policy == "borrow" and previous_timestamp - timestamp <= self.max_drift:
+            return previous_timestamp  # "borrow" ran ahead of the clock; the clock did not go back
+        return self._clock_regressed(timestamp, previous_timestamp, wait)
+
+    def _clock_regressed(self, timestamp, previous_timestamp, wait=True):
+        """Apply the clock regression policy to a reading earlier than `previous_timestamp`."""
+        self._record("clock_backwards")
+        policy = self.clock_regression
+        if policy == "raise":
+            raise RuntimeError(f"Clock moved backwards by {(previous_timestamp - timestamp) * self.resolution_ms} ms.")
+        if policy == "wait":
+            return self._wait_until(previous_timestamp, sleep=True) if wait else None
+        return previous_timestamp
+
+    def _overflow_timestamp(self, timestamp):
+        """Apply the overflow policy to a millisecond with exhausted randomness; return the timestamp to use."""
+        policy = self.overflow_policy
+        self.overflow_counts[policy] += 1
+        self._record("overflows")
+        if policy == "raise":
+            raise OverflowError("Randomness exceeds maximum ULID value.")
+        now = self.generate_timestamp()
+        # A timestamp clamped ahead of the clock after a regression borrows the next one under
+        # every policy: waiting for the clock to pass it would hold the lock for the whole regression.
+        if policy == "borrow" or timestamp > now:
+            timestamp += 1
+            if timestamp > self.max_timestamp:
+                raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
+            if policy == "borrow" and timestamp - now > self.max_drift:
+                self.overflow_counts["drift_wait"] += 1
+                self._wait_until(timestamp - self.max_drift, sleep=True)
+            return timestamp
+        return self._wait_until(timestamp + 1, sleep=policy == "sleep")
+
+    def _wait_until(self, target, sleep=False):
+        """Block until the generator clock reaches `target`, spinning or sleeping; return the clock timestamp."""
+        timestamp = self.generate_timestamp()
+        while timestamp < target:
+            time.sleep((target - timestamp) * self.resolution_ms / 1000 if sleep else 0)
+            timestamp = self.generate_timestamp()
+        return timestamp
+
+    def from_unix_epoch_time(self, unix_time):
+        """Create a Ulid-Flake instance from a Unix epoch time."""
+        if not isinstance(unix_time, (int, float)):
+            raise ValueError("unix_time must be an integer or float representing seconds since Unix epoch.")
+
+        if unix_time < self.epoch_time.timestamp():
+            raise ValueError("Unix timestamp is before the custom epoch time.")
+
+        elapsed_ms = int((datetime.fromtimestamp(unix_time, tz=timezone.utc) - self.epoch_time).total_seconds() * 1000)
+        timestamp = elapsed_ms // self.resolution_ms
+        if timestamp > self.max_timestamp:
+            raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
+
+        randomness = self.generate_randomness()
+        with self.lock:
+            sid = self.sid
+        combined = (timestamp << self.timestamp_shift) | (randomness << self.randomness_shift) | sid
+        return self.id_class(combined)
+
+    def fill_from_unix_epoch_times(self, unix_times, out, unit="s"):
+        """Write a Ulid-Flake for each of `unix_times` into the int64 buffer `out`; return the number written.
+
+        `unix_times` is an iterable of seconds (`unit="s"`) or milliseconds (`unit="ms"`)
+        since the Unix epoch. `out` is any writable buffer of native int64 values, e.g.
+        `array("q")`, a `bytearray` or a NumPy array. IDs of equal timestamps increase in
+        input order, also when a timestamp reappears after others; the generator's own
+        monotonic state is left untouched. Raises `OverflowError` when a millisecond
+        holds more IDs than its randomness allows.
+        """
+        return self._fill_from_unix_epoch_times(unix_times, out, unit, None)
+
+    def _fill_from_unix_epoch_times(self, unix_times, out, unit, sid):
+        if unit not in ("s", "ms"):
+            raise ValueError('unit must be "s" or "ms".')
+        view = memoryview(out).cast("B")
+        if view.readonly or view.nbytes % 8:
+            raise ValueError("out must be a writable buffer of 8-byte integers.")
+        view = view.cast("q")
+        capacity = len(view)
+
+        if sid is None:
+            with self.lock:
+                sid = self.sid
+        epoch_ms = self.epoch_ms
+        resolution_ms = self.resolution_ms
+        max_timestamp = self.max_timestamp
+        timestamp_shift = self.timestamp_shift
+        randomness_shift = self.randomness_shift
+        max_randomness = self.max_randomness
+        # Fresh values start in the lower half of the randomness range, leaving the upper
+        # half for increments, so dense backfills do not overflow on a high first draw.
+        fresh_randomness = max_randomness >> 1
+        entropy_range = (1 << (8 * self.entropy_size)) - 1
+        in_ms = unit == "ms"
+
+        unix_times = iter(unix_times)
+        # Last randomness of every timestamp left behind, so a timestamp that shows up again continues its sequence.
+        last_randomness = {}
+        previous_timestamp = None
+        randomness = 0
+        written = 0
+        while True:
+            # One pool read per chunk; each row uses one 32-bit word for fresh randomness or an increment.
+            words = array("I")
+            words.frombytes(self.entropy_pool.read(BULK_CHUNK * words.itemsize))
+            start = written
+            for unix_time, word in zip(islice(unix_times, BULK_CHUNK), words):
+                # Seconds are rounded to microseconds first, as `from_unix_epoch_time` does through `datetime`.
+                timestamp = ((unix_time if in_ms else round(unix_time * 1_000_000) // 1000) - epoch_ms) // resolution_ms
+                if timestamp < 0:
+                    raise ValueError("Unix timestamp is before the custom epoch time.")
+                if timestamp > max_timestamp:
+                    raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
+                if timestamp == previous_timestamp:
+                    randomness += 1 + word % entropy_range
+                else:
+                    last_randomness[previous_timestamp] = randomness
+                    previous_timestamp = timestamp
+                    randomness = last_randomness.get(timestamp)
+                    if randomness is None:
+                        randomness = word & fresh_randomness
+                    else:
+                        randomness += 1 + word % entropy_range
+                if randomness > max_randomness:
+                    raise OverflowError("Randomness exceeds maximum ULID value.")
+                if written == capacity:
+                    raise ValueError("out is too small for unix_times.")
+                view[written] = (timestamp << timestamp_shift) | (randomness << randomness_shift) | sid
+                written += 1
+            if written - start < BULK_CHUNK:
+                return written
+
+
+class _TimedLock:
+    """Lock wrapper recording contended acquisitions and their wait time in the generator's metrics."""
+    __slots__ = ("generator", "lock")
+
+    def __init__(self, generator, lock):
+        self.generator = generator
+        self.lock = lock
+
+    def acquire(self, blocking=True):
+        if self.lock.acquire(False):
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        self.lock.acquire()
+        self.generator._record("lock_waits")
+        self.generator._record("lock_wait_seconds", time.perf_counter() - start)
+        return True
+
+    def release(self):
+        self.lock.release()
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+
+
+def _reset_after_fork():
+    for generator in list(_generators):
+        generator._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
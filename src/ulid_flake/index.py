@@ -0,0 +1,111 @@
+"""
+    ulid_flake/index
+    ~~~~~~~~~~~
+
+    Time-range lookups over sorted Ulid-Flakes.
+
+    The top bits of a Ulid-Flake are its timestamp, so sorted IDs are sorted by
+    time and every millisecond maps to one contiguous ID range. `SortedIdIndex`
+    answers time-range queries over a memory-mapped file of packed sorted IDs with
+    two binary searches, unpacking only the IDs it returns.
+"""
+from bisect import bisect_left
+from datetime import datetime
+
+from . import binary
+from .clock import to_unix_ms
+from .consts import DEFAULT_EPOCH, MIN_TIMESTAMP
+from .layout import STANDALONE
+
+
+def _ticks(moment, epoch_time, layout):
+    if isinstance(moment, datetime):
+        return (to_unix_ms(moment) - to_unix_ms(epoch_time)) // layout.resolution_ms
+    return moment
+
+
+def _to_timestamp(moment, epoch_time, layout):
+    moment = _ticks(moment, epoch_time, layout)
+    if moment < MIN_TIMESTAMP or moment > layout.max_timestamp:
+        raise OverflowError("Timestamp exceeds the allowable Ulid-Flake range.")
+    return moment
+
+
+def min_id_for_time(moment, epoch_time=DEFAULT_EPOCH, layout=STANDALONE):
+    """Return the smallest Ulid-Flake value of a millisecond.
+
+    `moment` is a timezone-aware `datetime` or a Ulid-Flake timestamp (milliseconds,
+    or ticks of the layout resolution, since `epoch_time`). Only the timestamp field
+    of `layout` matters, so the default bounds hold for both the stand-alone and the
+    scalable layout, whose 20 low bits are randomness or randomness and sid.
+    """
+    return _to_timestamp(moment, epoch_time, layout) << layout.timestamp_shift
+
+
+def max_id_for_time(moment, epoch_time=DEFAULT_EPOCH, layout=STANDALONE):
+    """Return the largest Ulid-Flake value of a millisecond."""
+    shift = layout.timestamp_shift
+    return (_to_timestamp(moment, epoch_time, layout) << shift) | ((1 << shift) - 1)
+
+
+class SortedIdIndex:
+    """Time-range index over a file of packed (8-byte big-endian) Ulid-Flakes in ascending order.
+
+    The file is memory-mapped through `PackedReader`, so opening it is instant and
+    queries touch only the pages they search and return. Datetimes are converted
+    with `epoch_time` and `layout`, which must match the generator that produced the IDs.
+    """
+
+    def __init__(self, path, epoch_time=DEFAULT_EPOCH, layout=STANDALONE):
+        self.reader = binary.PackedReader(path)
+        self.epoch_time = epoch_time
+        self.layout = layout
+
+    @classmethod
+    def build(cls, path, values, epoch_time=DEFAULT_EPOCH, layout=STANDALONE):
+        """Write `values` sorted and packed to `path` and return an index over the file."""
+        with open(path, "wb") as file:
+            file.write(binary.pack_many(sorted(values)))
+        return cls(path, epoch_time, layout)
+
+    def __len__(self):
+        return len(self.reader)
+
+    def slice_by_time(self, start, end=None):
+        """Return the `slice` of positions holding the IDs with `start <= timestamp < end`.
+
+        Bounds outside the timestamp range of the layout are clamped to it.
+        """
+        reader = self.reader
+        layout = self.layout
+        start = _ticks(start, self.epoch_time, layout)
+        if start > layout.max_timestamp:
+            return slice(len(reader), len(reader))
+        lower = bisect_left(reader, min_id_for_time(max(start, MIN_TIMESTAMP), self.epoch_time, layout))
+        if end is None:
+            return slice(lower, len(reader))
+        end = _ticks(end, self.epoch_time, layout)
+        if end > layout.max_timestamp:
+            return slice(lower, len(reader))
+        if end <= MIN_TIMESTAMP:
+            return slice(lower, lower)
+        upper = bisect_left(reader, max_id_for_time(end - 1, self.epoch_time, layout) + 1, lower)
+        return slice(lower, upper)
+
+    def range_by_time(self, start, end=None):
+        """Return the IDs with `start <= timestamp < end` (or all from `start`) as an `array("q")`."""
+        return self.reader[self.slice_by_time(start, end)]
+
+    def count_by_time(self, start, end=None):
+        """Return the number of IDs with `start <= timestamp < end` without unpacking them."""
+        positions = self.slice_by_time(start, end)
+        return positions.stop - positions.start
+
+    def close(self):
+        self.reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,111 @@
+"""
+    ulid_flake/layout
+    ~~~~~~~~~~~
+
+    Bit layouts of Ulid-Flake.
+
+    A `Layout` splits the 63 value bits of a Ulid-Flake into timestamp, randomness
+    and sid fields (most significant first) and precomputes their shifts and masks.
+    Generators, instances and the bulk helpers read these attributes instead of
+    hard-coding the 43/20 and 43/15/5 splits, so every layout shares one code path.
+"""
+VALUE_BITS = 63  # The sign bit of the 64-bit value stays 0
+
+# Subclasses of the ID classes for generators configured with another layout, by (class, layout).
+_layout_classes = {}
+
+
+class Layout:
+    """Field widths of a Ulid-Flake, which must add up to 63 bits.
+
+    `resolution_ms` is the length of one timestamp tick in milliseconds; coarser
+    ticks stretch the lifetime of a shorter timestamp field. Entropy increments are
+    at most `max_entropy_size` bytes, the size of a fresh randomness draw.
+    """
+    __slots__ = (
+        "timestamp_bits", "randomness_bits", "sid_bits", "resolution_ms",
+        "timestamp_shift", "randomness_shift",
+        "max_timestamp", "max_randomness", "max_sid", "slots",
+        "randomness_size", "max_entropy_size",
+    )
+
+    def __init__(self, timestamp_bits=43, randomness_bits=20, sid_bits=0, resolution_ms=1):
+        if timestamp_bits <= 0 or randomness_bits <= 0 or sid_bits < 0:
+            raise ValueError("Layout needs timestamp and randomness bits, and no negative field.")
+        if timestamp_bits + randomness_bits + sid_bits != VALUE_BITS:
+            raise ValueError(f"Layout fields must add up to {VALUE_BITS} bits.")
+        if not isinstance(resolution_ms, int) or resolution_ms <= 0:
+            raise ValueError("Timestamp resolution must be a positive number of milliseconds.")
+
+        self.timestamp_bits = timestamp_bits
+        self.randomness_bits = randomness_bits
+        self.sid_bits = sid_bits
+        self.resolution_ms = resolution_ms
+        self.timestamp_shift = randomness_bits + sid_bits
+        self.randomness_shift = sid_bits
+        self.max_timestamp = (1 << timestamp_bits) - 1
+        self.max_randomness = (1 << randomness_bits) - 1
+        self.max_sid = (1 << sid_bits) - 1
+        self.slots = 1 << sid_bits
+        self.randomness_size = (randomness_bits + 7) // 8
+        self.max_entropy_size = self.randomness_size
+
+    def _fields(self):
+        return self.timestamp_bits, self.randomness_bits, self.sid_bits, self.resolution_ms
+
+    def __eq__(self, other):
+        if not isinstance(other, Layout):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return ("Layout(timestamp_bits={}, randomness_bits={}, sid_bits={}, resolution_ms={})"
+                .format(*self._fields()))
+
+    def combine(self, timestamp, randomness, sid=0):
+        """Pack the fields into a Ulid-Flake value."""
+        return (timestamp << self.timestamp_shift) | (randomness << self.randomness_shift) | sid
+
+    def timestamp(self, value):
+        """Return the timestamp (ticks since the epoch) of a Ulid-Flake value."""
+        return (value >> self.timestamp_shift) & self.max_timestamp
+
+    def randomness(self, value):
+        """Return the randomness of a Ulid-Flake value."""
+        return (value >> self.randomness_shift) & self.max_randomness
+
+    def sid(self, value):
+        """Return the sid of a Ulid-Flake value."""
+        return value & self.max_sid
+
+
+STANDALONE = Layout(timestamp_bits=43, randomness_bits=20)
+SCALABLE = Layout(timestamp_bits=43, randomness_bits=15, sid_bits=5)
+
+
+def layout_class(id_class, layout):
+    """Return `id_class`, or a subclass whose instances decode their fields with `layout` if it differs."""
+    if layout is id_class.layout or layout == id_class.layout:
+        return id_class
+    try:
+        return _layout_classes[id_class, layout]
+    except KeyError:
+        pass
+    # Named after the layout so reprs tell the IDs apart; pickled through `_layout_instance`
+    # since the class itself cannot be looked up by name.
+    name = f"{id_class.__name__}[{layout!r}]"
+    subclass = type(name, (id_class,), {
+        "__slots__": (),
+        "__module__": id_class.__module__,
+        "__qualname__": name,
+        "__reduce__": lambda self: (_layout_instance, (id_class, layout, self.value)),
+        "layout": layout,
+    })
+    return _layout_classes.setdefault((id_class, layout), subclass)
+
+
+def _layout_instance(id_class, layout, value):
+    return layout_class(id_class, layout)(value)
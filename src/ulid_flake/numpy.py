@@ -0,0 +1,136 @@
+"""
+    ulid_flake/numpy
+    ~~~~~~~~~~~
+
+    Vectorized Ulid-Flake field extraction and Base32 coding for NumPy arrays.
+
+    Works on `int64` columns of Ulid-Flake values without building one instance
+    per row. Fields are split by a `Layout` (default the stand-alone or scalable one).
+    Requires the optional `numpy` dependency (`pip install ulid-flake[numpy]`).
+"""
+import numpy as np
+
+from .base32 import ENCODING
+from .clock import to_unix_ms
+from .consts import DEFAULT_EPOCH, ULID_FLAKE_LEN
+from .layout import SCALABLE, STANDALONE
+
+# Bit offset and place value of every Base32 character, most significant first (60, 55, ..., 0).
+_SHIFTS = np.arange(5 * (ULID_FLAKE_LEN - 1), -1, -5, dtype=np.int64)
+_WEIGHTS = np.left_shift(1, _SHIFTS)
+
+_ENCODING = np.frombuffer(ENCODING.encode("ascii"), dtype=np.uint8)
+
+# Maps each byte of a Crockford Base32 string to its digit value; -1 marks bytes outside the alphabet.
+_DECODING = np.full(256, -1, dtype=np.int8)
+_DECODING[_ENCODING] = np.arange(32)
+_DECODING[np.frombuffer(ENCODING.lower().encode("ascii"), dtype=np.uint8)] = np.arange(32)
+
+
+def _as_int64(arr):
+    arr = np.asarray(arr, dtype=np.int64)
+    if (arr < 0).any():
+        raise OverflowError("Array contains values outside the allowable Ulid-Flake range.")
+    return arr
+
+
+def timestamps(arr, layout=STANDALONE):
+    """Return the timestamps (milliseconds, or layout ticks, since the Ulid-Flake epoch) of an array of Ulid-Flakes."""
+    return _as_int64(arr) >> layout.timestamp_shift
+
+
+def randomness(arr, layout=STANDALONE):
+    """Return the randomness of an array of Ulid-Flakes (20-bit, or 15-bit with `layout=SCALABLE`)."""
+    return (_as_int64(arr) >> layout.randomness_shift) & layout.max_randomness
+
+
+def sids(arr, layout=SCALABLE):
+    """Return the sids (5-bit by default) of an array of Ulid-Flake Scalable values."""
+    return _as_int64(arr) & layout.max_sid
+
+
+def to_datetime64(arr, epoch=DEFAULT_EPOCH, layout=STANDALONE):
+    """Return the timestamps of an array of Ulid-Flakes as `datetime64[ms]` (UTC), given the generator epoch."""
+    return (timestamps(arr, layout) * layout.resolution_ms + to_unix_ms(epoch)).astype("datetime64[ms]")
+
+
+def encode_base32(arr):
+    """Encode an array of Ulid-Flakes to a fixed-width `S13` array of Base32 strings."""
+    arr = _as_int64(arr)
+    digits = (arr[..., np.newaxis] >> _SHIFTS) & 31
+    chars = np.ascontiguousarray(_ENCODING[digits])
+    return chars.view(f"S{ULID_FLAKE_LEN}").reshape(arr.shape)
+
+
+def decode_base32(arr):
+    """Decode an array of 13-character Base32 strings (`S13` or `U13`) to an `int64` array."""
+    arr = np.asarray(arr)
+    if (np.char.str_len(arr) != ULID_FLAKE_LEN).any():
+        raise ValueError(f"Ulid-Flake strings must be {ULID_FLAKE_LEN} characters long.")
+    arr = np.ascontiguousarray(arr.astype(f"S{ULID_FLAKE_LEN}"))
+    digits = _DECODING[arr.view(np.uint8).reshape(arr.shape + (ULID_FLAKE_LEN,))]
+    if (digits < 0).any():
+        raise ValueError("Ulid-Flake strings contain invalid Base32 characters.")
+    if (digits[..., 0] > 7).any():
+        raise OverflowError("Parsed value exceeds the allowable Ulid-Flake range.")
+    # The digits occupy disjoint bits, so the dot product with the place values is an exact bitwise or.
+    return digits.astype(np.int64) @ _WEIGHTS
+
+
+def fill_from_unix_epoch_times(generator, unix_times, out=None, unit="s", sid=None):
+    """Vectorized `Generator.fill_from_unix_epoch_times` for an array of timestamps; return the `int64` IDs.
+
+    The IDs are written to `out` (any writable int64 buffer) when given. IDs of equal
+    timestamps increase in input order, as with the generator method.
+    """
+    if unit not in ("s", "ms"):
+        raise ValueError('unit must be "s" or "ms".')
+    unix_times = np.asarray(unix_times)
+    if unit == "ms":
+        unix_ms = unix_times.astype(np.int64)
+    elif unix_times.dtype.kind == "f":
+        # Round to microseconds first, as `from_unix_epoch_time` does through `datetime`.
+        unix_ms = np.round(unix_times * 1_000_000).astype(np.int64) // 1000
+    else:
+        unix_ms = unix_times.astype(np.int64) * 1000
+    timestamps = (unix_ms.reshape(-1) - generator.epoch_ms) // generator.resolution_ms
+    if (timestamps < 0).any():
+        raise ValueError("Unix timestamp is before the custom epoch time.")
+    if (timestamps > generator.max_timestamp).any():
+        raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
+    if sid is None:
+        with generator.lock:
+            sid = generator.sid
+    elif not 0 <= sid < generator.slots:
+        raise ValueError(f"sid must be between 0 and {generator.slots - 1}")
+
+    n = len(timestamps)
+    words = np.frombuffer(generator.entropy_pool.read(4 * n), dtype=np.uint32).astype(np.int64)
+    # Group equal timestamps that reappear after others with a stable sort, which keeps
+    # their input order; already sorted input skips it.
+    order = None
+    grouped = timestamps
+    if (timestamps[1:] < timestamps[:-1]).any():
+        order = np.argsort(timestamps, kind="stable")
+        grouped = timestamps[order]
+    # Every row starting a new millisecond draws fresh randomness from the lower half of the
+    # range, as the generator method does; the others add an entropy increment.
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = grouped[1:] != grouped[:-1]
+    increments = 1 + words % ((1 << (8 * generator.entropy_size)) - 1)
+    steps = np.where(starts, words & (generator.max_randomness >> 1), increments)
+    totals = np.cumsum(steps)
+    first = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+    randomness = totals - totals[first] + steps[first]
+    if (randomness > generator.max_randomness).any():
+        raise OverflowError("Randomness exceeds maximum ULID value.")
+    if order is not None:
+        randomness[order] = randomness.copy()
+
+    values = (timestamps << generator.timestamp_shift) | (randomness << generator.randomness_shift) | sid
+    if out is not None:
+        target = np.frombuffer(out, dtype=np.int64)
+        if len(target) < n:
+            raise ValueError("out is too small for unix_times.")
+        target[:n] = values
+    return values
@@ -6,26 +6,157 @@
 """
 import os
 import threading
-from datetime import datetime, timezone
+import weakref
+from functools import total_ordering
 from .consts import (
     DEFAULT_EPOCH,
     MIN_INT, MAX_INT,
-    MAX_TIMESTAMP,
-    MAX_RANDOMNESS_SCALABLE,
-    MIN_ENTROPY_SIZE, MAX_ENTROPY_SIZE_SCALABLE,
-    MAX_SCALABILITY,
+    DEFAULT_MAX_DRIFT_MS,
+    MIN_ENTROPY_SIZE,
+    MIN_SCALABILITY,
     ULID_FLAKE_LEN,
 )
-from . import base32
+from . import base32, binary
+from .generator import METRICS, Generator, _generators
+from .layout import SCALABLE, layout_class
+
+
+class UlidFlakeScalableGenerator(Generator):
+    """Scalable Ulid-Flake generator, by default with 43-bit timestamp, 15-bit randomness and 5-bit sid."""
+    default_layout = SCALABLE
+    scalable = True
+    sid_allocator = None
+
+    def set_config(self, epoch_time=DEFAULT_EPOCH, entropy_size=MIN_ENTROPY_SIZE, sid=0,
+                   clock=None, entropy_pool=None, overflow_policy="raise", max_drift_ms=DEFAULT_MAX_DRIFT_MS,
+                   sid_allocator=None, clock_regression="clamp", randomness_source="urandom", layout=None):
+        """Configure the generator; see `Generator.set_config`.
+
+        With a `sid_allocator` (e.g. `FileSidAllocator`) the `sid` argument is ignored:
+        the generator leases its sid on first use, and again in child processes. A `sid`
+        passed to the generation methods must then be the leased sid.
+        """
+        max_sid = (self.default_layout if layout is None else layout).max_sid
+        if sid < 0 or sid > max_sid:
+            raise ValueError(f"sid must be between 0 and {max_sid}")
+        if sid_allocator is not None and max(sid_allocator.sids) > max_sid:
+            raise ValueError(f"sid_allocator sids must be between 0 and {max_sid}")
+
+        super().set_config(epoch_time, entropy_size, clock, entropy_pool, overflow_policy, max_drift_ms,
+                           clock_regression, randomness_source, layout)
+        if self.sid_allocator is not None and self.sid_allocator is not sid_allocator:
+            self.sid_allocator.release()
+        self.sid_allocator = sid_allocator
+        if sid_allocator is None:
+            self.sid = sid
+            if isinstance(self.lock, _SidLeasingLock):
+                self.lock = self._new_lock()
+        else:
+            self.sid = None
+            self.lock = _SidLeasingLock(self)
+
+    def _after_fork(self):
+        super()._after_fork()
+        if self.sid_allocator is not None:
+            self.sid = None
+            self.lock = _SidLeasingLock(self)
 
+    @property
+    def id_class(self):
+        return layout_class(UlidFlakeScalable, self.layout)
+
+    def _check_sid(self, sid):
+        if sid is None:
+            return sid
+        if not 0 <= sid < self.slots:
+            raise ValueError(f"sid must be between 0 and {self.slots - 1}")
+        if self.sid_allocator is not None:
+            if self.sid is None:
+                with self.lock:  # leases the sid
+                    pass
+            if sid != self.sid:
+                raise ValueError(f"sid {sid} is not leased by the sid_allocator (leased sid {self.sid})")
+        return sid
+
+    def new_int(self, sid=None):
+        """Generate the next monotonic Ulid-Flake for `sid` (default the configured sid) as an integer.
+
+        Every sid keeps its own monotonic state, so one process can generate for all
+        sids of the layout (32 by default), each with the full randomness space per millisecond.
+        """
+        return self._new_int(self._check_sid(sid))
+
+    def new_str(self, sid=None):
+        """Generate the next monotonic Ulid-Flake for `sid` (default the configured sid) as a Base32 string."""
+        return self._new_str(self._check_sid(sid))
+
+    def new(self, sid=None):
+        """Generate the next monotonic Ulid-Flake instance for `sid` (default the configured sid)."""
+        return self.id_class(self._new_int(self._check_sid(sid)))
+
+    def new_batch(self, n, as_int=False, sid=None):
+        """Generate a list of `n` monotonic Ulid-Flakes for `sid`, as instances or (with `as_int`) plain integers."""
+        return list(self.iter_new(n, as_int=as_int, sid=sid))
+
+    def iter_new(self, n, as_int=False, sid=None):
+        """Yield `n` monotonic Ulid-Flakes for `sid`, rolling over to the next millisecond instead of overflowing."""
+        return self._iter_new(n, as_int, self._check_sid(sid))
+
+    def reserve(self, n, sid=None):
+        """Claim `n` consecutive monotonic values for `sid` under one lock acquisition; see `Generator.reserve`."""
+        return self._reserve(n, self._check_sid(sid))
+
+    def fill_from_unix_epoch_times(self, unix_times, out, unit="s", sid=None):
+        """Write a Ulid-Flake for `sid` and each of `unix_times` into the int64 buffer `out`.
+
+        Return the number written; see `Generator.fill_from_unix_epoch_times`.
+        """
+        return self._fill_from_unix_epoch_times(unix_times, out, unit, self._check_sid(sid))
+
+
+class _SidLeasingLock:
+    """Stand-in for a generator's lock until its sid has been leased.
+
+    The first thread to acquire it leases the sid from the allocator and installs a
+    regular lock, so generators with an allocator pay nothing extra once leased.
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.guard = threading.Lock()
+
+    def acquire(self, blocking=True):
+        generator = self.generator
+        if not self.guard.acquire(blocking):
+            return False
+        try:
+            if generator.lock is self:
+                generator.sid = generator.sid_allocator.acquire()
+                lock = generator._new_lock()
+                lock.acquire()
+                generator.lock = lock
+                return True
+        finally:
+            self.guard.release()
+        return generator.lock.acquire(blocking)
+
+    def release(self):
+        self.generator.lock.release()
+
+    def __enter__(self):
+        self.acquire()
 
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+@total_ordering
 class UlidFlakeScalable:
-    previous_timestamp = None
-    previous_randomness = None
-    epoch_time = DEFAULT_EPOCH
-    entropy_size = MIN_ENTROPY_SIZE
-    sid = 0
-    lock = threading.Lock()
+    __slots__ = ("value",)
+
+    # Layout used to decode the fields; generators with other layouts use subclasses (see `layout_class`).
+    layout = SCALABLE
+    default_generator = UlidFlakeScalableGenerator()
 
     def __init__(self, value):
         if value < MIN_INT or value > MAX_INT:
@@ -35,6 +166,35 @@ class UlidFlakeScalable:
     def __str__(self):
         return self.base32
 
+    def __repr__(self):
+        return f"{type(self).__name__}('{self.base32}')"
+
+    def __eq__(self, other):
+        if not isinstance(other, UlidFlakeScalable):
+            return NotImplemented
+        return self.value == other.value
+
+    def __lt__(self, other):
+        if not isinstance(other, UlidFlakeScalable):
+            return NotImplemented
+        return self.value < other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __int__(self):
+        return self.value
+
+    def __index__(self):
+        return self.value
+
+    def __bytes__(self):
+        return self.value.to_bytes(8, byteorder="big")
+
+    def to_bytes(self):
+        """Return the 8-byte big-endian form, which sorts like the Ulid-Flake itself."""
+        return self.value.to_bytes(8, byteorder="big")
+
     @property
     def int(self):
         return self.value
@@ -53,121 +213,336 @@ class UlidFlakeScalable:
 
     @property
     def timestamp(self):
-        return (self.value >> 20) & MAX_TIMESTAMP
+        layout = self.layout
+        return (self.value >> layout.timestamp_shift) & layout.max_timestamp
 
     @property
     def randomness(self):
-        return (self.value >> 5) & MAX_RANDOMNESS_SCALABLE
+        layout = self.layout
+        return (self.value >> layout.randomness_shift) & layout.max_randomness
+
+    @property
+    def sid(self):
+        return self.value & self.layout.max_sid
 
     @classmethod
-    def set_config(cls, epoch_time=DEFAULT_EPOCH, entropy_size=MIN_ENTROPY_SIZE, sid=0):
-        if entropy_size <= 0 or entropy_size > MAX_ENTROPY_SIZE_SCALABLE:
-            raise ValueError(f"Entropy size must be between 1 and {MAX_ENTROPY_SIZE_SCALABLE}.")
-        if sid < 0 or sid > MAX_SCALABILITY:
-            raise ValueError(f"sid must be between 0 and {MAX_SCALABILITY}")
+    def set_config(cls, *args, **kwargs):
+        """Configure the default generator; see `UlidFlakeScalableGenerator.set_config`.
 
-        cls.epoch_time = epoch_time
-        cls.entropy_size = entropy_size
-        cls.sid = sid & MAX_SCALABILITY
+        With another `layout` the generator, `parse` and the `from_*` constructors return
+        instances of a subclass bound to it, so the class layout and existing instances
+        keep decoding their fields as before.
+        """
+        cls.default_generator.set_config(*args, **kwargs)
 
     @classmethod
-    def reset_config(self):
-        self.epoch_time = DEFAULT_EPOCH
-        self.entropy_size = MIN_ENTROPY_SIZE
-        self.sid = 0
+    def reset_config(cls):
+        cls.default_generator.reset_config()
 
     @classmethod
     def generate_timestamp(cls):
-        """Generate a 43-bit timestamp (milliseconds since Ulid-Flake epoch)."""
-        timestamp = int((datetime.now(timezone.utc) - cls.epoch_time).total_seconds() * 1000)
-        if timestamp > MAX_TIMESTAMP:
-            raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
-        return timestamp
+        """Generate a timestamp (milliseconds, or ticks of the layout resolution, since Ulid-Flake epoch)."""
+        return cls.default_generator.generate_timestamp()
+
+    @classmethod
+    def overflow_stats(cls):
+        """Return how often each overflow policy path was taken by the default generator."""
+        return cls.default_generator.overflow_stats()
+
+    @classmethod
+    def stats(cls):
+        """Return a snapshot of the default generator's metrics."""
+        return cls.default_generator.stats()
+
+    @classmethod
+    def enable_metrics(cls, callback=None):
+        """Start counting generated IDs, increments and lock waits on the default generator."""
+        cls.default_generator.enable_metrics(callback)
+
+    @classmethod
+    def disable_metrics(cls):
+        cls.default_generator.disable_metrics()
 
     @classmethod
     def generate_randomness(cls):
-        """Generate a 15-bit randomness value."""
-        return int.from_bytes(os.urandom(2), byteorder="big") & MAX_RANDOMNESS_SCALABLE
+        """Generate a randomness value (15-bit in the default layout)."""
+        return cls.default_generator.generate_randomness()
 
     @classmethod
     def generate_entropy(cls, size=MIN_ENTROPY_SIZE):
         """Generate an entropy value to increment randomness."""
-        if size <= 0 or size > MAX_ENTROPY_SIZE_SCALABLE:  # Ensure entropy size is within a reasonable range
-            raise ValueError(f"Entropy size must be between 1 and {MAX_ENTROPY_SIZE_SCALABLE}.")
-        return int.from_bytes(os.urandom(size), byteorder="big")
+        return cls.default_generator.generate_entropy(size)
 
     @classmethod
-    def new(cls, sid=0):
-        """Generate a 64-bit signed Ulid-Flake with 43-bit timestamp, 15-bit randomness, and 5-bit scalability."""
-        with cls.lock:
-            timestamp = cls.generate_timestamp()
-
-            if timestamp == cls.previous_timestamp:
-                entropy = cls.generate_entropy(cls.entropy_size)
-                while entropy <= 0:
-                    entropy = cls.generate_entropy(cls.entropy_size)
-                new_randomness = (cls.previous_randomness + entropy)
-                if new_randomness > MAX_RANDOMNESS_SCALABLE:
-                    raise OverflowError("Randomness exceeds maximum ULID value.")
-                randomness = new_randomness
-            else:
-                randomness = cls.generate_randomness()
+    def new(cls, sid=None):
+        """Generate a 64-bit signed Ulid-Flake, by default with 43-bit timestamp, 15-bit randomness, and 5-bit sid.
 
-            cls.previous_timestamp = timestamp
-            cls.previous_randomness = randomness
+        `sid` defaults to the configured sid; each sid has its own monotonic state.
+        """
+        return cls.default_generator.new(sid)
 
-            # Set the sign bit to 0 (positive)
-            sign_bit = 0
+    @classmethod
+    def new_str(cls, sid=None):
+        """Generate the next Ulid-Flake Scalable for `sid` as a Base32 string without building an instance."""
+        return cls.default_generator.new_str(sid)
 
-            # Combine the sign bit, timestamp, randomness, and sid
-            combined = (sign_bit << 63) | (timestamp << 20) | (randomness << 5) | cls.sid
+    @classmethod
+    def reserve(cls, n, sid=None):
+        """Claim `n` consecutive monotonic values for `sid` from the default generator as an `IdBlock`."""
+        return cls.default_generator.reserve(n, sid)
 
-            if combined > MAX_INT:
-                raise OverflowError("Value exceeds the allowable Ulid-Flake range.")
+    @classmethod
+    def new_batch(cls, n, as_int=False, sid=None):
+        """Generate a list of `n` monotonic Ulid-Flakes, as instances or (with `as_int`) plain integers."""
+        return cls.default_generator.new_batch(n, as_int=as_int, sid=sid)
 
-            return cls(combined)
+    @classmethod
+    def iter_new(cls, n, as_int=False, sid=None):
+        """Yield `n` monotonic Ulid-Flakes, rolling over to the next millisecond instead of overflowing."""
+        return cls.default_generator.iter_new(n, as_int=as_int, sid=sid)
 
     @classmethod
-    def parse(cls, ulid_flake_string):
-        """Parse a Ulid-Flake string to create a Ulid-Flake instance."""
-        if len(ulid_flake_string) != ULID_FLAKE_LEN:
-            raise ValueError(f"Ulid-Flake string must be {ULID_FLAKE_LEN} characters long.")
-        try:
-            value = base32.decode(ulid_flake_string.upper())
-        except ValueError:
-            raise ValueError("Ulid-Flake string contains invalid Base32 characters.")
+    def _decoding_class(cls):
+        # Instances made from values decode their fields with the layout of the default generator.
+        return cls.default_generator.id_class
 
-        if value < MIN_INT or value > MAX_INT:
-            raise OverflowError("Parsed value exceeds the allowable Ulid-Flake range.")
+    @classmethod
+    def parse(cls, ulid_flake_string, strict=True):
+        """Parse a Ulid-Flake string to create a Ulid-Flake instance.
 
-        return cls(value)
+        With `strict=False` the Crockford aliases I, L (for 1) and O (for 0) are accepted.
+        """
+        return cls._decoding_class()(base32.parse(ulid_flake_string, strict))
 
     @classmethod
     def from_int(cls, value):
         """Create a Ulid-Flake instance from an integer."""
         if value < MIN_INT or value > MAX_INT:
             raise OverflowError("Integer value exceeds the allowable Ulid-Flake range.")
-        return cls(value)
+        return cls._decoding_class()(value)
 
     @classmethod
     def from_str(cls, ulid_flake_string):
         """Create a Ulid-Flake instance from a Base32 string."""
         return cls.parse(ulid_flake_string)
 
+    @classmethod
+    def from_bytes(cls, data):
+        """Create a Ulid-Flake instance from its 8-byte big-endian form."""
+        return cls._decoding_class()(binary.unpack(data))
+
     @classmethod
     def from_unix_epoch_time(cls, unix_time):
         """Create a Ulid-Flake instance from a Unix epoch time."""
-        if not isinstance(unix_time, (int, float)):
-            raise ValueError("unix_time must be an integer or float representing seconds since Unix epoch.")
+        return cls.default_generator.from_unix_epoch_time(unix_time)
+
+    @classmethod
+    def fill_from_unix_epoch_times(cls, unix_times, out, unit="s", sid=None):
+        """Write a Ulid-Flake for each of `unix_times` into the int64 buffer `out`; return the number written."""
+        return cls.default_generator.fill_from_unix_epoch_times(unix_times, out, unit=unit, sid=sid)
+
+
+class _SidLease:
+    """Placeholder kept in a thread's local storage; its finalizer returns the thread's sid."""
+    __slots__ = ("__weakref__",)
+
+
+class ThreadLocalUlidFlakeScalableGenerator:
+    """Scalable generator giving every thread its own sid and monotonic state.
+
+    A thread leases a free sid (from `sids`, default all of the layout) on its first call and
+    returns it when it exits; generation itself never takes a lock shared between
+    threads. IDs are unique across all threads because no two live threads hold the
+    same sid, and a reused sid continues the sequence of its previous holder. IDs are
+    monotonic per thread, not across threads. A child process after `os.fork()` never
+    leases the sids its parent's threads held at the fork.
+    """
+
+    def __init__(self, sids=None, **config):
+        max_sid = (config.get("layout") or SCALABLE).max_sid
+        sids = sorted(set(range(MIN_SCALABILITY, max_sid + 1) if sids is None else sids), reverse=True)
+        if not sids or sids[-1] < MIN_SCALABILITY or sids[0] > max_sid:
+            raise ValueError(f"sids must be between {MIN_SCALABILITY} and {max_sid}")
+
+        # Guards sid leases only; reentrant because a lease finalizer may run while it is held.
+        self.lock = threading.RLock()
+        self.sids = sids
+        self.free_sids = list(sids)
+        self.generators = {}
+        self.local = threading.local()
+        # Finalizers returning the sids leased by live threads, by sid, and the process they belong to.
+        self.leases = {}
+        self.pid = os.getpid()
+        self.metrics_enabled = False
+        self.metrics_callback = None
+        self.set_config(**config)
+        _generators.add(self)
+
+    def _after_fork(self):
+        """The parent's threads keep their sids, so the child never leases a sid leased at fork time."""
+        # Detach the inherited leases so that collecting the old local does not hand their sids to the child.
+        for finalizer in self.leases.values():
+            finalizer.detach()
+        self.leases = {}
+        self.pid = os.getpid()
+        self.lock = threading.RLock()
+        self.local = threading.local()
+
+    def set_config(self, epoch_time=DEFAULT_EPOCH, entropy_size=MIN_ENTROPY_SIZE,
+                   clock=None, entropy_pool=None, overflow_policy="raise", max_drift_ms=DEFAULT_MAX_DRIFT_MS,
+                   clock_regression="clamp", randomness_source="urandom", layout=None):
+        config = dict(
+            epoch_time=epoch_time,
+            entropy_size=entropy_size,
+            clock=clock,
+            entropy_pool=entropy_pool,
+            overflow_policy=overflow_policy,
+            max_drift_ms=max_drift_ms,
+            clock_regression=clock_regression,
+            randomness_source=randomness_source,
+            layout=layout,
+        )
+        UlidFlakeScalableGenerator(**config)  # validate before touching the per-sid generators
+        with self.lock:
+            self.config = config
+            for sid, generator in self.generators.items():
+                generator.set_config(sid=sid, **config)
+
+    def reset_config(self):
+        """Restore the default configuration and start a new sequence for every sid."""
+        self.set_config()
+        with self.lock:
+            for generator in self.generators.values():
+                generator._reset_state()
+
+    @property
+    def sid(self):
+        """The sid leased by the calling thread."""
+        return self._generator().sid
+
+    def _generator(self):
+        try:
+            return self.local.generator
+        except AttributeError:
+            pass
+
+        with self.lock:
+            if not self.free_sids:
+                raise RuntimeError("All sids are leased by running threads.")
+            sid = self.free_sids.pop()
+            generator = self.generators.get(sid)
+            if generator is None:
+                generator = self.generators[sid] = UlidFlakeScalableGenerator(sid=sid, **self.config)
+                if self.metrics_enabled:
+                    generator.enable_metrics(self.metrics_callback)
+            lease = _SidLease()
+            self.leases[sid] = weakref.finalize(lease, self._release, sid)
+        self.local.lease = lease
+        self.local.generator = generator
+        return generator
+
+    def _release(self, sid):
+        if os.getpid() != self.pid:
+            return  # a parent's thread, collected in a child before `_after_fork` ran
+        with self.lock:
+            del self.leases[sid]
+            self.free_sids.append(sid)
+
+    def generate_timestamp(self):
+        """Generate a 43-bit timestamp (milliseconds since Ulid-Flake epoch)."""
+        return self._generator().generate_timestamp()
+
+    def overflow_stats(self):
+        """Return how often each overflow policy path was taken, summed over all sids."""
+        with self.lock:
+            generators = list(self.generators.values())
+        stats = {}
+        for generator in generators:
+            for path, count in generator.overflow_stats().items():
+                stats[path] = stats.get(path, 0) + count
+        return stats
+
+    def stats(self):
+        """Return a snapshot of the metrics, summed over all sids."""
+        with self.lock:
+            generators = list(self.generators.values())
+        stats = dict.fromkeys(METRICS, 0)
+        for generator in generators:
+            for name, value in generator.stats().items():
+                stats[name] = stats.get(name, 0) + value
+        return stats
+
+    def enable_metrics(self, callback=None):
+        """Start counting generated IDs and increments on the generators of all sids."""
+        with self.lock:
+            self.metrics_enabled = True
+            self.metrics_callback = callback
+            for generator in self.generators.values():
+                generator.enable_metrics(callback)
+
+    def disable_metrics(self):
+        with self.lock:
+            self.metrics_enabled = False
+            self.metrics_callback = None
+            for generator in self.generators.values():
+                generator.disable_metrics()
+
+    def new_int(self):
+        """Generate the calling thread's next monotonic Ulid-Flake as an integer."""
+        try:
+            generator = self.local.generator
+        except AttributeError:
+            generator = self._generator()
+        return generator.new_int()
+
+    def new_str(self):
+        """Generate the calling thread's next monotonic Ulid-Flake as a Base32 string."""
+        try:
+            generator = self.local.generator
+        except AttributeError:
+            generator = self._generator()
+        return generator.new_str()
+
+    def new(self):
+        """Generate the calling thread's next monotonic Ulid-Flake instance."""
+        try:
+            generator = self.local.generator
+        except AttributeError:
+            generator = self._generator()
+        return generator.id_class(generator.new_int())
+
+    def new_batch(self, n, as_int=False):
+        """Generate a list of `n` monotonic Ulid-Flakes, as instances or (with `as_int`) plain integers."""
+        return self._generator().new_batch(n, as_int=as_int)
+
+    def reserve(self, n):
+        """Claim `n` consecutive monotonic values with the calling thread's sid as an `IdBlock`."""
+        return self._generator().reserve(n)
+
+    def iter_new(self, n, as_int=False):
+        """Yield `n` monotonic Ulid-Flakes, rolling over to the next millisecond instead of overflowing."""
+        return self._generator().iter_new(n, as_int=as_int)
+
+    def from_unix_epoch_time(self, unix_time):
+        """Create a Ulid-Flake instance from a Unix epoch time with the calling thread's sid."""
+        return self._generator().from_unix_epoch_time(unix_time)
+
+    def fill_from_unix_epoch_times(self, unix_times, out, unit="s"):
+        """Write a Ulid-Flake for each of `unix_times` into the int64 buffer `out` with the calling thread's sid."""
+        return self._generator().fill_from_unix_epoch_times(unix_times, out, unit=unit)
+
+
+# Pre-bound default generator entry points for the module-level shortcuts.
+_new_int = UlidFlakeScalable.default_generator._new_int
+_new_str = UlidFlakeScalable.default_generator._new_str
+_check_sid = UlidFlakeScalable.default_generator._check_sid
+
 
-        if unix_time < cls.epoch_time.timestamp():
-            raise ValueError("Unix timestamp is before the custom epoch time.")
+def new_scalable_int(sid=None):
+    """Generate the next Ulid-Flake Scalable of the default generator for `sid` as a plain 63-bit integer."""
+    return _new_int(_check_sid(sid))
 
-        timestamp = int((datetime.fromtimestamp(unix_time, tz=timezone.utc) - cls.epoch_time).total_seconds() * 1000)
-        if timestamp > MAX_TIMESTAMP:
-            raise OverflowError("Timestamp exceeds maximum Ulid-Flake value.")
 
-        randomness = cls.generate_randomness()
-        sign_bit = 0
-        combined = (sign_bit << 63) | (timestamp << 20) | (randomness << 5) | cls.sid
-        return cls(combined)
+def new_scalable_str(sid=None):
+    """Generate the next Ulid-Flake Scalable of the default generator for `sid` as a 13-character Base32 string."""
+    return _new_str(_check_sid(sid))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.aio` module."""
+
+
+import asyncio
+import unittest
+from unittest import mock
+
+from ulid_flake.aio import AsyncUlidFlakeGenerator
+from ulid_flake.api import UlidFlake, UlidFlakeGenerator
+from ulid_flake.clock import FakeClock
+from ulid_flake.layout import Layout
+from ulid_flake.scalable import UlidFlakeScalable, UlidFlakeScalableGenerator
+
+
+class TestAsyncUlidFlakeGenerator(unittest.TestCase):
+    """Tests for `ulid_flake.aio` module."""
+
+    def test_new(self):
+        """Test Await New Ulid-Flakes"""
+        generator = AsyncUlidFlakeGenerator(entropy_size=2)
+
+        async def main():
+            return [await generator.new() for _ in range(50)]
+
+        ulid_flakes = asyncio.run(main())
+        self.assertIsInstance(ulid_flakes[0], UlidFlake)
+        self.assertEqual(ulid_flakes, sorted(set(ulid_flakes)))
+
+    def test_concurrent_tasks_wait_for_next_millisecond(self):
+        """Test Concurrent Tasks Exhausting the Scalable Randomness Wait without Raising"""
+        generator = AsyncUlidFlakeGenerator(UlidFlakeScalableGenerator(entropy_size=2, sid=6))
+
+        async def worker():
+            return [await generator.new_int() for _ in range(20)]
+
+        async def main():
+            return await asyncio.gather(*(worker() for _ in range(20)))
+
+        values = [value for values in asyncio.run(main()) for value in values]
+        self.assertEqual(len(set(values)), 400)
+        self.assertTrue(all(value & 31 == 6 for value in values))
+        self.assertGreater(generator.overflow_stats()["sleep"], 0)
+
+    def test_overflow_waits_for_generator_clock(self):
+        """Test Overflows Wait for the Next Tick of the Generator Clock and are Counted Once"""
+        generator = AsyncUlidFlakeGenerator(entropy_size=3, layout=Layout(40, 23, resolution_ms=10))
+
+        async def main():
+            return [await generator.new_int() for _ in range(60)]
+
+        values = asyncio.run(main())
+        self.assertEqual(values, sorted(set(values)))
+        ticks = len({value >> 23 for value in values})
+        self.assertLess(generator.overflow_stats()["sleep"], ticks)
+
+    def test_clock_regression_wait_does_not_block(self):
+        """Test the Wait Clock Regression Policy Sleeps without Blocking the Event Loop"""
+        clock = FakeClock(1704067200000 + 100, tick=1)
+        generator = AsyncUlidFlakeGenerator(UlidFlakeGenerator(clock=clock, clock_regression="wait"))
+
+        async def main():
+            first = await generator.new_int()
+            clock.advance(-5)
+            return first, await generator.new_int()
+
+        with mock.patch("ulid_flake.generator.time.sleep", side_effect=AssertionError("blocking sleep")):
+            first, second = asyncio.run(main())
+        self.assertGreater(second, first)
+        self.assertEqual(generator.generator.stats()["clock_backwards"], 1)
+
+    def test_stream(self):
+        """Test Stream Ulid-Flakes Asynchronously"""
+        generator = AsyncUlidFlakeGenerator(UlidFlakeScalableGenerator())
+
+        async def main():
+            return [ulid_flake async for ulid_flake in generator.stream(1000, sid=2)]
+
+        ulid_flakes = asyncio.run(main())
+        self.assertEqual(len(ulid_flakes), 1000)
+        self.assertIsInstance(ulid_flakes[0], UlidFlakeScalable)
+        self.assertEqual(ulid_flakes, sorted(set(ulid_flakes)))
+        self.assertTrue(all(ulid_flake.sid == 2 for ulid_flake in ulid_flakes))
+
+    def test_invalid_sid(self):
+        """Test Await Ulid-Flake with an Invalid sid"""
+        generator = AsyncUlidFlakeGenerator()
+        with self.assertRaises(ValueError):
+            asyncio.run(generator.new(sid=1))
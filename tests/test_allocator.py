@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.allocator` module and fork safety."""
+
+
+import gc
+import os
+import tempfile
+import threading
+import unittest
+
+from ulid_flake.allocator import FileSidAllocator
+from ulid_flake.scalable import ThreadLocalUlidFlakeScalableGenerator, UlidFlakeScalableGenerator
+
+
+def run_in_child(func):
+    """Run `func` in a forked child and return the integer it produced."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            os.write(write_fd, str(func()).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        result = pipe.read()
+    os.waitpid(pid, 0)
+    return int(result)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+class TestFileSidAllocator(unittest.TestCase):
+    """Tests for `ulid_flake.allocator` module."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        self.directory.cleanup()
+
+    def test_allocators_lease_distinct_sids(self):
+        """Test Allocators Sharing a Directory Lease Distinct sids"""
+        first = FileSidAllocator(self.directory.name, sids=[3, 4])
+        second = FileSidAllocator(self.directory.name, sids=[3, 4])
+        third = FileSidAllocator(self.directory.name, sids=[3, 4])
+        self.assertEqual(first.acquire(), 3)
+        self.assertEqual(first.acquire(), 3)
+        self.assertEqual(second.acquire(), 4)
+        with self.assertRaises(RuntimeError):
+            third.acquire()
+        first.release()
+        self.assertEqual(third.acquire(), 3)
+
+    def test_allocator_with_invalid_sids(self):
+        """Test Allocator with Invalid sids"""
+        with self.assertRaises(ValueError):
+            FileSidAllocator(self.directory.name, sids=[32])
+        with self.assertRaises(ValueError):
+            FileSidAllocator(self.directory.name, sids=[])
+
+    def test_child_process_leases_new_sid(self):
+        """Test Child Processes Lease their own sid after Fork"""
+        generator = UlidFlakeScalableGenerator(sid_allocator=FileSidAllocator(self.directory.name))
+        parent_id = generator.new()
+        child_sid = run_in_child(lambda: generator.new().sid)
+        self.assertEqual(parent_id.sid, 0)
+        self.assertEqual(child_sid, 1)
+        # the parent keeps its lease after the child exits
+        self.assertEqual(generator.new().sid, 0)
+
+    def test_child_process_resets_monotonic_state(self):
+        """Test Child Processes do not Inherit Monotonic State"""
+        generator = UlidFlakeScalableGenerator(sid=2)
+        generator.new()
+        self.assertEqual(run_in_child(lambda: int(generator.previous_timestamp is None)), 1)
+
+    def test_child_process_does_not_reuse_leased_thread_local_sids(self):
+        """Test Child Processes never Lease the Thread-Local sids Leased at Fork"""
+        generator = ThreadLocalUlidFlakeScalableGenerator()
+        generator.new_int()
+        leased = threading.Event()
+        done = threading.Event()
+
+        def worker():
+            generator.new_int()
+            leased.set()
+            done.wait()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        leased.wait()
+
+        def child_sid():
+            gc.collect()
+            generator.new_int()
+            return generator.sid
+
+        def free_sids():
+            gc.collect()
+            generator.new_int()
+            return len(generator.free_sids)
+
+        try:
+            self.assertEqual(run_in_child(child_sid), 2)
+            self.assertEqual(run_in_child(free_sids), 29)
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(generator.sid, 0)
+        self.assertEqual(sorted(generator.free_sids), list(range(1, 32)))
+
+    def test_sid_outside_allocator_lease(self):
+        """Test Explicit sids must Match the sid Leased from the Allocator"""
+        generator = UlidFlakeScalableGenerator(sid_allocator=FileSidAllocator(self.directory.name, sids=[5, 6]))
+        with self.assertRaises(ValueError):
+            generator.new_int(sid=0)
+        self.assertEqual(generator.sid, 5)
+        self.assertEqual(generator.new(sid=5).sid, 5)
+        self.assertEqual(generator.new_batch(2, as_int=True, sid=5)[0] & 31, 5)
+        with self.assertRaises(ValueError):
+            generator.reserve(2, sid=6)
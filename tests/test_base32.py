@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.base32` module."""
+
+
+import unittest
+
+from ulid_flake import base32
+
+
+class TestBase32(unittest.TestCase):
+    """Tests for `ulid_flake.base32` module."""
+
+    def test_encode_ulid_flake_length(self):
+        """Test Encode a 13-character Base32 String"""
+        self.assertEqual(base32.encode(0, 13), "0000000000000")
+        self.assertEqual(base32.encode((1 << 63) - 1, 13), "7ZZZZZZZZZZZZ")
+        self.assertEqual(base32.encode(16873543940839584, 13), "00EZJCRCB4650")
+
+    def test_encode_other_length(self):
+        """Test Encode a Base32 String with a Custom Length"""
+        self.assertEqual(base32.encode(1023, 2), "ZZ")
+        self.assertEqual(base32.encode(32, 4), "0010")
+
+    def test_decode(self):
+        """Test Decode Upper and Lower Case Base32 Strings"""
+        self.assertEqual(base32.decode("00EZJCRCB4650"), 16873543940839584)
+        self.assertEqual(base32.decode("00ezjcrcb4650"), 16873543940839584)
+        self.assertEqual(base32.decode("7ZZZZZZZZZZZZ"), (1 << 63) - 1)
+
+    def test_decode_invalid_characters(self):
+        """Test Decode Base32 Strings with Invalid Characters"""
+        for encoded in ("00CMH8K1E1E1U", "00CMH8K1E1E1I", "-1", "1_0", " 10", "1é"):
+            with self.assertRaises(ValueError):
+                base32.decode(encoded)
+
+    def test_encode_decode_many(self):
+        """Test Encode and Decode Sequences of Values"""
+        values = [0, 1, 16873543940839584, (1 << 63) - 1]
+        encoded = base32.encode_many(values)
+        self.assertEqual(encoded, [base32.encode(value, 13) for value in values])
+        self.assertEqual(base32.decode_many(encoded), values)
+        self.assertEqual(base32.decode_many([e.lower() for e in encoded]), values)
+        with self.assertRaises(ValueError):
+            base32.decode_many(["0000000000000", "000000000000U"])
+
+    def test_parse(self):
+        """Test Parse Validates Length, Alphabet and Range"""
+        self.assertEqual(base32.parse("00EZJCRCB4650"), 16873543940839584)
+        self.assertEqual(base32.parse("7zzzzzzzzzzzz"), (1 << 63) - 1)
+        for encoded in ("00EZJCRCB465", "00EZJCRCB46500", "00EZJCRCB465U", "00EZJCRCB465é", "00EZJCRCB465I"):
+            with self.assertRaises(ValueError):
+                base32.parse(encoded)
+        with self.assertRaises(OverflowError):
+            base32.parse("8000000000000")
+
+    def test_parse_lenient(self):
+        """Test Parse Accepts Crockford Aliases when not Strict"""
+        self.assertEqual(base32.parse("OOEZJCRCB4LiO", strict=False), base32.parse("00EZJCRCB4110"))
+        self.assertEqual(base32.parse("ooezjcrcb4650", strict=False), 16873543940839584)
+        with self.assertRaises(ValueError):
+            base32.parse("00EZJCRCB465U", strict=False)
+
+    def test_validate_and_parse_many(self):
+        """Test Validate and Parse Sequences without Raising"""
+        encoded = ["00EZJCRCB4650", "00EZJCRCB465", "00EZJCRCB465U", "8000000000000", "7ZZZZZZZZZZZZ",
+                   "00EZJCRCB465é", "00EZJCRCB465O"]
+        self.assertEqual(base32.validate_many(encoded), [True, False, False, False, True, False, False])
+        self.assertEqual(base32.validate_many(encoded, strict=False), [True, False, False, False, True, False, True])
+        self.assertEqual(base32.parse_many(encoded),
+                         [16873543940839584, None, None, None, (1 << 63) - 1, None, None])
+        self.assertEqual(base32.parse_many(encoded, strict=False)[-1], 16873543940839584)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.binary` module."""
+
+
+import os
+import tempfile
+import unittest
+
+from ulid_flake import binary
+from ulid_flake.api import UlidFlake
+
+
+class TestBinary(unittest.TestCase):
+    """Tests for `ulid_flake.binary` module."""
+
+    def test_pack_and_unpack(self):
+        """Test Pack and Unpack a Ulid-Flake"""
+        self.assertEqual(binary.pack(2), b"\x00\x00\x00\x00\x00\x00\x00\x02")
+        self.assertEqual(binary.unpack(binary.pack((1 << 63) - 1)), (1 << 63) - 1)
+        with self.assertRaises(OverflowError):
+            binary.pack(-1)
+        with self.assertRaises(OverflowError):
+            binary.unpack(b"\x80\x00\x00\x00\x00\x00\x00\x00")
+        with self.assertRaises(ValueError):
+            binary.unpack(b"\x00")
+        with self.assertRaises(ValueError):
+            UlidFlake.from_bytes(b"\x00" * 9)
+
+    def test_pack_and_unpack_many(self):
+        """Test Pack and Unpack Buffers of Ulid-Flakes"""
+        values = UlidFlake.new_batch(100, as_int=True)
+        packed = binary.pack_many(values)
+        self.assertEqual(packed, b"".join(binary.pack(value) for value in values))
+        self.assertEqual(binary.unpack_many(packed).tolist(), values)
+        self.assertEqual(list(binary.iter_unpack(memoryview(packed))), values)
+
+        out = bytearray(8 * 101)
+        self.assertIs(binary.pack_many(values, out, offset=8), out)
+        self.assertEqual(binary.unpack_many(out).tolist(), [0] + values)
+
+    def test_pack_and_unpack_many_with_invalid_values(self):
+        """Test Pack and Unpack Buffers with Invalid Values"""
+        with self.assertRaises(OverflowError):
+            binary.pack_many([1, -1])
+        with self.assertRaises(OverflowError):
+            binary.pack_many([1 << 63])
+        with self.assertRaises(ValueError):
+            binary.unpack_many(b"\x00" * 9)
+        with self.assertRaises(OverflowError):
+            binary.unpack_many(b"\xff" * 8)
+        with self.assertRaises(OverflowError):
+            list(binary.iter_unpack(b"\x00" * 8 + b"\xff" * 8))
+
+    def test_packed_reader(self):
+        """Test Read a Memory-Mapped File of Packed Ulid-Flakes"""
+        values = UlidFlake.new_batch(1000, as_int=True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ids.bin")
+            with open(path, "wb") as file:
+                file.write(binary.pack_many(values))
+            with binary.PackedReader(path) as reader:
+                self.assertEqual(len(reader), 1000)
+                self.assertEqual(reader[0], values[0])
+                self.assertEqual(reader[-1], values[-1])
+                self.assertEqual(reader[10:20].tolist(), values[10:20])
+                self.assertEqual(reader[::100].tolist(), values[::100])
+                self.assertEqual(list(reader), values)
+                with self.assertRaises(IndexError):
+                    reader[1000]
+
+            with binary.PackedReader(path) as reader:
+                iterator = iter(reader)
+                self.assertEqual(next(iterator), values[0])
+            self.assertEqual(list(iterator), values[1:])
+
+            with open(path, "wb") as file:
+                file.write(binary.pack(1) + b"\xff" * 8)
+            with binary.PackedReader(path) as reader:
+                self.assertEqual(reader[0], 1)
+                with self.assertRaises(OverflowError):
+                    reader[1]
+                with self.assertRaises(OverflowError):
+                    reader[::1]
+                with self.assertRaises(OverflowError):
+                    list(reader)
+
+            open(path, "wb").close()
+            with binary.PackedReader(path) as reader:
+                self.assertEqual(len(reader), 0)
+                self.assertEqual(list(reader), [])
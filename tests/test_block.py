@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.block` module."""
+
+
+import threading
+import unittest
+
+from ulid_flake.api import UlidFlake, UlidFlakeGenerator
+from ulid_flake.block import IdBlock
+from ulid_flake.clock import FakeClock
+from ulid_flake.layout import SCALABLE
+from ulid_flake.scalable import UlidFlakeScalable, UlidFlakeScalableGenerator
+
+
+class TestIdBlock(unittest.TestCase):
+    """Tests for `ulid_flake.block` module."""
+
+    def test_sequence(self):
+        """Test Index, Slice, Iterate and Search a Block across Milliseconds"""
+        block = IdBlock(7 * 32768 + 32766, 4, sid=9, layout=SCALABLE)
+        values = [(7 << 20) | (32766 << 5) | 9, (7 << 20) | (32767 << 5) | 9, (8 << 20) | 9, (8 << 20) | (1 << 5) | 9]
+        self.assertEqual(list(block), values)
+        self.assertEqual([block[i] for i in range(-4, 4)], values + values)
+        self.assertEqual(list(block[1:3]), values[1:3])
+        self.assertEqual(block[::2], values[::2])
+        self.assertEqual(len(block[3:1]), 0)
+        self.assertIn(values[2], block)
+        self.assertNotIn(values[2] + 1, block)
+        self.assertNotIn((8 << 20) | (2 << 5) | 9, block)
+        with self.assertRaises(IndexError):
+            block[4]
+
+    def test_split(self):
+        """Test Split a Block into Consecutive Parts"""
+        block = IdBlock(1000, 10)
+        parts = block.split(3)
+        self.assertEqual([len(part) for part in parts], [4, 3, 3])
+        self.assertEqual([value for part in parts for value in part], list(block))
+        with self.assertRaises(ValueError):
+            block.split(0)
+
+    def test_reserve(self):
+        """Test Reserve a Block and Continue after it"""
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeGenerator(clock=clock)
+        first = generator.new_int()
+        block = generator.reserve(1 << 21)
+        values = list(block)
+        self.assertEqual(len(values), 1 << 21)
+        self.assertLess(first, values[0])
+        self.assertEqual(values, sorted(set(values)))
+        self.assertEqual(UlidFlake(values[-1]).timestamp, 102)
+        after = generator.new_int()
+        self.assertGreater(after, values[-1])
+        self.assertEqual(generator.stats()["clock_backwards"], 0)
+        self.assertEqual(len(generator.reserve(0)), 0)
+        with self.assertRaises(ValueError):
+            generator.reserve(-1)
+
+    def test_reserve_keeps_clock_regression_policy(self):
+        """Test a Clock Step Back after a Reserved Block is Reached still Counts as a Regression"""
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeGenerator(clock=clock, clock_regression="raise")
+        generator.new_int()
+        generator.reserve(3)
+        generator.new_int()
+        clock.advance(-5000)
+        with self.assertRaises(RuntimeError):
+            generator.new_int()
+        self.assertEqual(generator.stats()["clock_backwards"], 1)
+
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeGenerator(clock=clock, clock_regression="raise")
+        generator.reserve(1 << 21)
+        generator.new_int()  # ahead of the clock, not a regression
+        clock.advance(2)
+        generator.new_int()  # the clock reaches the block
+        clock.advance(-1)
+        with self.assertRaises(RuntimeError):
+            generator.new_int()
+
+    def test_reserve_ahead_of_clock_keeps_clock_regression_policy(self):
+        """Test a Clock Step Back while a Reserved Block Runs ahead of the Clock Counts as a Regression"""
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeGenerator(clock=clock, clock_regression="raise")
+        block = generator.reserve(1 << 23)  # runs 8 milliseconds ahead
+        clock.advance(3)
+        self.assertGreater(generator.new_int(), block[-1])  # the clock moved on, still behind the block
+        clock.advance(-2)
+        with self.assertRaises(RuntimeError):
+            generator.new_int()
+        self.assertEqual(generator.stats()["clock_backwards"], 1)
+
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeGenerator(clock=clock)
+        block = generator.reserve(1 << 23)
+        clock.advance(-50)
+        after = generator.new_int()  # clamped, and counted
+        self.assertGreater(after, block[-1])
+        self.assertEqual(generator.stats()["clock_backwards"], 1)
+
+    def test_reserve_scalable_for_workers(self):
+        """Test Workers Assign IDs from Parts of a Reserved Block without the Generator"""
+        generator = UlidFlakeScalableGenerator(sid=4, overflow_policy="spin")
+        block = generator.reserve(40000, sid=6)
+        assigned = []
+
+        def worker(part):
+            assigned.extend(UlidFlakeScalable(value) for value in part)
+
+        threads = [threading.Thread(target=worker, args=(part,)) for part in block.split(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(assigned), sorted(set(assigned)))
+        self.assertEqual(len(assigned), 40000)
+        self.assertTrue(all(ulid_flake.sid == 6 for ulid_flake in assigned))
+        self.assertGreater(generator.new_int(sid=6), block[-1])
+        self.assertEqual(generator.new(sid=4).sid, 4)
+        with self.assertRaises(ValueError):
+            generator.reserve(1, sid=32)
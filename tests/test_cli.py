@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.cli` module."""
+
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import ulid_flake
+from ulid_flake import binary
+from ulid_flake.api import UlidFlake
+from ulid_flake.scalable import UlidFlakeScalable
+
+
+def python_env():
+    """Environment for a new interpreter that imports `ulid_flake` from this tree."""
+    source = os.path.dirname(os.path.dirname(os.path.abspath(ulid_flake.__file__)))
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [source, os.environ.get("PYTHONPATH")])))
+
+
+def run_cli(*args, input=b""):
+    """Run `python -m ulid_flake` with `args` and return the completed process."""
+    return subprocess.run([sys.executable, "-m", "ulid_flake", *args], input=input, capture_output=True,
+                          env=python_env())
+
+
+def run_python(code):
+    """Run `code` in a new interpreter and return its stdout."""
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, env=python_env(),
+                          check=True).stdout.decode()
+
+
+class TestCli(unittest.TestCase):
+    """Tests for `ulid_flake.cli` module."""
+
+    def test_gen(self):
+        """Test Stream Ulid-Flakes in Every Format"""
+        lines = run_cli("gen", "10000").stdout.decode().splitlines()
+        ulid_flakes = [UlidFlake.parse(line) for line in lines]
+        self.assertEqual(len(ulid_flakes), 10000)
+        self.assertEqual(ulid_flakes, sorted(set(ulid_flakes)))
+
+        values = [int(line) for line in run_cli("gen", "5", "-f", "int", "--scalable", "--sid", "7").stdout.split()]
+        self.assertTrue(all(UlidFlakeScalable(value).sid == 7 for value in values))
+        values = [int(line, 16) for line in run_cli("gen", "5", "-f", "hex").stdout.split()]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(binary.unpack_many(run_cli("gen", "5", "-f", "binary").stdout)), 5)
+
+    def test_negative_count(self):
+        """Test Reject a Negative Number of IDs"""
+        for command in ("gen", "bench"):
+            process = run_cli(command, "-5")
+            self.assertEqual(process.returncode, 2)
+            self.assertEqual(process.stdout, b"")
+            self.assertIn(b"must not be negative", process.stderr)
+        self.assertEqual(run_cli("gen", "0").stdout, b"")
+
+    def test_decode(self):
+        """Test Decode Ulid-Flakes to CSV and NDJSON"""
+        ulid_flakes = UlidFlakeScalable.new_batch(3, sid=4)
+        lines = run_cli("decode", "--scalable", input="\n".join(map(str, ulid_flakes)).encode()).stdout.decode()
+        self.assertEqual(lines.splitlines(), ["id,int,timestamp,randomness,sid"] + [
+            f"{ulid_flake},{ulid_flake.int},{ulid_flake.timestamp},{ulid_flake.randomness},4"
+            for ulid_flake in ulid_flakes
+        ])
+
+        packed = binary.pack_many([ulid_flake.int for ulid_flake in ulid_flakes])
+        rows = run_cli("decode", "-i", "binary", "-o", "ndjson", input=packed).stdout.splitlines()
+        self.assertEqual([json.loads(row)["int"] for row in rows], [ulid_flake.int for ulid_flake in ulid_flakes])
+
+    def test_decode_invalid_input(self):
+        """Test Decode Reports Invalid Input"""
+        process = run_cli("decode", input=b"0000000000000\n01AN4Z07BY79U\n")
+        self.assertEqual(process.returncode, 1)
+        self.assertIn(b"line 2", process.stderr)
+
+    def test_startup_does_not_import_generators(self):
+        """Test the CLI Module Loads the Generators only on First Use"""
+        code = "import sys, ulid_flake.cli; print('ulid_flake.generator' in sys.modules)"
+        self.assertEqual(run_python(code).strip(), "False")
+        code = "import sys, ulid_flake; ulid_flake.new_int(); print('ulid_flake.generator' in sys.modules)"
+        self.assertEqual(run_python(code).strip(), "True")
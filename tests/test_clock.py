@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.clock` module."""
+
+
+import time
+import unittest
+from datetime import datetime, timezone
+
+from ulid_flake.clock import FakeClock, MonotonicClock, SystemClock, to_unix_ms
+
+
+class TestClock(unittest.TestCase):
+    """Tests for `ulid_flake.clock` module."""
+
+    def test_to_unix_ms(self):
+        """Test Convert Datetime to Unix Milliseconds"""
+        self.assertEqual(to_unix_ms(datetime(2024, 1, 1, tzinfo=timezone.utc)), 1704067200000)
+        self.assertEqual(to_unix_ms(datetime(1970, 1, 1, 0, 0, 0, 1500, tzinfo=timezone.utc)), 1)
+
+    def test_system_and_monotonic_clock(self):
+        """Test System and Monotonic Clocks Follow Wall Time"""
+        now_ms = time.time_ns() // 1_000_000
+        self.assertLess(abs(SystemClock().now_ms() - now_ms), 1000)
+        clock = MonotonicClock()
+        self.assertLess(abs(clock.now_ms() - now_ms), 1000)
+        self.assertLessEqual(clock.now_ms(), clock.now_ms())
+
+    def test_fake_clock(self):
+        """Test Fake Clock Ticks and Advances"""
+        clock = FakeClock(1000, tick=2)
+        self.assertEqual(clock.now_ms(), 1000)
+        self.assertEqual(clock.now_ms(), 1002)
+        clock.advance(-10)
+        self.assertEqual(clock.now_ms(), 994)
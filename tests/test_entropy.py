@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.entropy` module."""
+
+
+import os
+import threading
+import unittest
+
+from ulid_flake.entropy import EntropyPool, RandomPool, ThreadLocalEntropyPool
+
+
+class CountingSource:
+    """Deterministic entropy source counting how often it is read."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, n):
+        self.calls += 1
+        return bytes((self.calls + i) & 0xFF for i in range(n))
+
+
+class TestEntropyPool(unittest.TestCase):
+    """Tests for `ulid_flake.entropy` module."""
+
+    def test_read_from_buffer(self):
+        """Test Reads are Served from One Buffer"""
+        source = CountingSource()
+        pool = EntropyPool(size=16, source=source)
+        self.assertEqual(bytes(pool.read(4)), bytes([1, 2, 3, 4]))
+        self.assertEqual(pool.read_int(2), (5 << 8) | 6)
+        self.assertEqual(source.calls, 1)
+
+    def test_refill_and_large_read(self):
+        """Test Buffer Refill and Reads Larger than the Buffer"""
+        source = CountingSource()
+        pool = EntropyPool(size=8, source=source)
+        pool.read(6)
+        self.assertEqual(len(pool.read(4)), 4)
+        self.assertEqual(source.calls, 2)
+        self.assertEqual(len(pool.read(20)), 20)
+        self.assertEqual(source.calls, 3)
+
+    def test_invalid_size(self):
+        """Test Entropy Pool with Invalid Size"""
+        with self.assertRaises(ValueError):
+            EntropyPool(size=0)
+        with self.assertRaises(ValueError):
+            ThreadLocalEntropyPool(size=0)
+
+    def test_thread_local_pool(self):
+        """Test Thread-Local Pools are Independent per Thread"""
+        pool = ThreadLocalEntropyPool(size=1024)
+        pools = []
+
+        def worker():
+            pool.read(3)
+            pools.append(pool.local.pool)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(p) for p in pools}), 4)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_reseed_after_fork(self):
+        """Test Child Processes do not Reuse the Parent's Buffered Entropy"""
+        pool = EntropyPool(size=1024)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, bytes(pool.read(32)))
+            os._exit(0)
+        os.close(write_fd)
+        child_bytes = os.read(read_fd, 32)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        self.assertNotEqual(child_bytes, bytes(pool.read(32)))
+
+    def test_random_pool(self):
+        """Test Random Pools Seed one Generator per Thread and Reseed after Fork"""
+        pool = RandomPool()
+        self.assertEqual(len(pool.read(5)), 5)
+        self.assertLess(pool.read_int(2), 1 << 16)
+        generators = []
+
+        def worker():
+            pool.read_int(3)
+            generators.append(pool.local.random)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(g) for g in generators}), 3)
+        generator = pool.local.random
+        pool.reseed()
+        pool.read_int(1)
+        self.assertIsNot(pool.local.random, generator)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.index` module."""
+
+
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+from ulid_flake.api import UlidFlake
+from ulid_flake.consts import DEFAULT_EPOCH, MAX_INT
+from ulid_flake.index import SortedIdIndex, max_id_for_time, min_id_for_time
+from ulid_flake.scalable import UlidFlakeScalable
+
+
+class TestSortedIdIndex(unittest.TestCase):
+    """Tests for `ulid_flake.index` module."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "ids.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_id_bounds_for_time(self):
+        """Test Smallest and Largest Ulid-Flake of a Millisecond"""
+        self.assertEqual(min_id_for_time(5), 5 << 20)
+        self.assertEqual(max_id_for_time(5), (6 << 20) - 1)
+        self.assertEqual(min_id_for_time(DEFAULT_EPOCH + timedelta(milliseconds=5)), 5 << 20)
+        self.assertEqual(max_id_for_time((1 << 43) - 1), MAX_INT)
+        ulid_flake = UlidFlakeScalable.new()
+        self.assertLessEqual(min_id_for_time(ulid_flake.timestamp), ulid_flake.int)
+        self.assertGreaterEqual(max_id_for_time(ulid_flake.timestamp), ulid_flake.int)
+        with self.assertRaises(OverflowError):
+            min_id_for_time(-1)
+        with self.assertRaises(OverflowError):
+            max_id_for_time(1 << 43)
+
+    def test_range_by_time(self):
+        """Test Time-Range Lookup over Packed Sorted Ulid-Flakes"""
+        values = [(timestamp << 20) | randomness for timestamp in range(10, 20) for randomness in (0, 7, (1 << 20) - 1)]
+        with SortedIdIndex.build(self.path, reversed(values)) as index:
+            self.assertEqual(len(index), 30)
+            self.assertEqual(index.range_by_time(12, 14).tolist(), values[6:12])
+            self.assertEqual(index.range_by_time(0, 11).tolist(), values[:3])
+            self.assertEqual(index.range_by_time(18).tolist(), values[24:])
+            self.assertEqual(index.range_by_time(14, 12).tolist(), [])
+            self.assertEqual(index.count_by_time(0, 100), 30)
+            self.assertEqual(index.count_by_time(12, 12), 0)
+            start = DEFAULT_EPOCH + timedelta(milliseconds=15)
+            self.assertEqual(index.range_by_time(start, start + timedelta(milliseconds=1)).tolist(), values[15:18])
+
+    def test_close_while_iterating(self):
+        """Test Closing an Index in the Middle of Iterating its Reader"""
+        values = UlidFlake.new_batch(100, as_int=True)
+        with SortedIdIndex.build(self.path, values) as index:
+            iterator = iter(index.reader)
+            self.assertEqual(next(iterator), values[0])
+        # the IDs unpacked before closing stay available
+        self.assertEqual(list(iterator), values[1:])
+
+    def test_range_by_time_outside_timestamp_range(self):
+        """Test Time-Range Bounds before the Epoch or past the Largest Timestamp are Clamped"""
+        values = [(timestamp << 20) | 7 for timestamp in (0, 1, 5, (1 << 43) - 1)]
+        with SortedIdIndex.build(self.path, values) as index:
+            before_epoch = DEFAULT_EPOCH - timedelta(days=1)
+            self.assertEqual(index.range_by_time(before_epoch, 2).tolist(), values[:2])
+            self.assertEqual(index.range_by_time(-5, 6).tolist(), values[:3])
+            self.assertEqual(index.range_by_time(-5, -1).tolist(), [])
+            self.assertEqual(index.range_by_time(1, 1 << 50).tolist(), values[1:])
+            self.assertEqual(index.range_by_time(2, DEFAULT_EPOCH + timedelta(days=365 * 400)).tolist(), values[2:])
+            self.assertEqual(index.count_by_time(before_epoch), 4)
+            self.assertEqual(index.count_by_time(1 << 50, 1 << 51), 0)
+
+    def test_range_by_time_of_generated_ids(self):
+        """Test Time-Range Lookup over Generated Ulid-Flakes"""
+        values = UlidFlake.new_batch(5000, as_int=True)
+        middle = UlidFlake(values[2500]).timestamp
+        with SortedIdIndex.build(self.path, values) as index:
+            expected = [value for value in values if UlidFlake(value).timestamp == middle]
+            self.assertEqual(index.range_by_time(middle, middle + 1).tolist(), expected)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.layout` module."""
+
+
+import copy
+import pickle
+import tempfile
+import unittest
+from datetime import timedelta
+
+from ulid_flake.allocator import FileSidAllocator
+from ulid_flake.api import UlidFlake, UlidFlakeGenerator
+from ulid_flake.clock import FakeClock
+from ulid_flake.consts import DEFAULT_EPOCH, MAX_INT
+from ulid_flake.index import max_id_for_time, min_id_for_time
+from ulid_flake.layout import SCALABLE, STANDALONE, Layout
+from ulid_flake.scalable import ThreadLocalUlidFlakeScalableGenerator, UlidFlakeScalable, UlidFlakeScalableGenerator
+
+WIDE = Layout(timestamp_bits=43, randomness_bits=12, sid_bits=8)
+COARSE = Layout(timestamp_bits=40, randomness_bits=23, resolution_ms=10)
+
+
+class TestLayout(unittest.TestCase):
+    """Tests for `ulid_flake.layout` module."""
+
+    def test_default_layouts(self):
+        """Test the Stand-Alone and Scalable Layouts Match the Ulid-Flake Specification"""
+        self.assertEqual((STANDALONE.timestamp_shift, STANDALONE.max_randomness, STANDALONE.slots),
+                         (20, (1 << 20) - 1, 1))
+        self.assertEqual((SCALABLE.timestamp_shift, SCALABLE.randomness_shift, SCALABLE.max_sid), (20, 5, 31))
+        self.assertEqual((STANDALONE.max_entropy_size, SCALABLE.max_entropy_size), (3, 2))
+        self.assertEqual(Layout(43, 15, 5), SCALABLE)
+        self.assertEqual(len({Layout(43, 15, 5), SCALABLE, STANDALONE}), 2)
+
+    def test_fields(self):
+        """Test Combine and Split Fields"""
+        value = WIDE.combine(123, 4095, 200)
+        self.assertEqual((WIDE.timestamp(value), WIDE.randomness(value), WIDE.sid(value)), (123, 4095, 200))
+        self.assertEqual(WIDE.combine(WIDE.max_timestamp, WIDE.max_randomness, WIDE.max_sid), MAX_INT)
+
+    def test_invalid_layouts(self):
+        """Test Layouts must Fill 63 Bits"""
+        for fields in ((43, 20, 1), (43, 19), (63, 0), (44, 20, -1)):
+            with self.assertRaises(ValueError):
+                Layout(*fields)
+        with self.assertRaises(ValueError):
+            Layout(resolution_ms=0)
+
+    def test_generators_with_layout(self):
+        """Test Generators and Instances Follow a Custom Layout"""
+        clock = FakeClock(1704067200000 + 100)
+        # Counter randomness starts in the lower half, so 10 IDs fit the 12-bit randomness of a frozen millisecond.
+        generator = UlidFlakeScalableGenerator(clock=clock, layout=WIDE, sid=200, randomness_source="counter")
+        ulid_flakes = [generator.new() for _ in range(5)] + generator.new_batch(5) + [generator.new(sid=255)]
+        self.assertEqual([ulid_flake.sid for ulid_flake in ulid_flakes], [200] * 10 + [255])
+        self.assertTrue(all(ulid_flake.timestamp == 100 for ulid_flake in ulid_flakes))
+        self.assertTrue(all(ulid_flake.randomness <= 4095 for ulid_flake in ulid_flakes))
+        self.assertEqual(ulid_flakes[:10], sorted(ulid_flakes[:10]))
+        self.assertIsInstance(ulid_flakes[0], UlidFlakeScalable)
+        self.assertIs(type(ulid_flakes[0]).layout, WIDE)
+        self.assertEqual(WIDE.sid(generator.new_int(sid=17)), 17)
+        with self.assertRaises(ValueError):
+            generator.new_int(sid=256)
+        with self.assertRaises(ValueError):
+            UlidFlakeScalableGenerator(layout=SCALABLE, sid=32)
+        with self.assertRaises(ValueError):
+            UlidFlakeGenerator(layout=WIDE)
+        with self.assertRaises(ValueError):
+            UlidFlakeScalableGenerator(layout=STANDALONE)
+        with self.assertRaises(ValueError):
+            UlidFlakeScalableGenerator(layout=WIDE, entropy_size=3)
+
+    def test_timestamp_resolution(self):
+        """Test Timestamps Count Ticks of the Layout Resolution"""
+        clock = FakeClock(1704067200000 + 1234)
+        generator = UlidFlakeGenerator(clock=clock, layout=COARSE)
+        ulid_flake = generator.new()
+        self.assertEqual(ulid_flake.timestamp, 123)
+        self.assertEqual(COARSE.timestamp(generator.from_unix_epoch_time(1704067200.5).int), 50)
+        self.assertEqual(min_id_for_time(DEFAULT_EPOCH + timedelta(milliseconds=1234), layout=COARSE), 123 << 23)
+        self.assertEqual(max_id_for_time(COARSE.max_timestamp, layout=COARSE), MAX_INT)
+
+    def test_class_layout(self):
+        """Test Configure the Default Generator with a Layout"""
+        existing = UlidFlake.new()
+        timestamp = existing.timestamp
+        try:
+            UlidFlake.set_config(layout=COARSE)
+            self.assertIs(UlidFlake.layout, STANDALONE)
+            self.assertEqual(existing.timestamp, timestamp)
+            ulid_flake = UlidFlake.new()
+            self.assertIsInstance(ulid_flake, UlidFlake)
+            self.assertIs(ulid_flake.layout, COARSE)
+            self.assertIs(UlidFlakeGenerator().new().layout, STANDALONE)
+            for parsed in (UlidFlake.parse(str(ulid_flake)), UlidFlake.from_str(str(ulid_flake)),
+                           UlidFlake.from_int(ulid_flake.int), UlidFlake.from_bytes(ulid_flake.to_bytes())):
+                self.assertIs(type(parsed), type(ulid_flake))
+                self.assertEqual(parsed.timestamp, ulid_flake.timestamp)
+
+            UlidFlakeScalable.set_config(layout=WIDE, sid=200)
+            scalable = UlidFlakeScalable.new()
+            self.assertEqual(UlidFlakeScalable.from_int(scalable.int).sid, 200)
+            self.assertEqual(UlidFlakeScalable.parse(str(scalable)).sid, 200)
+            self.assertEqual(UlidFlakeScalable.from_bytes(scalable.to_bytes()).sid, 200)
+        finally:
+            UlidFlake.reset_config()
+            UlidFlakeScalable.reset_config()
+        self.assertIs(type(UlidFlake.new()), UlidFlake)
+        self.assertIs(type(UlidFlake.parse(str(ulid_flake))), UlidFlake)
+
+    def test_layout_instances_pickle(self):
+        """Test Pickle and Repr Instances Bound to a Custom Layout"""
+        ulid_flake = UlidFlakeGenerator(layout=COARSE).new()
+        self.assertEqual(repr(ulid_flake), f"UlidFlake[{COARSE!r}]('{ulid_flake}')")
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(ulid_flake, protocol))
+            self.assertIs(type(unpickled), type(ulid_flake))
+            self.assertEqual(unpickled, ulid_flake)
+            self.assertEqual(unpickled.timestamp, ulid_flake.timestamp)
+        self.assertEqual(copy.copy(ulid_flake).timestamp, ulid_flake.timestamp)
+
+        scalable = UlidFlakeScalableGenerator(layout=WIDE, sid=200).new()
+        self.assertEqual(pickle.loads(pickle.dumps(scalable)).sid, 200)
+        standalone = UlidFlake.new()
+        self.assertIs(type(pickle.loads(pickle.dumps(standalone))), UlidFlake)
+
+    def test_sid_allocator_with_layout(self):
+        """Test sid Allocators must Fit the sids of the Layout"""
+        with tempfile.TemporaryDirectory() as directory:
+            allocator = FileSidAllocator(directory, sids=[7])
+            with self.assertRaises(ValueError):
+                UlidFlakeScalableGenerator(layout=Layout(43, 18, 2), sid_allocator=allocator)
+            generator = UlidFlakeScalableGenerator(layout=Layout(43, 17, 3), sid_allocator=allocator)
+            self.assertEqual(generator.new().sid, 7)
+            generator.set_config()
+
+    def test_thread_local_generator_with_layout(self):
+        """Test Thread-Local Generators Lease the sids of a Custom Layout"""
+        generator = ThreadLocalUlidFlakeScalableGenerator(sids=[100, 200], layout=WIDE)
+        self.assertIn(generator.new().sid, (100, 200))
+        with self.assertRaises(ValueError):
+            ThreadLocalUlidFlakeScalableGenerator(sids=[40])
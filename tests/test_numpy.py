@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+"""Tests for `ulid_flake.numpy` module."""
+
+
+import unittest
+from datetime import timedelta
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from ulid_flake.api import UlidFlake
+from ulid_flake.consts import DEFAULT_EPOCH, MAX_INT
+from ulid_flake.layout import SCALABLE
+from ulid_flake.scalable import UlidFlakeScalable
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestNumpy(unittest.TestCase):
+    """Tests for `ulid_flake.numpy` module."""
+
+    def setUp(self):
+        from ulid_flake import numpy as ulid_flake_numpy
+        self.unp = ulid_flake_numpy
+        self.values = UlidFlake.new_batch(100, as_int=True) + [0, MAX_INT]
+        self.array = np.array(self.values, dtype=np.int64)
+
+    def test_fields(self):
+        """Test Vectorized Timestamps and Randomness Match the Instances"""
+        ulid_flakes = [UlidFlake(value) for value in self.values]
+        self.assertEqual(self.unp.timestamps(self.array).tolist(), [ulid_flake.timestamp for ulid_flake in ulid_flakes])
+        self.assertEqual(self.unp.randomness(self.array).tolist(),
+                         [ulid_flake.randomness for ulid_flake in ulid_flakes])
+
+    def test_scalable_fields(self):
+        """Test Vectorized Scalable Randomness and sids Match the Instances"""
+        values = UlidFlakeScalable.new_batch(100, as_int=True, sid=9)
+        array = np.array(values, dtype=np.int64)
+        ulid_flakes = [UlidFlakeScalable(value) for value in values]
+        self.assertEqual(self.unp.randomness(array, layout=SCALABLE).tolist(),
+                         [ulid_flake.randomness for ulid_flake in ulid_flakes])
+        self.assertEqual(self.unp.sids(array).tolist(), [9] * 100)
+
+    def test_to_datetime64(self):
+        """Test Convert Ulid-Flakes to datetime64"""
+        result = self.unp.to_datetime64(np.array([UlidFlake.from_int(5 << 20).int]))
+        self.assertEqual(result.dtype, np.dtype("datetime64[ms]"))
+        self.assertEqual(result[0].astype(object), (DEFAULT_EPOCH + timedelta(milliseconds=5)).replace(tzinfo=None))
+
+    def test_base32_round_trip(self):
+        """Test Vectorized Base32 Encoding and Decoding"""
+        encoded = self.unp.encode_base32(self.array)
+        self.assertEqual(encoded.dtype, np.dtype("S13"))
+        self.assertEqual([value.decode() for value in encoded], [UlidFlake(value).base32 for value in self.values])
+        self.assertEqual(self.unp.decode_base32(encoded).tolist(), self.values)
+        self.assertEqual(self.unp.decode_base32(np.char.lower(encoded.astype("U13"))).tolist(), self.values)
+
+    def test_fill_from_unix_epoch_times(self):
+        """Test Vectorized Fill from Unix Epoch Times"""
+        unix_ms = np.repeat(np.arange(1_800_000_000_000, 1_800_000_000_100), 30)
+        out = np.zeros(len(unix_ms) + 1, dtype=np.int64)
+        values = self.unp.fill_from_unix_epoch_times(UlidFlakeScalable.default_generator, unix_ms, out,
+                                                     unit="ms", sid=4)
+        self.assertTrue((np.diff(values) > 0).all())
+        self.assertEqual(out[:-1].tolist(), values.tolist())
+        self.assertEqual(self.unp.sids(values).tolist(), [4] * len(unix_ms))
+        self.assertEqual((self.unp.timestamps(values) + UlidFlake.default_generator.epoch_ms).tolist(),
+                         unix_ms.tolist())
+        seconds = self.unp.fill_from_unix_epoch_times(UlidFlake.default_generator, np.array([1_800_000_000.123]))
+        self.assertEqual(UlidFlake(int(seconds[0])).timestamp,
+                         UlidFlake.from_unix_epoch_time(1_800_000_000.123).timestamp)
+
+    def test_fill_from_interleaved_unix_epoch_times(self):
+        """Test Vectorized Fill Keeps IDs Unique when Timestamps Reappear"""
+        unix_ms = np.tile(np.array([1_800_000_000_001, 1_800_000_000_000]), 2000)
+        values = self.unp.fill_from_unix_epoch_times(UlidFlake.default_generator, unix_ms, unit="ms")
+        self.assertEqual(len(np.unique(values)), 4000)
+        self.assertTrue((np.diff(values[::2]) > 0).all())
+        self.assertTrue((np.diff(values[1::2]) > 0).all())
+        self.assertEqual((self.unp.timestamps(values) + UlidFlake.default_generator.epoch_ms).tolist(),
+                         unix_ms.tolist())
+
+    def test_invalid_values(self):
+        """Test Vectorized Coding Rejects Invalid Values"""
+        with self.assertRaises(OverflowError):
+            self.unp.encode_base32(np.array([-1]))
+        with self.assertRaises(ValueError):
+            self.unp.decode_base32(np.array(["01AN4Z07BY79U"]))
+        with self.assertRaises(ValueError):
+            self.unp.decode_base32(np.array(["01AN4Z07BY79"]))
+        with self.assertRaises(OverflowError):
+            self.unp.decode_base32(np.array(["8000000000000"]))
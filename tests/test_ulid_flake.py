@@ -3,11 +3,50 @@
 """Tests for `ulid_flake` package."""
 
 
+import threading
 import unittest
+from array import array
 from datetime import datetime, timezone, timedelta
 
-from ulid_flake.api import UlidFlake
-from ulid_flake.scalable import UlidFlakeScalable
+import ulid_flake
+from ulid_flake.api import UlidFlake, UlidFlakeGenerator
+from ulid_flake.clock import FakeClock
+from ulid_flake.consts import MAX_RANDOMNESS_SCALABLE
+from ulid_flake.entropy import EntropyPool, ThreadLocalEntropyPool
+from ulid_flake.scalable import (
+    ThreadLocalUlidFlakeScalableGenerator,
+    UlidFlakeScalable,
+    UlidFlakeScalableGenerator,
+)
+
+
+class SlowClock(FakeClock):
+    """Fake clock advancing one millisecond every `reads` readings."""
+
+    def __init__(self, now_ms, reads):
+        super().__init__(now_ms)
+        self.reads = reads
+        self.count = 0
+
+    def now_ms(self):
+        self.count += 1
+        if self.count % self.reads == 0:
+            self.advance(1)
+        return self.current_ms
+
+
+class SequencePool:
+    """Entropy pool returning preset integers, then a fixed value."""
+
+    def __init__(self, values, default=7):
+        self.values = list(values)
+        self.default = default
+
+    def read_int(self, n):
+        return self.values.pop(0) if self.values else self.default
+
+    def read(self, n):
+        return bytes([self.default]) * n
 
 
 class TestUlidFlake(unittest.TestCase):
@@ -55,6 +94,54 @@ class TestUlidFlake(unittest.TestCase):
             for _ in range(3):
                 UlidFlake.new()
 
+    def test_generate_ulid_flake_with_fake_clock(self):
+        """Test Generate Ulid-Flake with an Injected Clock"""
+        epoch_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        clock = FakeClock(1704067200000 + 1234)
+        UlidFlake.set_config(epoch_time=epoch_time, clock=clock)
+        first = UlidFlake.new()
+        second = UlidFlake.new()
+        self.assertEqual(first.timestamp, 1234)
+        self.assertEqual(second.timestamp, 1234)
+        self.assertGreater(second.value, first.value)
+        clock.advance(5)
+        self.assertEqual(UlidFlake.new().timestamp, 1239)
+
+    def test_generate_ulid_flake_with_invalid_overflow_policy(self):
+        """Test Generate Ulid-Flake with Invalid Overflow Policy"""
+        with self.assertRaises(ValueError):
+            UlidFlake.set_config(overflow_policy="ignore")
+
+        with self.assertRaises(ValueError):
+            UlidFlake.set_config(overflow_policy="borrow", max_drift_ms=-1)
+
+    def test_generate_ulid_flake_with_spin_overflow_policy(self):
+        """Test Generate Ulid-Flake Waiting for the Next Millisecond on Overflow"""
+        UlidFlake.set_config(entropy_size=3, clock=SlowClock(1704067200000, reads=5), overflow_policy="spin")
+        ulid_flake = UlidFlake.new()
+        for _ in range(10):
+            new_ulid_flake = UlidFlake.new()
+            self.assertGreater(new_ulid_flake.value, ulid_flake.value)
+            ulid_flake = new_ulid_flake
+        self.assertGreater(UlidFlake.overflow_stats()["spin"], 0)
+        self.assertEqual(UlidFlake.overflow_stats()["raise"], 0)
+
+    def test_generate_ulid_flake_with_borrow_overflow_policy(self):
+        """Test Generate Ulid-Flake Borrowing Future Milliseconds on Overflow"""
+        clock = FakeClock(1704067200000)
+        UlidFlake.set_config(entropy_size=3, clock=clock, overflow_policy="borrow", max_drift_ms=1000)
+        ulid_flake = UlidFlake.new()
+        for _ in range(10):
+            new_ulid_flake = UlidFlake.new()
+            self.assertGreater(new_ulid_flake.value, ulid_flake.value)
+            ulid_flake = new_ulid_flake
+        self.assertGreater(ulid_flake.timestamp, 0)
+        self.assertEqual(UlidFlake.overflow_stats()["borrow"], ulid_flake.timestamp)
+
+        # the clock catching up must not move the timestamp backwards
+        clock.advance(1)
+        self.assertGreater(UlidFlake.new().value, ulid_flake.value)
+
     def test_parse_ulid_flake(self):
         """Test Parse Ulid-Flake"""
         ulid_flake = UlidFlake.new()
@@ -63,6 +150,12 @@ class TestUlidFlake(unittest.TestCase):
         self.assertEqual(ulid_flake.timestamp, parsed_ulid_flake.timestamp)
         self.assertEqual(ulid_flake.randomness, parsed_ulid_flake.randomness)
 
+    def test_parse_lowercase_ulid_flake(self):
+        """Test Parse Lowercase Ulid-Flake"""
+        ulid_flake = UlidFlake.new()
+        parsed_ulid_flake = UlidFlake.parse(ulid_flake.base32.lower())
+        self.assertEqual(ulid_flake.value, parsed_ulid_flake.value)
+
     def test_instantiate_ulid_flake_with_int_value(self):
         """Test Instantiate Ulid-Flake with Int Value"""
         ulid_flake = UlidFlake(0)
@@ -82,6 +175,25 @@ class TestUlidFlake(unittest.TestCase):
         with self.assertRaises(OverflowError):
             UlidFlake(9223372036854775808)
 
+    def test_ulid_flake_protocols(self):
+        """Test Ulid-Flake Comparison, Hashing and Conversion Protocols"""
+        first, second = UlidFlake(1), UlidFlake(2)
+        self.assertEqual(first, UlidFlake(1))
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(first, 1)
+        self.assertLess(first, second)
+        self.assertGreaterEqual(second, first)
+        self.assertEqual(sorted([second, first]), [first, second])
+        self.assertEqual(len({first, second, UlidFlake(1)}), 2)
+        self.assertEqual(int(second), 2)
+        self.assertEqual(hex(second), "0x2")
+        self.assertEqual(bytes(second), b"\x00\x00\x00\x00\x00\x00\x00\x02")
+        self.assertEqual(second.to_bytes(), bytes(second))
+        self.assertEqual(UlidFlake.from_bytes(second.to_bytes()), second)
+        self.assertEqual(repr(second), "UlidFlake('0000000000002')")
+        with self.assertRaises(AttributeError):
+            first.extra = 1
+
     def test_parse_ulid_flake_with_invalid_base32(self):
         """Test Parse Ulid-Flake with Invalid Base32"""
 
@@ -123,6 +235,22 @@ class TestUlidFlake(unittest.TestCase):
             self.assertGreater(new_ulid_flake.value, ulid_flake_id.value)
             ulid_flake_id = new_ulid_flake
 
+    def test_new_batch_ulid_flake(self):
+        """Test Generate a Batch of Ulid-Flakes"""
+        batch = UlidFlake.new_batch(20000)
+        self.assertEqual(len(batch), 20000)
+        self.assertIsInstance(batch[0], UlidFlake)
+        values = [ulid_flake.value for ulid_flake in batch]
+        self.assertEqual(values, sorted(set(values)))
+
+    def test_new_batch_ulid_flake_rolls_over_with_large_entropy(self):
+        """Test Generate a Batch of Ulid-Flakes Rolling Over to the Next Millisecond"""
+        UlidFlake.set_config(entropy_size=3)
+        values = UlidFlake.new_batch(10, as_int=True)
+        self.assertEqual(len(values), 10)
+        self.assertEqual(values, sorted(set(values)))
+        self.assertGreater(len({value >> 20 for value in values}), 1)
+
     def test_create_ulid_flake_from_int(self):
         """Test Create Ulid-Flake from Integer"""
         ulid_flake = UlidFlake.new()
@@ -179,6 +307,53 @@ class TestUlidFlake(unittest.TestCase):
         with self.assertRaises(ValueError):
             UlidFlake.from_unix_epoch_time("invalid-time")
 
+    def test_fill_ulid_flakes_from_unix_epoch_times(self):
+        """Test Fill Buffers with Ulid-Flakes from Unix Epoch Times"""
+        custom_epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        unix_times = [(custom_epoch + timedelta(milliseconds=ms)).timestamp() for ms in (5, 5, 5, 6, 1000)]
+        out = array("q", bytes(8 * 6))
+        self.assertEqual(UlidFlake.fill_from_unix_epoch_times(unix_times, out), 5)
+        ulid_flakes = [UlidFlake(value) for value in out[:5]]
+        self.assertEqual([ulid_flake.timestamp for ulid_flake in ulid_flakes], [5, 5, 5, 6, 1000])
+        self.assertEqual(ulid_flakes, sorted(set(ulid_flakes)))
+        self.assertEqual(out[5], 0)
+
+        unix_ms = [int(custom_epoch.timestamp() * 1000) + 7] * 2000
+        buffer = bytearray(8 * 2000)
+        UlidFlake.fill_from_unix_epoch_times(unix_ms, buffer, unit="ms")
+        values = memoryview(buffer).cast("q").tolist()
+        self.assertEqual(values, sorted(set(values)))
+        self.assertTrue(all(UlidFlake(value).timestamp == 7 for value in values))
+
+        # a timestamp that reappears after another one continues its sequence
+        unix_ms = [int(custom_epoch.timestamp() * 1000) + ms for ms in (8, 9)] * 2000
+        out = array("q", bytes(8 * 4000))
+        UlidFlake.fill_from_unix_epoch_times(unix_ms, out, unit="ms")
+        self.assertEqual(len(set(out)), 4000)
+        self.assertEqual(out[::2].tolist(), sorted(out[::2]))
+        self.assertEqual(out[1::2].tolist(), sorted(out[1::2]))
+
+    def test_fill_ulid_flakes_from_unix_epoch_times_with_invalid_arguments(self):
+        """Test Fill Buffers with Ulid-Flakes with Invalid Arguments"""
+        custom_epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        with self.assertRaises(ValueError):
+            UlidFlake.fill_from_unix_epoch_times([custom_epoch.timestamp()] * 3, array("q", [0, 0]))
+        with self.assertRaises(ValueError):
+            UlidFlake.fill_from_unix_epoch_times([custom_epoch.timestamp() - 1], array("q", [0]))
+        with self.assertRaises(ValueError):
+            UlidFlake.fill_from_unix_epoch_times([], bytes(8))
+        with self.assertRaises(ValueError):
+            UlidFlake.fill_from_unix_epoch_times([], bytearray(8), unit="us")
+
+    def test_module_level_new_int_and_new_str(self):
+        """Test Generate Plain Integers and Strings with the Module-Level Shortcuts"""
+        first = ulid_flake.new_int()
+        second = ulid_flake.new_str()
+        self.assertIsInstance(first, int)
+        self.assertEqual(len(second), 13)
+        self.assertLess(UlidFlake(first), UlidFlake.parse(second))
+        self.assertLess(UlidFlake.parse(second), UlidFlake.new())
+
 
 class TestUlidFlakeScalable(unittest.TestCase):
     """Tests for `ulid_flake` package."""
@@ -232,6 +407,18 @@ class TestUlidFlakeScalable(unittest.TestCase):
         with self.assertRaises(OverflowError):
             UlidFlakeScalable(9223372036854775808)
 
+    def test_ulid_flake_scalable_protocols(self):
+        """Test Ulid-Flake Scalable Comparison, Hashing and Conversion Protocols"""
+        ulid_flakes = UlidFlakeScalable.new_batch(10)
+        self.assertEqual(sorted(reversed(ulid_flakes)), ulid_flakes)
+        self.assertEqual(len(set(ulid_flakes + ulid_flakes)), 10)
+        self.assertEqual({ulid_flakes[0]: 1}[UlidFlakeScalable(ulid_flakes[0].int)], 1)
+        self.assertEqual(int.from_bytes(bytes(ulid_flakes[0]), "big"), ulid_flakes[0].int)
+        self.assertEqual([UlidFlakeScalable.from_bytes(ulid_flake.to_bytes()) for ulid_flake in ulid_flakes],
+                         ulid_flakes)
+        self.assertEqual(sorted(ulid_flake.to_bytes() for ulid_flake in ulid_flakes)[0], ulid_flakes[0].to_bytes())
+        self.assertNotEqual(UlidFlakeScalable(1), UlidFlake(1))
+
     def test_parse_ulid_flake_scalable_with_invalid_base32(self):
         """Test Parse Ulid-Flake Scalable with Invalid Base32"""
 
@@ -273,6 +460,33 @@ class TestUlidFlakeScalable(unittest.TestCase):
             self.assertGreater(new_ulid_flake_scalable.value, ulid_flake_scalable.value)
             ulid_flake_scalable = new_ulid_flake_scalable
 
+    def test_iter_new_ulid_flake_scalable(self):
+        """Test Iterate a Batch of Ulid-Flake Scalable beyond one Millisecond"""
+        UlidFlakeScalable.set_config(sid=3)
+        values = [ulid_flake.value for ulid_flake in UlidFlakeScalable.iter_new(1000)]
+        self.assertEqual(len(values), 1000)
+        self.assertEqual(values, sorted(set(values)))
+        self.assertTrue(all(value & 31 == 3 for value in values))
+        UlidFlakeScalable.reset_config()
+
+    def test_generate_ulid_flake_scalable_with_sid_argument(self):
+        """Test Generate Ulid-Flake Scalable for Several sids with Separate Monotonic State"""
+        generator = UlidFlakeScalableGenerator(entropy_size=2, sid=1, clock=FakeClock())
+        self.assertEqual(generator.new().sid, 1)
+        self.assertEqual(generator.new(sid=9).sid, 9)
+        # exhausting the randomness of one sid leaves the others untouched
+        with self.assertRaises(OverflowError):
+            for _ in range(100):
+                generator.new(sid=3)
+        self.assertEqual(generator.new(sid=4).sid, 4)
+        values = UlidFlakeScalable.new_batch(600, as_int=True, sid=5)
+        self.assertEqual(values, sorted(set(values)))
+        self.assertTrue(all(value & 31 == 5 for value in values))
+        with self.assertRaises(ValueError):
+            generator.new(sid=32)
+        with self.assertRaises(ValueError):
+            UlidFlakeScalable.new(sid=-1)
+
     def test_create_ulid_flake_scalable_from_int(self):
         """Test Create Ulid-Flake Scalable from Integer"""
         ulid_flake = UlidFlakeScalable.new()
@@ -329,3 +543,275 @@ class TestUlidFlakeScalable(unittest.TestCase):
         """Test Create Ulid-Flake Scalable from Unix Epoch Time with Invalid Unix Time"""
         with self.assertRaises(ValueError):
             UlidFlakeScalable.from_unix_epoch_time("invalid-time")
+
+    def test_fill_ulid_flake_scalable_from_unix_epoch_times(self):
+        """Test Fill Buffers with Ulid-Flake Scalable from Unix Epoch Times"""
+        custom_epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        unix_ms = [int(custom_epoch.timestamp() * 1000) + ms for ms in [3] * 50 + [4] * 50]
+        out = array("q", bytes(8 * 100))
+        UlidFlakeScalable.fill_from_unix_epoch_times(unix_ms, out, unit="ms", sid=12)
+        ulid_flakes = [UlidFlakeScalable(value) for value in out]
+        self.assertEqual(ulid_flakes, sorted(set(ulid_flakes)))
+        self.assertTrue(all(ulid_flake.sid == 12 for ulid_flake in ulid_flakes))
+        with self.assertRaises(OverflowError):
+            UlidFlakeScalable.fill_from_unix_epoch_times(unix_ms[:1] * 2000, array("q", bytes(8 * 2000)), unit="ms")
+
+    def test_module_level_new_scalable_int_and_new_scalable_str(self):
+        """Test Generate Plain Ulid-Flake Scalable Integers and Strings with the Module-Level Shortcuts"""
+        first = ulid_flake.new_scalable_int(sid=9)
+        second = ulid_flake.new_scalable_str(sid=9)
+        self.assertEqual(UlidFlakeScalable(first).sid, 9)
+        self.assertLess(UlidFlakeScalable(first), UlidFlakeScalable.parse(second))
+        self.assertEqual(UlidFlakeScalable.parse(second).sid, 9)
+        with self.assertRaises(ValueError):
+            ulid_flake.new_scalable_int(sid=32)
+
+
+class TestUlidFlakeGenerator(unittest.TestCase):
+    """Tests for independent Ulid-Flake generators."""
+
+    def test_generators_own_their_config(self):
+        """Test Generators Keep Separate Epochs, sids, Locks and Entropy Pools"""
+        now_ms = 1704067200000 + 5000
+        generator = UlidFlakeGenerator(epoch_time=datetime(2024, 1, 1, 0, 0, 1, tzinfo=timezone.utc),
+                                       clock=FakeClock(now_ms))
+        scalable_generator = UlidFlakeScalableGenerator(sid=7, clock=FakeClock(now_ms))
+        self.assertEqual(generator.new().timestamp, 4000)
+        self.assertEqual(scalable_generator.new().timestamp, 5000)
+        self.assertEqual(scalable_generator.new().sid, 7)
+        self.assertIsNot(generator.lock, UlidFlake.default_generator.lock)
+        self.assertIsNot(generator.lock, scalable_generator.lock)
+        # the default pool has a buffer per thread instead of a lock shared by the generators
+        self.assertIsInstance(generator.entropy_pool, ThreadLocalEntropyPool)
+        generator.set_config(entropy_size=2)
+        self.assertIs(generator.entropy_pool, scalable_generator.entropy_pool)
+
+    def test_generators_keep_separate_state(self):
+        """Test Generators Keep Separate Monotonic State"""
+        first = UlidFlakeGenerator(entropy_size=3, clock=FakeClock())
+        second = UlidFlakeGenerator(entropy_size=3, clock=FakeClock())
+        first.new()
+        # the first generator exhausting its millisecond does not affect the second one
+        with self.assertRaises(OverflowError):
+            for _ in range(3):
+                first.new()
+        self.assertIsNone(second.previous_timestamp)
+        self.assertIsInstance(second.new_int(), int)
+
+    def test_generators_stay_monotonic_across_config_changes(self):
+        """Test Reconfiguring Keeps the Sequence and a New Clock Starts a New One"""
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeGenerator(clock=clock, overflow_policy="borrow")
+        scalable_generator = ThreadLocalUlidFlakeScalableGenerator(clock=clock, overflow_policy="borrow")
+        for entropy_size, max_drift_ms in ((2, 20), (1, 10), (2, 20)):
+            first, scalable_first = generator.new_int(), scalable_generator.new_int()
+            generator.set_config(entropy_size=entropy_size, clock=clock, overflow_policy="borrow")
+            scalable_generator.set_config(max_drift_ms=max_drift_ms, clock=clock, overflow_policy="borrow")
+            self.assertGreater(generator.new_int(), first)
+            self.assertGreater(scalable_generator.new_int(), scalable_first)
+        generator.set_config(clock=FakeClock(1704067200000 + 100))
+        self.assertIsNone(generator.previous_timestamp)
+
+    def test_generator_with_invalid_config(self):
+        """Test Generators with Invalid Configuration"""
+        with self.assertRaises(ValueError):
+            UlidFlakeGenerator(entropy_size=4)
+        with self.assertRaises(ValueError):
+            UlidFlakeScalableGenerator(entropy_size=3)
+        with self.assertRaises(ValueError):
+            UlidFlakeScalableGenerator(sid=32)
+
+    def test_thread_local_generator(self):
+        """Test Thread-Local Generator is Unique across and Monotonic within Threads"""
+        generator = ThreadLocalUlidFlakeScalableGenerator(overflow_policy="spin")
+        results = {}
+        barrier = threading.Barrier(8)
+
+        def worker(index):
+            values = [generator.new_int() for _ in range(300)]
+            results[index] = (generator.sid, values)
+            barrier.wait()  # keep every sid leased until all threads are done
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        values = [value for _, thread_values in results.values() for value in thread_values]
+        self.assertEqual(len(set(values)), len(values))
+        self.assertEqual(len({sid for sid, _ in results.values()}), 8)
+        for sid, thread_values in results.values():
+            self.assertEqual(thread_values, sorted(thread_values))
+            self.assertTrue(all(value & 31 == sid for value in thread_values))
+
+    def test_thread_local_generator_sids_exhausted(self):
+        """Test Thread-Local Generator Leases and Returns sids"""
+        generator = ThreadLocalUlidFlakeScalableGenerator(sids=[4])
+        self.assertEqual(generator.new().sid, 4)
+        errors = []
+
+        def worker():
+            try:
+                generator.new()
+            except RuntimeError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(errors), 1)
+
+        with self.assertRaises(ValueError):
+            ThreadLocalUlidFlakeScalableGenerator(sids=[32])
+
+    def test_generator_metrics(self):
+        """Test Generator Metrics and Callback"""
+        clock = FakeClock(1704067200000 + 10)
+        generator = UlidFlakeGenerator(clock=clock, entropy_pool=SequencePool([5, 0, 0]))
+        generator.new_int()
+        self.assertEqual(generator.stats()["ids_generated"], 0)
+        self.assertNotIn("_advance", vars(generator))
+
+        events = []
+        generator.enable_metrics(lambda name, amount: events.append(name))
+        for _ in range(4):
+            generator.new_int()
+        generator.new_batch(10)
+        clock.current_ms -= 5
+        generator.new_int()
+        stats = generator.stats()
+        self.assertEqual(stats["ids_generated"], 15)
+        self.assertEqual(stats["same_ms_increments"], 15)  # the regressed reading is clamped
+        self.assertEqual(stats["entropy_retries"], 2)
+        self.assertEqual(stats["clock_backwards"], 1)
+        self.assertEqual(events.count("ids_generated"), 6)
+
+        generator.disable_metrics()
+        generator.new_int()
+        self.assertEqual(generator.stats()["ids_generated"], 15)
+        self.assertNotIn("_advance", vars(generator))
+
+    def test_randomness_sources(self):
+        """Test Generate with the urandom, random and counter Randomness Sources"""
+        # The clock moves on eventually, so a batch overflowing after a high fresh draw does not wait forever.
+        clock = SlowClock(1704067200000 + 100, reads=1000)
+        for randomness_source in ("urandom", "random", "counter"):
+            generator = UlidFlakeGenerator(clock=clock, randomness_source=randomness_source)
+            values = [generator.new_int() for _ in range(5)] + generator.new_batch(50, as_int=True)
+            clock.current_ms += 1
+            values += generator.new_batch(50, as_int=True) + [generator.new_int()]
+            self.assertEqual(values, sorted(set(values)))
+
+        clock = FakeClock(1704067200000 + 200)
+        generator = UlidFlakeScalableGenerator(clock=clock, sid=3, randomness_source="counter")
+        values = [generator.new_int()] + generator.new_batch(10, as_int=True)
+        randomnesses = [UlidFlakeScalable(value).randomness for value in values]
+        self.assertEqual(randomnesses, list(range(randomnesses[0], randomnesses[0] + 11)))
+        self.assertLessEqual(randomnesses[0], MAX_RANDOMNESS_SCALABLE >> 1)
+        clock.current_ms += 1
+        self.assertEqual(UlidFlakeScalable(generator.new_int()).sid, 3)
+
+        generator.set_config(sid=3)
+        self.assertEqual(generator.randomness_source, "urandom")
+        with self.assertRaises(ValueError):
+            UlidFlakeGenerator(randomness_source="time")
+        with self.assertRaises(ValueError):
+            UlidFlakeGenerator(randomness_source="random", entropy_pool=EntropyPool())
+
+    def test_generator_new_str(self):
+        """Test Generate Strings with the Cached Millisecond Prefix"""
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeScalableGenerator(clock=clock, sid=5)
+        encoded = []
+        for _ in range(3):
+            encoded += [generator.new_str(), generator.new_str(sid=7)]
+            clock.current_ms += 1
+        ulid_flakes = [UlidFlakeScalable.parse(string) for string in encoded]
+        self.assertEqual([str(ulid_flake) for ulid_flake in ulid_flakes], encoded)
+        self.assertEqual([ulid_flake.timestamp for ulid_flake in ulid_flakes], [100, 100, 101, 101, 102, 102])
+        self.assertEqual([ulid_flake.sid for ulid_flake in ulid_flakes], [5, 7] * 3)
+
+        generator = UlidFlakeGenerator(clock=clock)
+        first = generator.new_str()
+        self.assertLess(first, generator.new_str())
+        self.assertEqual(UlidFlake.parse(first).timestamp, 103)
+
+    def test_clock_regression_policies(self):
+        """Test Clock Regression Clamps, Waits or Raises"""
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeGenerator(clock=clock)
+        first = generator.new_int()
+        clock.current_ms -= 50
+        second = generator.new_int()
+        self.assertGreater(second, first)
+        self.assertEqual(second >> 20, first >> 20)
+        self.assertEqual(generator.stats()["clock_backwards"], 1)
+        clock.current_ms += 51
+        self.assertEqual(generator.new_int() >> 20, (first >> 20) + 1)
+
+        clock = FakeClock(1704067200000 + 100, tick=1)
+        generator = UlidFlakeGenerator(clock=clock, clock_regression="wait")
+        first = generator.new_int()
+        clock.current_ms -= 50
+        second = generator.new_int()
+        self.assertGreater(second, first)
+        self.assertGreaterEqual(clock.current_ms, 1704067200000 + 100)
+        self.assertEqual(generator.stats()["clock_backwards"], 1)
+
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeScalableGenerator(clock=clock, clock_regression="raise", sid=2)
+        generator.new_batch(3)
+        clock.current_ms -= 1
+        with self.assertRaises(RuntimeError):
+            generator.new_int()
+        with self.assertRaises(RuntimeError):
+            generator.new_batch(3)
+        self.assertEqual(generator.stats()["clock_backwards"], 2)
+
+        with self.assertRaises(ValueError):
+            UlidFlakeGenerator(clock_regression="ignore")
+
+    def test_clamped_overflow_does_not_wait_for_the_clock(self):
+        """Test Exhausting a Clamped Timestamp Moves on instead of Waiting for the Clock"""
+        for overflow_policy in ("spin", "sleep"):
+            clock = FakeClock(1704067200000 + 100)
+            generator = UlidFlakeScalableGenerator(clock=clock, entropy_size=2, overflow_policy=overflow_policy)
+            values = [generator.new_int()]
+            clock.current_ms -= 50
+            # the frozen clock never passes the clamped timestamp, so a wait would never end
+            thread = threading.Thread(target=lambda: values.extend(generator.new_int() for _ in range(20)), daemon=True)
+            thread.start()
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(values, sorted(set(values)))
+            self.assertGreater(values[-1] >> 20, 100)
+
+    def test_borrow_is_not_a_clock_regression(self):
+        """Test Borrowing ahead of the Clock is not Counted as a Clock Regression"""
+        clock = FakeClock(1704067200000 + 100)
+        generator = UlidFlakeScalableGenerator(clock=clock, entropy_size=2, overflow_policy="borrow",
+                                               clock_regression="raise")
+        values = [generator.new_int() for _ in range(5)]
+        self.assertEqual(values, sorted(values))
+        self.assertGreater(values[-1] >> 20, 100)
+        self.assertEqual(generator.stats()["clock_backwards"], 0)
+
+    def test_generator_metrics_lock_wait(self):
+        """Test Generator Metrics Record Lock Waits"""
+        generator = UlidFlakeGenerator(overflow_policy="spin")
+        generator.enable_metrics()
+        generator.lock.acquire()
+        thread = threading.Thread(target=generator.new_int)
+        thread.start()
+        thread.join(0.05)
+        generator.lock.release()
+        thread.join()
+        stats = generator.stats()
+        self.assertEqual(stats["lock_waits"], 1)
+        self.assertGreater(stats["lock_wait_seconds"], 0)
+
+        thread_local = ThreadLocalUlidFlakeScalableGenerator(overflow_policy="spin")
+        thread_local.enable_metrics()
+        thread_local.new_batch(100)
+        self.assertEqual(thread_local.stats()["ids_generated"], 100)